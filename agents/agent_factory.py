@@ -1,44 +1,19 @@
 """Agent factory for creating and managing CSV conversion agents."""
 
-from typing import Dict, List
-
-from .base_agent import BaseCSVAgent
-from .coder_agent import CoderAgent
-from .planner_agent import PlannerAgent
-from .tester_agent import TesterAgent
+from .agent_pool import get_agent_pool
 
 
 class AgentFactory:
-    """Factory class for creating and managing CSV conversion agents."""
-
-    def __init__(self):
-        self._agents: Dict[str, BaseCSVAgent] = {}
-
-    def get_planner_agent(self) -> PlannerAgent:
-        """Get or create the Planner Agent."""
-        if "planner" not in self._agents:
-            self._agents["planner"] = PlannerAgent()
-        return self._agents["planner"]
+    """Factory class for creating and managing CSV conversion agents.
 
-    def get_coder_agent(self) -> CoderAgent:
-        """Get or create the Coder Agent."""
-        if "coder" not in self._agents:
-            self._agents["coder"] = CoderAgent()
-        return self._agents["coder"]
+    Agents are checked out per task with ``pool.acquire(role)``; the pool builds
+    them on first use and reuses them across jobs in the process.
+    """
 
-    def get_tester_agent(self) -> TesterAgent:
-        """Get or create the Tester Agent."""
-        if "tester" not in self._agents:
-            self._agents["tester"] = TesterAgent()
-        return self._agents["tester"]
-
-    def get_all_agents(self) -> List[BaseCSVAgent]:
-        """Get all agents."""
-        return [self.get_planner_agent(), self.get_coder_agent(), self.get_tester_agent()]
-
-    def reset_agents(self) -> None:
-        """Reset all agents (create new instances)."""
-        self._agents.clear()
+    def __init__(self):
+        # One pool per process: agents are built on first acquire and reused by later jobs,
+        # and inference never acquires one
+        self.pool = get_agent_pool()
 
 
 # Global agent factory instance
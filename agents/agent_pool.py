@@ -0,0 +1,122 @@
+"""Pool of reusable agent instances for running CSV conversion tasks concurrently."""
+
+import asyncio
+import functools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from core.config import settings
+
+from .base_agent import BaseCSVAgent
+from .coder_agent import CoderAgent
+from .planner_agent import PlannerAgent
+from .tester_agent import TesterAgent
+
+
+@dataclass
+class AgentPoolEntry:
+    """A pooled agent instance and its usage bookkeeping."""
+
+    agent: BaseCSVAgent
+    in_use: bool = False
+    last_used: float = field(default_factory=time.monotonic)
+    usage_count: int = 0
+
+
+class AgentPool:
+    """
+    Object pool of agent instances, keyed by role.
+
+    Instances are created on first acquire and each role grows on demand up to
+    ``max_size``, so concurrent tasks each get their own Agent/Crew state instead
+    of sharing one instance. Once created, ``min_size`` instances per role are
+    kept; surplus instances idle for longer than ``idle_timeout`` seconds are
+    dropped the next time the role is acquired.
+
+    The pool outlives event loops (process pool workers run each job on a new
+    loop), so its condition is recreated for whichever loop is running.
+    """
+
+    def __init__(
+        self,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        factories: Optional[Dict[str, Callable[[], BaseCSVAgent]]] = None,
+    ) -> None:
+        self.min_size = settings.agent_pool_min_size if min_size is None else min_size
+        self.max_size = max(self.min_size, settings.agent_pool_max_size if max_size is None else max_size)
+        self.idle_timeout = settings.agent_pool_idle_timeout if idle_timeout is None else idle_timeout
+        self._factories = factories or {"planner": PlannerAgent, "coder": CoderAgent, "tester": TesterAgent}
+        self._entries: Dict[str, List[AgentPoolEntry]] = {role: [] for role in self._factories}
+        self._condition_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition_for_loop: Optional[asyncio.Condition] = None
+
+    @property
+    def _condition(self) -> asyncio.Condition:
+        """The pool's condition, bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._condition_for_loop is None or self._condition_loop is not loop:
+            self._condition_loop = loop
+            self._condition_for_loop = asyncio.Condition()
+        return self._condition_for_loop
+
+    @asynccontextmanager
+    async def acquire(self, role: str) -> AsyncIterator[BaseCSVAgent]:
+        """Check out an agent for ``role`` for the duration of the context."""
+        entry = await self._checkout(role)
+        try:
+            yield entry.agent
+        finally:
+            async with self._condition:
+                entry.in_use = False
+                entry.last_used = time.monotonic()
+                self._condition.notify()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the number of pooled and busy instances per role."""
+        return {
+            role: {"size": len(entries), "in_use": sum(entry.in_use for entry in entries)}
+            for role, entries in self._entries.items()
+        }
+
+    async def _checkout(self, role: str) -> AgentPoolEntry:
+        if role not in self._entries:
+            raise ValueError(f"Unknown agent role: {role}")
+
+        condition = self._condition
+        async with condition:
+            while True:
+                self._reap_idle(role)
+                entries = self._entries[role]
+                entry = next((entry for entry in entries if not entry.in_use), None)
+                if entry is None and len(entries) < self.max_size:
+                    entry = self._create_entry(role)
+                if entry is not None:
+                    entry.in_use = True
+                    entry.usage_count += 1
+                    return entry
+                await condition.wait()
+
+    def _create_entry(self, role: str) -> AgentPoolEntry:
+        entry = AgentPoolEntry(agent=self._factories[role]())
+        self._entries[role].append(entry)
+        return entry
+
+    def _reap_idle(self, role: str) -> None:
+        entries = self._entries[role]
+        if len(entries) <= self.min_size:
+            return
+
+        now = time.monotonic()
+        idle = [entry for entry in entries if not entry.in_use and now - entry.last_used > self.idle_timeout]
+        for entry in idle[: len(entries) - self.min_size]:
+            entries.remove(entry)
+
+
+@functools.lru_cache(maxsize=1)
+def get_agent_pool() -> AgentPool:
+    """Return the process-wide agent pool, shared by every workflow instance in the process."""
+    return AgentPool()
@@ -1,35 +1,136 @@
 """Base agent class for all CrewAI agents in the CSV converter."""
 
+import ast
+import asyncio
+import functools
 import os
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, ClassVar, Dict, List, Optional, Tuple
 
-from crewai import LLM, Agent
+from aiolimiter import AsyncLimiter
 from loguru import logger
+from openai import AsyncOpenAI
 
 from core.config import settings
 
+if TYPE_CHECKING:
+    # CrewAI is imported on first use; its import chain is heavy and many processes never need it
+    from crewai import LLM, Agent, Task
+
+
+@functools.lru_cache(maxsize=4)
+def _get_token_encoding(model: str) -> Any:
+    """Return a tiktoken encoding for the model, or None when tiktoken is unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Encodings are downloaded on first use; offline hosts fall back to the estimate below
+        return None
+
+
+# One streaming client per event loop: its connection pool cannot outlive the loop that opened it
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_llm_params() -> Tuple[str, float, str]:
+    """
+    Resolve the (model, temperature, api_key) used for every LLM call.
+
+    Settings are read and ``OPENAI_API_KEY`` is exported once per process; a missing
+    key raises without being cached, so it is re-checked on the next call.
+    """
+
+    # Get API key from settings or environment
+    api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
+
+    if not api_key:
+        raise ValueError(
+            "OpenAI API key is required for agent operation. "
+            "Please set OPENAI_API_KEY in your .env file or environment variables."
+        )
+
+    # Set the environment variable for OpenAI
+    os.environ["OPENAI_API_KEY"] = api_key
+    temperature = settings.openai_temperature
+    if "gpt-5" in settings.openai_model or "o4" in settings.openai_model:
+        temperature = 1  # gpt-5 only supports temperature 1
+
+    return settings.openai_model, temperature, api_key
+
+
+def _get_async_client(api_key: str) -> AsyncOpenAI:
+    """Get the streaming OpenAI client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(api_key=api_key)
+        _async_clients[loop] = client
+    return client
+
+
+@functools.lru_cache(maxsize=4)
+def _build_llm(model: str, temperature: float, api_key: str) -> "LLM":
+    """Build the LLM once per configuration; every agent in the process shares it."""
+    from crewai import LLM
+
+    return LLM(model=f"openai/{model}", temperature=temperature, api_key=api_key)
+
+
+def check_script_syntax(script_content: str) -> Optional[str]:
+    """Parse a script and return a description of its syntax error, or None if it parses."""
+    try:
+        ast.parse(script_content)
+    except SyntaxError as e:
+        return f"Syntax error at line {e.lineno}: {e.msg}"
+    except Exception as e:
+        return f"Compilation error: {str(e)}"
+    return None
+
+
+def estimate_tokens(text: str, model: str) -> int:
+    """Estimate the number of prompt tokens ``text`` costs for ``model``."""
+    encoding = _get_token_encoding(model)
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
 
 class BaseCSVAgent(ABC):
     """Base class for all CSV conversion agents."""
 
+    # Shared by every agent in the process so combined traffic stays just under the account limits
+    _request_limiter: ClassVar[AsyncLimiter] = AsyncLimiter(settings.openai_rpm, 60)
+    _token_limiter: ClassVar[AsyncLimiter] = AsyncLimiter(settings.openai_tpm, 60)
+
     def __init__(self, name: str, role: str, goal: str, backstory: str):
         self.name = name
         self.role = role
         self.goal = goal
         self.backstory = backstory
-        self._agent: Optional[Agent] = None
+        self._agent: Optional["Agent"] = None
         self.logger = logger.bind(agent=name)
 
     @property
-    def agent(self) -> Agent:
+    def agent(self) -> "Agent":
         """Get the CrewAI agent instance."""
         if self._agent is None:
             self._agent = self._create_agent()
         return self._agent
 
-    def _create_agent(self) -> Agent:
+    def _create_agent(self) -> "Agent":
         """Create the CrewAI agent instance."""
+        from crewai import Agent
+
         return Agent(
             role=self.role,
             goal=self.goal,
@@ -39,25 +140,72 @@ class BaseCSVAgent(ABC):
             llm=self._get_llm(),
         )
 
-    def _get_llm(self) -> LLM:
+    def _get_llm(self) -> "LLM":
         """Get the language model for the agent."""
-
-        # Get API key from settings or environment
-        api_key = settings.openai_api_key or os.getenv("OPENAI_API_KEY")
-
-        if not api_key:
-            raise ValueError(
-                "OpenAI API key is required for agent operation. "
-                "Please set OPENAI_API_KEY in your .env file or environment variables."
+        return _build_llm(*_resolve_llm_params())
+
+    def _task(self, description: str, expected_output: str) -> "Task":
+        """Build a new task for this agent; each task gets its own ID and output state."""
+        from crewai import Task
+
+        return Task(description=description, agent=self.agent, expected_output=expected_output)
+
+    async def _kickoff(self, task: "Task") -> str:
+        """Run one task through a single-agent Crew of its own and return the raw output."""
+        from crewai import Crew
+
+        # A Crew per kickoff: concurrent tasks for the same agent never share crew state
+        crew = Crew(agents=[self.agent], tasks=[task], verbose=False)
+        # kickoff blocks for the whole LLM round-trip, so keep it off the event loop
+        return str(await asyncio.to_thread(crew.kickoff))
+
+    def _system_prompt(self) -> str:
+        """Build the system message that frames direct LLM calls as this agent."""
+        return f"You are {self.role}. {self.backstory}\nYour personal goal is: {self.goal}"
+
+    @asynccontextmanager
+    async def _throttle(self, prompt: str) -> AsyncIterator[None]:
+        """Wait for request and token budget before an LLM call instead of backing off on 429s."""
+        tokens = estimate_tokens(prompt, settings.openai_model)
+        await self._request_limiter.acquire()
+        await self._token_limiter.acquire(min(tokens, self._token_limiter.max_rate))
+        yield
+
+    def _build_messages(self, prompt: str, instructions: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Build chat messages for a direct LLM call.
+
+        Static ``instructions`` are appended to the agent's system message so the
+        stable part of the request comes first and stays cacheable by the provider.
+        """
+        system_prompt = self._system_prompt()
+        if instructions:
+            system_prompt = f"{system_prompt}\n\n{instructions}"
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+
+    async def _stream_llm(self, prompt: str, instructions: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream a completion for the prompt as text chunks.
+
+        Uses the OpenAI streaming API directly so callers can start processing
+        the response before the model has finished decoding it.
+        """
+        model, temperature, api_key = _resolve_llm_params()
+        messages = self._build_messages(prompt, instructions)
+        async with self._throttle(messages[0]["content"] + prompt):
+            stream = await _get_async_client(api_key).chat.completions.create(
+                model=model,
+                temperature=temperature,
+                messages=messages,
+                stream=True,
             )
 
-        # Set the environment variable for OpenAI
-        os.environ["OPENAI_API_KEY"] = api_key
-        temperature = settings.openai_temperature
-        if "gpt-5" in settings.openai_model or "o4" in settings.openai_model:
-            temperature = 1  # gpt-5 only supports temperature 1
-
-        return LLM(model=f"openai/{settings.openai_model}", temperature=temperature, api_key=api_key)
+        async for event in stream:
+            if event.choices and event.choices[0].delta.content:
+                yield event.choices[0].delta.content
 
     @abstractmethod
     async def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
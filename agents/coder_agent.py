@@ -1,163 +1,21 @@
 """Coder Agent implementation for generating Python scripts with PEP 723 dependencies."""
 
-from typing import Any, Dict, Optional
+import asyncio
+import functools
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from crewai import Crew, Task  # type: ignore
+from .base_agent import BaseCSVAgent, check_script_syntax
 
-from .base_agent import BaseCSVAgent
+_DEFAULT_JOB_DESCRIPTION = "Transform CSV data according to the plan and transformation instructions"
 
-
-class CoderAgent(BaseCSVAgent):
-    """
-    The Coder Agent writes Python scripts that implement transformation plans.
-
-    This agent acts as a skilled Python developer, generating self-contained
-    scripts with embedded dependencies using the PEP 723 format for uv execution.
-    """
-
-    def __init__(self) -> None:
-        super().__init__(
-            name="Coder",
-            role="Python Developer",
-            goal="To write a single, self-contained Python script that implements the plan provided by the Solution Architect.",
-            backstory="""You are a skilled Python developer with expertise in writing clean, efficient, 
-            and well-documented code. You are a proponent of modern Python tooling and are an expert in 
-            using uv for script execution and dependency management. You follow instructions precisely and 
-            create scripts that are both readable and maintainable. You always include proper error handling 
-            and follow PEP 8 style guidelines.""",
-        )
-
-    async def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Execute the coding task.
-
-        Args:
-            task_data: Dictionary containing:
-                - plan: The transformation plan from the Planner Agent
-                - input_file_path: Path to the input CSV file
-                - required_libraries: List of required Python libraries
-                - job_description: Optional description of the task
-                - general_instructions: Optional general transformation instructions
-                - column_instructions: Optional column-specific transformation instructions
-                - agent_feedback: Optional feedback from other agents
-
-        Returns:
-            Dictionary containing the generated script and metadata
-        """
-        plan = task_data["plan"]
-        input_file_path = task_data["input_file_path"]
-        required_libraries = task_data.get("required_libraries", ["pandas"])
-        job_description = task_data.get("job_description", "")
-        general_instructions = task_data.get("general_instructions", "")
-        column_instructions = task_data.get("column_instructions", {})
-        agent_feedback = task_data.get("agent_feedback", {})
-
-        self.log_execution_start(f"Generating Python script based on {len(plan['steps'])} transformation steps")
-
-        try:
-            # Generate the Python script
-            script_content = await self._generate_script(
-                plan,
-                input_file_path,
-                required_libraries,
-                job_description,
-                general_instructions,
-                column_instructions,
-                agent_feedback,
-            )
-
-            result = {
-                "success": True,
-                "script_content": script_content,
-                "dependencies": required_libraries,
-                "complexity": plan.get("complexity", "Unknown"),
-                "step_count": plan.get("total_steps", 0),
-            }
-
-            self.log_execution_end(True, f"Generated script with {len(script_content)} characters")
-            return result
-
-        except Exception as e:
-            error_msg = f"Failed to generate Python script: {str(e)}"
-            self.log_execution_end(False, error_msg)
-            return {"success": False, "error": error_msg, "script_content": None}
-
-    async def _generate_script(
-        self,
-        plan: Dict[str, Any],
-        input_file_path: str,
-        required_libraries: list,
-        job_description: str,
-        general_instructions: str,
-        column_instructions: Dict[str, str],
-        agent_feedback: Optional[Dict[str, Any]] = None,
-    ) -> str:
-        """Generate the Python script based on the transformation plan and feedback."""
-
-        # Create the task for the agent
-        coding_task = Task(
-            description=self._build_coding_prompt(
-                plan,
-                input_file_path,
-                required_libraries,
-                job_description,
-                general_instructions,
-                column_instructions,
-                agent_feedback,
-            ),
-            agent=self.agent,
-            expected_output="A complete Python script with PEP 723 dependencies that implements the transformation plan",
-        )
-
-        # Create a crew to execute the task
-        crew = Crew(agents=[self.agent], tasks=[coding_task], verbose=False)
-
-        # Execute the task through the crew
-        result = crew.kickoff()
-        script_content = str(result)
-
-        # Ensure the script has proper PEP 723 format
-        return self._ensure_pep723_format(script_content, required_libraries)
-
-    def _build_coding_prompt(
-        self,
-        plan: Dict[str, Any],
-        input_file_path: str,
-        required_libraries: list,
-        job_description: str,
-        general_instructions: str,
-        column_instructions: Dict[str, str],
-        agent_feedback: Optional[Dict[str, Any]] = None,
-    ) -> str:
-        """Build the prompt for the coding task."""
-
-        plan_steps = "\n".join([f"{i + 1}. {step}" for i, step in enumerate(plan["steps"])])
-        dependencies_str = '",\n    "'.join(required_libraries)
-
-        # Format feedback for the prompt
-        feedback_info = ""
-        if agent_feedback:
-            feedback_info = self._format_coder_feedback(agent_feedback)
-
-        # Format general instructions
-        general_instructions_text = ""
-        if general_instructions and general_instructions.strip():
-            general_instructions_text = f"GENERAL TRANSFORMATION INSTRUCTIONS:\n{general_instructions.strip()}\n\n"
-
-        print("CODER: general_instructions_text: ", general_instructions_text)
-
-        # Format column-specific instructions
-        column_instructions_text = ""
-        if column_instructions:
-            column_instructions_text = "COLUMN-SPECIFIC TRANSFORMATION INSTRUCTIONS:\n"
-            for col, instruction in column_instructions.items():
-                column_instructions_text += f"- {col}: {instruction}\n"
-            column_instructions_text += "\n"
-
-        prompt = f"""
+# Static coding instructions, sent as the system message so the provider can cache the prefix.
+_INTRO_TMPL = """
         You are a Python Data Processing Expert. Implement a data transformation plan that produces EXACT output matching the expected format, prioritizing the expected output schema and transformation instructions.
 
-        JOB DESCRIPTION: {job_description or "Transform CSV data according to the plan and transformation instructions"}
+"""
+
+_TASK_CONTEXT_TMPL = """        JOB DESCRIPTION: {job_description}
         
         {general_instructions_text}
 
@@ -167,7 +25,9 @@ class CoderAgent(BaseCSVAgent):
         
         {feedback_info}
         
-        CRITICAL IMPLEMENTATION PRINCIPLES:
+"""
+
+_INSTRUCTIONS_TMPL = """        CRITICAL IMPLEMENTATION PRINCIPLES:
         1. **OUTPUT-FIRST**: Only output the expected schema columns in the exact order; drop stray/out-of-schema tokens (e.g., trailing values like "Gift wrapped").
         2. **EXACT OUTPUT MATCHING**: Values, column names, order, and formats must match the expected output exactly.
         3. **ROBUST PRE-CLEANING**: If the plan indicates messy input, first read as text and clean via regex/line rules, then load with pandas.
@@ -178,15 +38,7 @@ class CoderAgent(BaseCSVAgent):
         8. **DATETIME HANDLING**: Use specific datetime conversion patterns as detailed below
         
         TECHNICAL REQUIREMENTS:
-        1. The script MUST start with PEP 723 dependencies in this exact format:
-        
-        # /// script
-        # requires-python = ">=3.10"
-        # dependencies = [
-        #   "{dependencies_str}",
-        # ]
-        # ///
-        
+        1. Do NOT emit the PEP 723 `# /// script` header; it is added automatically from the DEPENDENCIES listed in the task. Start directly with the `import` lines.
         2. The script must be self-contained and executable with `uv run script.py "input_file.csv"`
         3. Use pandas for all CSV operations
         4. Accept input file path as first command line argument
@@ -295,13 +147,6 @@ class CoderAgent(BaseCSVAgent):
         
         SCRIPT STRUCTURE:
         ```python
-        # /// script
-        # requires-python = ">=3.10" 
-        # dependencies = [
-        #   "pandas",
-        # ]
-        # ///
-        
         import pandas as pd
         import sys
         import argparse
@@ -432,80 +277,238 @@ class CoderAgent(BaseCSVAgent):
         Generate ONLY the complete Python script, no additional explanation or markdown formatting.
         """
 
+# Formatted once so the text is byte-for-byte identical on every call
+_STATIC_SYSTEM = (_INTRO_TMPL + _INSTRUCTIONS_TMPL).format().strip()
+
+# Per-task user message; only these short fields change between calls
+_DEPENDENCIES_TMPL = """        DEPENDENCIES (declared for you in the PEP 723 header): {dependencies}
+"""
+
+
+@functools.lru_cache(maxsize=32)
+def _pep723_header(required_libraries: Tuple[str, ...]) -> str:
+    """Build the PEP 723 header prepended to every generated script, once per dependency set."""
+    dependencies = "".join(f'#   "{library}",\n' for library in required_libraries)
+    return f'''# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+{dependencies}# ]
+# ///
+
+'''
+
+
+def _strip_code_fence(script_content: str) -> str:
+    """Remove a markdown fence the model may wrap around a script despite the instructions."""
+    script_content = script_content.strip()
+    if script_content.startswith("```"):
+        script_content = script_content.split("\n", 1)[-1].rsplit("```", 1)[0]
+    return script_content
+
+
+@dataclass(slots=True)
+class _CoderTask:
+    """Parsed form of the task dictionary accepted by ``CoderAgent.execute_task``, with its defaults."""
+
+    plan: Dict[str, Any]
+    input_file_path: str
+    required_libraries: List[str] = field(default_factory=lambda: ["pandas"])
+    job_description: Optional[str] = ""
+    general_instructions: Optional[str] = ""
+    column_instructions: Dict[str, str] = field(default_factory=dict)
+    agent_feedback: Optional[Dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def from_task_data(cls, task_data: Dict[str, Any]) -> "_CoderTask":
+        """Build the task from ``task_data``, ignoring unknown dictionary keys."""
+        return cls(**{name: task_data[name] for name in _CODER_TASK_FIELDS if name in task_data})
+
+
+_CODER_TASK_FIELDS = tuple(f.name for f in fields(_CoderTask))
+
+
+class CoderAgent(BaseCSVAgent):
+    """
+    The Coder Agent writes Python scripts that implement transformation plans.
+
+    This agent acts as a skilled Python developer, generating self-contained
+    scripts with embedded dependencies using the PEP 723 format for uv execution.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            name="Coder",
+            role="Python Developer",
+            goal="To write a single, self-contained Python script that implements the plan provided by the Solution Architect.",
+            backstory="""You are a skilled Python developer with expertise in writing clean, efficient, 
+            and well-documented code. You are a proponent of modern Python tooling and are an expert in 
+            using uv for script execution and dependency management. You follow instructions precisely and 
+            create scripts that are both readable and maintainable. You always include proper error handling 
+            and follow PEP 8 style guidelines.""",
+        )
+
+    async def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute the coding task.
+
+        Args:
+            task_data: Dictionary containing:
+                - plan: The transformation plan from the Planner Agent
+                - input_file_path: Path to the input CSV file
+                - required_libraries: List of required Python libraries
+                - job_description: Optional description of the task
+                - general_instructions: Optional general transformation instructions
+                - column_instructions: Optional column-specific transformation instructions
+                - agent_feedback: Optional feedback from other agents
+
+        Returns:
+            Dictionary containing the generated script and metadata
+        """
+        task = _CoderTask.from_task_data(task_data)
+
+        self.log_execution_start(f"Generating Python script based on {len(task.plan['steps'])} transformation steps")
+
+        try:
+            # Generate the Python script
+            script_content = await self._generate_script(task)
+
+            result = self._build_result(task.plan, script_content, task.required_libraries)
+
+            self.log_execution_end(True, f"Generated script with {len(script_content)} characters")
+            return result
+
+        except Exception as e:
+            error_msg = f"Failed to generate Python script: {str(e)}"
+            self.log_execution_end(False, error_msg)
+            return {"success": False, "error": error_msg, "script_content": None}
+
+    async def _generate_script(self, task: _CoderTask) -> str:
+        """Generate the Python script based on the transformation plan and feedback."""
+        prompt = self._build_user_prompt(
+            task.plan,
+            task.input_file_path,
+            task.required_libraries,
+            task.job_description,
+            task.general_instructions,
+            task.column_instructions,
+            task.agent_feedback,
+        )
+
+        response = "".join([chunk async for chunk in self._stream_llm(prompt, instructions=_STATIC_SYSTEM)])
+        return self._ensure_pep723_format(_strip_code_fence(response), task.required_libraries)
+
+    def _build_user_prompt(
+        self,
+        plan: Dict[str, Any],
+        input_file_path: str,
+        required_libraries: list,
+        job_description: str,
+        general_instructions: str,
+        column_instructions: Dict[str, str],
+        agent_feedback: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Build the per-task user message; the static instructions go in the system message."""
+
+        prompt = _TASK_CONTEXT_TMPL.format_map(
+            self._task_context_fields(plan, job_description, general_instructions, column_instructions, agent_feedback)
+        ) + _DEPENDENCIES_TMPL.format(dependencies=", ".join(required_libraries))
+
         return prompt.strip()
 
+    def _task_context_fields(
+        self,
+        plan: Dict[str, Any],
+        job_description: str,
+        general_instructions: str,
+        column_instructions: Dict[str, str],
+        agent_feedback: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, str]:
+        """Format the per-task fields substituted into the task context template."""
+
+        plan_steps = "\n".join(f"{i + 1}. {step}" for i, step in enumerate(plan["steps"]))
+
+        # Format feedback for the prompt
+        feedback_info = ""
+        if agent_feedback:
+            feedback_info = self._format_coder_feedback(agent_feedback)
+
+        # Format general instructions
+        general_instructions_text = ""
+        if general_instructions and general_instructions.strip():
+            general_instructions_text = f"GENERAL TRANSFORMATION INSTRUCTIONS:\n{general_instructions.strip()}\n\n"
+
+        self.logger.debug("general_instructions_text: {}", general_instructions_text)
+
+        # Format column-specific instructions
+        column_instructions_text = ""
+        if column_instructions:
+            column_instructions_text = (
+                "COLUMN-SPECIFIC TRANSFORMATION INSTRUCTIONS:\n"
+                + "".join(f"- {col}: {instruction}\n" for col, instruction in column_instructions.items())
+                + "\n"
+            )
+
+        return {
+            "job_description": job_description or _DEFAULT_JOB_DESCRIPTION,
+            "general_instructions_text": general_instructions_text,
+            "column_instructions_text": column_instructions_text,
+            "plan_steps": plan_steps,
+            "feedback_info": feedback_info,
+        }
+
+    def _build_result(self, plan: Dict[str, Any], script_content: str, required_libraries: list) -> Dict[str, Any]:
+        """Build the result dictionary for a successfully generated script."""
+        return {
+            "success": True,
+            "script_content": script_content,
+            "dependencies": required_libraries,
+            "complexity": plan.get("complexity", "Unknown"),
+            "step_count": plan.get("total_steps", 0),
+        }
+
     def _format_coder_feedback(self, agent_feedback: Dict[str, Any]) -> str:
         """Format feedback for the coder agent."""
         if not agent_feedback:
             return ""
 
-        feedback_info = ["FEEDBACK FROM PREVIOUS ATTEMPTS (ADDRESS THESE ISSUES):"]
+        return "\n".join(self._iter_coder_feedback_lines(agent_feedback)) + "\n"
+
+    def _iter_coder_feedback_lines(self, agent_feedback: Dict[str, Any]) -> Iterator[str]:
+        """Yield the lines of the coder feedback section."""
+        yield "FEEDBACK FROM PREVIOUS ATTEMPTS (ADDRESS THESE ISSUES):"
 
         if "coder_feedback" in agent_feedback:
-            coder_feedback = agent_feedback["coder_feedback"]
-            feedback_info.append("Specific Issues to Fix:")
-            for feedback in coder_feedback:
+            yield "Specific Issues to Fix:"
+            for feedback in agent_feedback["coder_feedback"]:
                 if isinstance(feedback, dict):
                     issue_type = feedback.get("issue_type", "unknown")
                     suggestion = feedback.get("suggestion", "")
                     error_details = feedback.get("error_details", "")
 
                     if issue_type == "execution_error":
-                        feedback_info.append(f"  - EXECUTION ERROR: {suggestion}")
-                        feedback_info.append(f"    Error details: {error_details}")
+                        yield f"  - EXECUTION ERROR: {suggestion}"
+                        yield f"    Error details: {error_details}"
                     elif issue_type == "tester_failure":
-                        feedback_info.append(f"  - TESTER FAILURE: {suggestion}")
-                        feedback_info.append(f"    Error details: {error_details}")
+                        yield f"  - TESTER FAILURE: {suggestion}"
+                        yield f"    Error details: {error_details}"
                     else:
-                        feedback_info.append(f"  - {suggestion}")
+                        yield f"  - {suggestion}"
                 else:
                     # Handle legacy string format
-                    feedback_info.append(f"  - {feedback}")
+                    yield f"  - {feedback}"
 
         if "test_report" in agent_feedback:
-            feedback_info.append("Test Report Insights:")
-            feedback_info.append(f"  - {agent_feedback['test_report']}")
-
-        return "\n".join(feedback_info) + "\n"
+            yield "Test Report Insights:"
+            yield f"  - {agent_feedback['test_report']}"
 
     def _ensure_pep723_format(self, script_content: str, required_libraries: list) -> str:
-        """Ensure the script has proper PEP 723 format at the top."""
-
-        # Check if script already has PEP 723 format
-        if script_content.strip().startswith("# /// script"):
+        """Prepend the locally built PEP 723 header, unless the model emitted one anyway."""
+        script_content = script_content.lstrip()
+        if script_content.startswith("# /// script"):
             return script_content
+        return _pep723_header(tuple(required_libraries)) + script_content
 
-        # Add PEP 723 header if missing
-        deps = '",\n    "'.join(required_libraries)
-        pep723_header = f'''# /// script
-# requires-python = ">=3.10"
-# dependencies = [
-    "{deps}",
-# ]
-# ///
-
-'''
-
-        # Remove any existing shebang or comments at the top
-        lines = script_content.strip().split("\n")
-        start_idx = 0
-
-        for i, line in enumerate(lines):
-            if line.strip().startswith("#!") or (line.strip().startswith("#") and not line.strip().startswith("# ///")):
-                start_idx = i + 1
-            else:
-                break
-
-        # Reconstruct script with PEP 723 header
-        script_body = "\n".join(lines[start_idx:])
-        return pep723_header + script_body
-
-    def validate_script_syntax(self, script_content: str) -> Dict[str, Any]:
+    async def validate_script_syntax(self, script_content: str) -> Dict[str, Any]:
         """Validate the generated script syntax."""
-        try:
-            compile(script_content, "<string>", "exec")
-            return {"valid": True, "error": None}
-        except SyntaxError as e:
-            return {"valid": False, "error": f"Syntax error at line {e.lineno}: {e.msg}"}
-        except Exception as e:
-            return {"valid": False, "error": f"Compilation error: {str(e)}"}
+        error = await asyncio.to_thread(check_script_syntax, script_content)
+        return {"valid": error is None, "error": error}
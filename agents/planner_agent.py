@@ -1,226 +1,98 @@
 """Planner Agent implementation for CSV analysis and transformation planning."""
 
+import asyncio
+import hashlib
+import re
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TypedDict, Union
 
-from crewai import Crew, Task
-
-from utils.file_handlers import analyze_csv_structure, compare_csv_structures
+from utils.file_handlers import analyze_csv_structure, compare_csv_structures_from_analyses
 
 from .base_agent import BaseCSVAgent
 
-
-class PlannerAgent(BaseCSVAgent):
-    """
-    The Planner Agent analyzes CSV files and creates detailed transformation plans.
-
-    This agent acts as a Solution Architect, analyzing input and expected output
-    CSV files to create step-by-step plans for data transformation.
-    """
-
-    def __init__(self) -> None:
-        super().__init__(
-            name="Planner",
-            role="Solution Architect",
-            goal="To analyze the provided input and expected output CSV files and create a detailed, step-by-step plan for the Coder Agent.",
-            backstory="""You are an experienced Solution Architect who specializes in data transformation tasks. 
-            You have a keen eye for detail and can break down complex data manipulation logic into simple, 
-            easy-to-follow steps. You are an expert in using the pandas library in Python. Your plans are 
-            so clear that even a junior Python developer can understand and implement them perfectly.""",
-        )
-
-    async def execute_task(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Execute the planning task.
-
-        Args:
-            task_data: Dictionary containing:
-                - input_file_path: Path to the input CSV file
-                - expected_output_file_path: Path to the expected output CSV file
-                - job_description: Optional description of the transformation task
-                - general_instructions: Optional general transformation instructions
-                - column_instructions: Optional column-specific transformation instructions
-                - previous_attempts: Optional list of previous attempt results
-                - agent_feedback: Optional feedback from other agents
-
-        Returns:
-            Dictionary containing the transformation plan and analysis
-        """
-        input_file_path = Path(task_data["input_file_path"])
-        expected_output_file_path = Path(task_data["expected_output_file_path"])
-        job_description = task_data.get("job_description", "")
-        general_instructions = task_data.get("general_instructions", "")
-        column_instructions = task_data.get("column_instructions", {})
-        previous_attempts = task_data.get("previous_attempts", [])
-        agent_feedback = task_data.get("agent_feedback", {})
-
-        self.log_execution_start(f"Analyzing CSV files: {input_file_path.name} -> {expected_output_file_path.name}")
-
-        try:
-            # Analyze both CSV files
-            input_analysis = await analyze_csv_structure(input_file_path)
-            output_analysis = await analyze_csv_structure(expected_output_file_path)
-
-            # Compare structures to identify differences
-            comparison = await compare_csv_structures(input_file_path, expected_output_file_path)
-
-            # Create the transformation plan
-            plan = await self._create_transformation_plan(
-                input_analysis,
-                output_analysis,
-                comparison,
-                job_description,
-                general_instructions,
-                column_instructions,
-                previous_attempts,
-                agent_feedback,
-            )
-
-            result = {
-                "success": True,
-                "plan": plan,
-                "input_analysis": input_analysis,
-                "output_analysis": output_analysis,
-                "comparison": comparison,
-                "required_libraries": ["pandas"],
-            }
-
-            self.log_execution_end(True, f"Created transformation plan with {len(plan['steps'])} steps")
-            return result
-
-        except Exception as e:
-            error_msg = f"Failed to create transformation plan: {str(e)}"
-            self.log_execution_end(False, error_msg)
-            return {"success": False, "error": error_msg, "plan": None}
-
-    async def _create_transformation_plan(
-        self,
-        input_analysis: Dict[str, Any],
-        output_analysis: Dict[str, Any],
-        comparison: Dict[str, Any],
-        job_description: str,
-        general_instructions: str,
-        column_instructions: Dict[str, str],
-        previous_attempts: Optional[List[Dict[str, Any]]] = None,
-        agent_feedback: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
-        """Create a detailed transformation plan based on the analysis and feedback."""
-
-        # Create the task for the agent
-        planning_task = Task(
-            description=self._build_planning_prompt(
-                input_analysis,
-                output_analysis,
-                comparison,
-                job_description,
-                general_instructions,
-                column_instructions,
-                previous_attempts,
-                agent_feedback,
-            ),
-            agent=self.agent,
-            expected_output="A detailed step-by-step transformation plan in structured format",
-        )
-
-        # Create a crew to execute the task
-        crew = Crew(agents=[self.agent], tasks=[planning_task], verbose=False)
-
-        # Execute the task through the crew
-        result = crew.kickoff()
-        plan_text = str(result)
-
-        # Parse the plan into structured format and enrich with schema policies
-        return self._parse_plan_output(plan_text, comparison, output_analysis)
-
-    def _build_planning_prompt(
-        self,
-        input_analysis: Dict[str, Any],
-        output_analysis: Dict[str, Any],
-        comparison: Dict[str, Any],
-        job_description: str,
-        general_instructions: str,
-        column_instructions: Dict[str, str],
-        previous_attempts: Optional[List[Dict[str, Any]]] = None,
-        agent_feedback: Optional[Dict[str, Any]] = None,
-    ) -> str:
-        """Build the prompt for the planning task."""
-
-        # Extract sample data for better value mapping
-        input_sample = input_analysis.get("sample_data") or []
-        output_sample = output_analysis.get("sample_data") or []
-
-        # Create a value mapping guide from sample data
-        value_mapping_guide = self._create_value_mapping_guide(input_sample, output_sample)
-
-        # Add previous attempt information if available
-        previous_attempts_info = ""
-        if previous_attempts:
-            previous_attempts_info = self._format_previous_attempts(previous_attempts)
-
-        # Add agent feedback information if available
-        agent_feedback_info = ""
-        if agent_feedback:
-            try:
-                agent_feedback_info = self._format_agent_feedback(agent_feedback)
-            except Exception:
-                agent_feedback_info = ""
-
-        # Raw text quality diagnostics for planner context
-        input_raw = input_analysis.get("raw_text_analysis", {})
-
-        # Format general instructions
-        general_instructions_text = ""
-        if general_instructions and general_instructions.strip():
-            general_instructions_text = f"GENERAL TRANSFORMATION INSTRUCTIONS:\n{general_instructions.strip()}\n\n"
-
-        print("PLANNER: general_instructions_text: ", general_instructions_text)
-
-        # Format column-specific instructions
-        column_instructions_text = ""
-        if column_instructions:
-            column_instructions_text = "COLUMN-SPECIFIC TRANSFORMATION INSTRUCTIONS:\n"
-            for col, instruction in column_instructions.items():
-                column_instructions_text += f"- {col}: {instruction}\n"
-            column_instructions_text += "\n"
-
-        prompt = f"""
+_STRONG_REQUIRED_RE = re.compile(r"(id|date|amount|total|currency|qty|quantity|price|number)", re.I)
+
+# A plan line that opens a new step: "1." / "2)" / "3:" / "4 " or a bullet
+_STEP_START_RE = re.compile(r"^(?:\d+(?:[.):]|\s)|[-*•])")
+
+# Pandas operations reported in a plan's key_operations, in reporting order
+_COMMON_OPS = (
+    "read_csv",
+    "to_csv",
+    "rename",
+    "drop",
+    "dropna",
+    "fillna",
+    "astype",
+    "to_datetime",
+    "merge",
+    "concat",
+    "groupby",
+    "sort_values",
+    "reset_index",
+    "pivot",
+    "melt",
+)
+
+_DEFAULT_JOB_DESCRIPTION = "Transform input CSV to match expected output CSV using transformation instructions"
+
+_PROMPT_BASE_CACHE_SIZE = 8
+
+_RAW_DIAGNOSTIC_KEYS = (
+    "quality_label",
+    "messy_indicators",
+    "leading_noise_lines",
+    "header_index_guess",
+    "delimiter_guess",
+    "dominant_field_count",
+    "cleaning_recommendations",
+)
+
+_PLANNING_INTRO_TMPL = """
         You are a Data Transformation Expert. Your goal is to analyze CSV files and create precise, output-first transformation plans based on general and column-specific instructions.
 
-        JOB DESCRIPTION: {job_description or "Transform input CSV to match expected output CSV using transformation instructions"}
+        JOB DESCRIPTION: {job_description}
         
         {general_instructions_text}
 
         {column_instructions_text}
         
-        {previous_attempts_info}
+"""
+
+_PLANNING_FEEDBACK_TMPL = """        {previous_attempts_info}
         
         {agent_feedback_info}
         
-        OUTPUT-FIRST TARGET (FOCUS MOST ON THIS):
-        - Expected Filename: {output_analysis["filename"]}
-        - Expected Columns (exact names & order): {output_analysis["columns"]}
-        - Expected Data Types: {output_analysis["dtypes"]}
+"""
+
+# Everything below depends only on the analyses, so it is rendered once per set of analyses
+_PLANNING_ANALYSIS_TMPL = """        OUTPUT-FIRST TARGET (FOCUS MOST ON THIS):
+        - Expected Filename: {output_filename}
+        - Expected Columns (exact names & order): {output_columns}
+        - Expected Data Types: {output_dtypes}
         - Expected Sample Data: {output_sample}
         
         INPUT CSV STRUCTURE (for reference and cleaning only):
-        - Filename: {input_analysis["filename"]}
-        - Shape: {input_analysis["shape"]} (rows, columns)
-        - Columns: {input_analysis["columns"]}
-        - Data Types: {input_analysis["dtypes"]}
-        - Null Counts: {input_analysis["null_counts"]}
+        - Filename: {input_filename}
+        - Shape: {input_shape} (rows, columns)
+        - Columns: {input_columns}
+        - Data Types: {input_dtypes}
+        - Null Counts: {input_null_counts}
         - Sample Data: {input_sample}
         
         RAW TEXT QUALITY DIAGNOSTICS (input):
-        - Quality: {input_raw.get("quality_label")}
-        - Indicators: {input_raw.get("messy_indicators")}
-        - Leading noise lines: {input_raw.get("leading_noise_lines")}
-        - Header index guess: {input_raw.get("header_index_guess")}
-        - Delimiter guess: {input_raw.get("delimiter_guess")}
-        - Dominant field count: {input_raw.get("dominant_field_count")}
-        - Cleaning recommendations: {input_raw.get("cleaning_recommendations")}
+        - Quality: {raw_quality_label}
+        - Indicators: {raw_messy_indicators}
+        - Leading noise lines: {raw_leading_noise_lines}
+        - Header index guess: {raw_header_index_guess}
+        - Delimiter guess: {raw_delimiter_guess}
+        - Dominant field count: {raw_dominant_field_count}
+        - Cleaning recommendations: {raw_cleaning_recommendations}
         
         STRUCTURAL DIFFERENCES:
-        {self._format_differences(comparison["differences"])}
+        {differences}
         
         CRITICAL PRINCIPLES:
         1. OUTPUT-FIRST: Always design from expected output schema; ignore/out-drop any input-only artifacts or stray values (e.g., appended tokens like "Gift wrapped").
@@ -330,58 +202,436 @@ class PlannerAgent(BaseCSVAgent):
         Remember: Bias toward the expected output schema; the input may be messy or contain random content. Your plan must be generic and robust.
         """
 
+# Analyses keyed by (path, mtime_ns, size) so planner retries on unchanged files skip re-parsing
+_FileKey = Tuple[str, int, int]
+_ANALYSIS_CACHE_SIZE = 32
+_analysis_cache: "OrderedDict[_FileKey, Dict[str, Any]]" = OrderedDict()
+_comparison_cache: "OrderedDict[Tuple[_FileKey, _FileKey], Dict[str, Any]]" = OrderedDict()
+# First-attempt LLM plan text keyed by the SHA-256 of the planning prompt; retries never read it
+_plan_text_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _as_path(value: Union[str, Path]) -> Path:
+    """Return ``value`` as a Path, without re-parsing values that already are one."""
+    return value if isinstance(value, Path) else Path(value)
+
+
+def _file_key(file_path: Path) -> _FileKey:
+    """Identify a file's current contents by path, modification time and size."""
+    stat = file_path.stat()
+    return str(file_path), stat.st_mtime_ns, stat.st_size
+
+
+def _prompt_key(prompt: str) -> str:
+    """Key of a planning prompt in the plan text cache."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def _cache_put(cache: OrderedDict, key: Any, value: Any) -> None:
+    """Store a value, evicting the least recently used entry once the cache is full."""
+    cache[key] = value
+    if len(cache) > _ANALYSIS_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+async def _analyze_cached(file_path: Path, key: _FileKey) -> Dict[str, Any]:
+    """Return ``analyze_csv_structure`` for a file, reusing the result while the file is unchanged."""
+    analysis = _analysis_cache.get(key)
+    if analysis is None:
+        analysis = await analyze_csv_structure(file_path)
+        _cache_put(_analysis_cache, key, analysis)
+    else:
+        _analysis_cache.move_to_end(key)
+    return analysis
+
+
+class PlannerTaskData(TypedDict, total=False):
+    """Task dictionary accepted by ``PlannerAgent.execute_task``."""
+
+    input_file_path: Union[str, Path]
+    expected_output_file_path: Union[str, Path]
+    job_description: Optional[str]
+    general_instructions: Optional[str]
+    column_instructions: Dict[str, str]
+    previous_attempts: List[Dict[str, Any]]
+    agent_feedback: Dict[str, Any]
+
+
+@dataclass(slots=True)
+class PlanResult:
+    """Structured transformation plan; converted to a plain dict where it leaves the planner."""
+
+    steps: List[str]
+    total_steps: int
+    complexity: str
+    estimated_time: str
+    key_operations: List[str]
+    required_columns: List[Any]
+    optional_columns: List[Any]
+
+
+def _sample_columns(analysis: Dict[str, Any]) -> Dict[Any, List[Any]]:
+    """Column-major sample values of an analysis, transposing ``sample_data`` for analyses without them."""
+    columns = analysis.get("sample_columns")
+    if columns is None:
+        rows = analysis.get("sample_data") or []
+        columns = {col: [row.get(col) for row in rows] for col in (rows[0] if rows else ())}
+    return columns
+
+
+def _truncate_sample(
+    sample: List[Dict[str, Any]],
+    max_rows: int = 5,
+    max_field_chars: int = 120,
+    columns: Optional[List[Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Bound sample rows for embedding in a prompt: first rows only, long strings cut, optional column filter."""
+    rows = []
+    for row in sample[:max_rows]:
+        if columns is not None:
+            row = {col: row[col] for col in columns if col in row}
+        rows.append(
+            {
+                col: value[:max_field_chars] if isinstance(value, str) and len(value) > max_field_chars else value
+                for col, value in row.items()
+            }
+        )
+    return rows
+
+
+class PlannerAgent(BaseCSVAgent):
+    """
+    The Planner Agent analyzes CSV files and creates detailed transformation plans.
+
+    This agent acts as a Solution Architect, analyzing input and expected output
+    CSV files to create step-by-step plans for data transformation.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            name="Planner",
+            role="Solution Architect",
+            goal="To analyze the provided input and expected output CSV files and create a detailed, step-by-step plan for the Coder Agent.",
+            backstory="""You are an experienced Solution Architect who specializes in data transformation tasks. 
+            You have a keen eye for detail and can break down complex data manipulation logic into simple, 
+            easy-to-follow steps. You are an expert in using the pandas library in Python. Your plans are 
+            so clear that even a junior Python developer can understand and implement them perfectly.""",
+        )
+        # (id(input_analysis), id(output_analysis), id(comparison)) -> (pinned analyses, rendered section)
+        self._prompt_base_cache: Dict[Tuple[int, int, int], Tuple[Tuple[Any, ...], str]] = {}
+
+    async def execute_task(self, task_data: PlannerTaskData) -> Dict[str, Any]:  # type: ignore[override]
+        """
+        Execute the planning task.
+
+        Args:
+            task_data: Dictionary containing:
+                - input_file_path: Path to the input CSV file
+                - expected_output_file_path: Path to the expected output CSV file
+                - job_description: Optional description of the transformation task
+                - general_instructions: Optional general transformation instructions
+                - column_instructions: Optional column-specific transformation instructions
+                - previous_attempts: Optional summaries of recent failed attempts ({"cycle", "suggestions"|"error"})
+                - agent_feedback: Optional feedback from other agents
+
+        Returns:
+            Dictionary containing the transformation plan and analysis
+        """
+        input_file_path = _as_path(task_data["input_file_path"])
+        expected_output_file_path = _as_path(task_data["expected_output_file_path"])
+        job_description = task_data.get("job_description", "")
+        general_instructions = task_data.get("general_instructions", "")
+        column_instructions = task_data.get("column_instructions", {})
+        previous_attempts = task_data.get("previous_attempts", [])
+        agent_feedback = task_data.get("agent_feedback", {})
+
+        self.log_execution_start(f"Analyzing CSV files: {input_file_path.name} -> {expected_output_file_path.name}")
+
+        try:
+            # Analyze both CSV files concurrently; unchanged files are served from the cache
+            input_key = _file_key(input_file_path)
+            output_key = _file_key(expected_output_file_path)
+            input_analysis, output_analysis = await asyncio.gather(
+                _analyze_cached(input_file_path, input_key),
+                _analyze_cached(expected_output_file_path, output_key),
+            )
+
+            # Compare structures to identify differences, reusing the analyses above
+            comparison = _comparison_cache.get((input_key, output_key))
+            if comparison is None:
+                comparison = compare_csv_structures_from_analyses(input_analysis, output_analysis)
+                _cache_put(_comparison_cache, (input_key, output_key), comparison)
+            else:
+                _comparison_cache.move_to_end((input_key, output_key))
+
+            # Create the transformation plan; a pass-through needs no LLM round-trip
+            if self._is_trivial(comparison, input_analysis, output_analysis) and not (
+                (general_instructions or "").strip() or column_instructions or previous_attempts or agent_feedback
+            ):
+                self.logger.info("Input already matches the expected output structure, skipping LLM planning")
+                plan = self._passthrough_plan(comparison, output_analysis)
+            else:
+                plan = await self._create_transformation_plan(
+                    input_analysis,
+                    output_analysis,
+                    comparison,
+                    job_description,
+                    general_instructions,
+                    column_instructions,
+                    previous_attempts,
+                    agent_feedback,
+                )
+
+            result = {
+                "success": True,
+                "plan": plan,
+                "input_analysis": input_analysis,
+                "output_analysis": output_analysis,
+                "comparison": comparison,
+                "required_libraries": ["pandas"],
+            }
+
+            self.log_execution_end(True, f"Created transformation plan with {len(plan['steps'])} steps")
+            return result
+
+        except Exception as e:
+            error_msg = f"Failed to create transformation plan: {str(e)}"
+            self.log_execution_end(False, error_msg)
+            return {"success": False, "error": error_msg, "plan": None}
+
+    def _is_trivial(
+        self, comparison: Dict[str, Any], input_analysis: Dict[str, Any], output_analysis: Dict[str, Any]
+    ) -> bool:
+        """Whether the input is a clean file that already has the expected columns, types and sample values."""
+        differences = comparison["differences"]
+        return (
+            not any(differences.get(key) for key in ("shape_changes", "column_changes", "data_type_changes"))
+            and input_analysis.get("raw_text_analysis", {}).get("quality_label") == "clean"
+            and input_analysis["columns"] == output_analysis["columns"]
+            and input_analysis.get("sample_data") == output_analysis.get("sample_data")
+        )
+
+    def _passthrough_plan(self, comparison: Dict[str, Any], output_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the plan for an input that only has to be read and written back unchanged."""
+        plan_text = "\n".join(
+            [
+                "1. Load: read the input CSV with pandas.read_csv using the default parser options.",
+                f"2. Validate: assert the columns are exactly {output_analysis['columns']} in this order.",
+                "3. Write: save the DataFrame to the output path with to_csv(index=False).",
+            ]
+        )
+        return self._parse_plan_output(plan_text, comparison, output_analysis)
+
+    async def _create_transformation_plan(
+        self,
+        input_analysis: Dict[str, Any],
+        output_analysis: Dict[str, Any],
+        comparison: Dict[str, Any],
+        job_description: str,
+        general_instructions: str,
+        column_instructions: Dict[str, str],
+        previous_attempts: Optional[List[Dict[str, Any]]] = None,
+        agent_feedback: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a detailed transformation plan based on the analysis and feedback.
+
+        First attempts reuse the plan text of an identical earlier prompt (same file
+        analyses and instructions). A retry after a failed attempt always asks the
+        LLM for a new plan, and drops the cached first-attempt plan that failed.
+        """
+        plan_args = (
+            input_analysis,
+            output_analysis,
+            comparison,
+            job_description,
+            general_instructions,
+            column_instructions,
+        )
+        prompt = self._build_planning_prompt(*plan_args, previous_attempts, agent_feedback)
+
+        if previous_attempts or agent_feedback:
+            # The first-attempt plan for these inputs led to this retry; stop serving it to later jobs
+            first_prompt = self._build_planning_prompt(*plan_args)
+            _plan_text_cache.pop(_prompt_key(first_prompt), None)
+            plan_text = await self._plan_with_llm(prompt)
+        else:
+            prompt_key = _prompt_key(prompt)
+            plan_text = _plan_text_cache.get(prompt_key)
+            if plan_text is not None:
+                _plan_text_cache.move_to_end(prompt_key)
+                self.logger.info("Reusing the plan of an identical planning prompt, skipping LLM planning")
+            else:
+                plan_text = await self._plan_with_llm(prompt)
+                _cache_put(_plan_text_cache, prompt_key, plan_text)
+
+        # Parse the plan into structured format and enrich with schema policies
+        return self._parse_plan_output(plan_text, comparison, output_analysis)
+
+    async def _plan_with_llm(self, prompt: str) -> str:
+        """Run the planning prompt as a one-off crew kickoff for this agent."""
+        planning_task = self._task(prompt, "A detailed step-by-step transformation plan in structured format")
+        return await self._kickoff(planning_task)
+
+    def _build_planning_prompt(
+        self,
+        input_analysis: Dict[str, Any],
+        output_analysis: Dict[str, Any],
+        comparison: Dict[str, Any],
+        job_description: str,
+        general_instructions: str,
+        column_instructions: Dict[str, str],
+        previous_attempts: Optional[List[Dict[str, Any]]] = None,
+        agent_feedback: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Build the prompt for the planning task."""
+
+        # Add previous attempt information if available
+        previous_attempts_info = ""
+        if previous_attempts:
+            previous_attempts_info = self._format_previous_attempts(previous_attempts)
+
+        # Add agent feedback information if available
+        agent_feedback_info = ""
+        if isinstance(agent_feedback, dict) and agent_feedback:
+            agent_feedback_info = self._format_agent_feedback(agent_feedback)
+
+        # Format general instructions
+        general_instructions_text = ""
+        if general_instructions and general_instructions.strip():
+            general_instructions_text = f"GENERAL TRANSFORMATION INSTRUCTIONS:\n{general_instructions.strip()}\n\n"
+
+        self.logger.debug("general_instructions_text: {}", general_instructions_text)
+
+        # Format column-specific instructions
+        column_instructions_text = ""
+        if column_instructions:
+            parts = ["COLUMN-SPECIFIC TRANSFORMATION INSTRUCTIONS:\n"]
+            parts.extend(f"- {col}: {instruction}\n" for col, instruction in column_instructions.items())
+            parts.append("\n")
+            column_instructions_text = "".join(parts)
+
+        prompt = "".join(
+            (
+                _PLANNING_INTRO_TMPL.format(
+                    job_description=job_description or _DEFAULT_JOB_DESCRIPTION,
+                    general_instructions_text=general_instructions_text,
+                    column_instructions_text=column_instructions_text,
+                ),
+                _PLANNING_FEEDBACK_TMPL.format(
+                    previous_attempts_info=previous_attempts_info, agent_feedback_info=agent_feedback_info
+                ),
+                self._build_analysis_section(input_analysis, output_analysis, comparison),
+            )
+        )
+
         return prompt.strip()
 
-    def _format_differences(self, differences: Dict[str, Any]) -> str:
-        """Format the differences for the prompt."""
-        formatted = []
+    def _build_analysis_section(
+        self, input_analysis: Dict[str, Any], output_analysis: Dict[str, Any], comparison: Dict[str, Any]
+    ) -> str:
+        """
+        Render the part of the planning prompt that depends only on the analyses.
 
-        if differences.get("shape_changes"):
-            shape_changes = differences["shape_changes"]
-            formatted.append(f"Shape Changes: {shape_changes['input_shape']} -> {shape_changes['output_shape']}")
+        Retries reuse the same cached analysis objects and only change the feedback,
+        so the rendered section is kept per object identity. The objects are pinned
+        alongside the text so their ids cannot be reused while the entry exists.
+        """
+        key = (id(input_analysis), id(output_analysis), id(comparison))
+        cached = self._prompt_base_cache.get(key)
+        if cached is not None:
+            return cached[1]
 
-        if differences.get("column_changes"):
-            col_changes = differences["column_changes"]
-            if col_changes.get("added_columns"):
-                formatted.append(f"Added Columns: {col_changes['added_columns']}")
-            if col_changes.get("removed_columns"):
-                formatted.append(f"Removed Columns: {col_changes['removed_columns']}")
+        # Extract sample data for better value mapping
+        input_sample = input_analysis.get("sample_data") or []
+        output_sample = output_analysis.get("sample_data") or []
 
-        if differences.get("data_type_changes"):
-            formatted.append("Data Type Changes:")
-            for col, changes in differences["data_type_changes"].items():
-                formatted.append(f"  - {col}: {changes['input_type']} -> {changes['output_type']}")
+        # Create a value mapping guide from sample data
+        value_mapping_guide = self._create_value_mapping_guide(
+            _sample_columns(input_analysis), _sample_columns(output_analysis)
+        )
+
+        # Raw text quality diagnostics for planner context
+        input_raw = input_analysis.get("raw_text_analysis", {})
+
+        section = _PLANNING_ANALYSIS_TMPL.format_map(
+            {
+                "output_filename": output_analysis["filename"],
+                "output_columns": output_analysis["columns"],
+                "output_dtypes": output_analysis["dtypes"],
+                "output_sample": _truncate_sample(output_sample, columns=output_analysis["columns"]),
+                "input_filename": input_analysis["filename"],
+                "input_shape": input_analysis["shape"],
+                "input_columns": input_analysis["columns"],
+                "input_dtypes": input_analysis["dtypes"],
+                "input_null_counts": input_analysis["null_counts"],
+                "input_sample": _truncate_sample(input_sample),
+                **{f"raw_{key}": input_raw.get(key) for key in _RAW_DIAGNOSTIC_KEYS},
+                "differences": self._format_differences(comparison["differences"]),
+                "value_mapping_guide": value_mapping_guide,
+            }
+        )
 
-        return "\n".join(formatted) if formatted else "No significant structural differences detected"
+        if len(self._prompt_base_cache) >= _PROMPT_BASE_CACHE_SIZE:
+            self._prompt_base_cache.pop(next(iter(self._prompt_base_cache)))
+        self._prompt_base_cache[key] = ((input_analysis, output_analysis, comparison), section)
+        return section
 
-    def _create_value_mapping_guide(self, input_sample: List[Dict], output_sample: List[Dict]) -> str:
-        """Create a value mapping guide from sample data."""
-        if not input_sample or not output_sample:
+    def _format_differences(self, differences: Dict[str, Any]) -> str:
+        """Format the differences for the prompt."""
+        return "\n".join(self._iter_difference_lines(differences)) or "No significant structural differences detected"
+
+    def _iter_difference_lines(self, differences: Dict[str, Any]) -> Iterator[str]:
+        """Yield one line per structural difference."""
+        shape_changes = differences.get("shape_changes")
+        if shape_changes:
+            yield f"Shape Changes: {shape_changes['input_shape']} -> {shape_changes['output_shape']}"
+
+        col_changes = differences.get("column_changes") or {}
+        added_columns = col_changes.get("added_columns")
+        if added_columns:
+            yield f"Added Columns: {added_columns}"
+        removed_columns = col_changes.get("removed_columns")
+        if removed_columns:
+            yield f"Removed Columns: {removed_columns}"
+
+        data_type_changes = differences.get("data_type_changes")
+        if data_type_changes:
+            yield "Data Type Changes:"
+            for col, changes in data_type_changes.items():
+                yield f"  - {col}: {changes['input_type']} -> {changes['output_type']}"
+
+    def _create_value_mapping_guide(
+        self, in_columns: Dict[Any, List[Any]], out_columns: Dict[Any, List[Any]]
+    ) -> str:
+        """Create a value mapping guide from column-major sample data."""
+        if not in_columns or not out_columns:
             return "No sample data available for value mapping."
 
         guide = []
 
         # Find common columns between input and output
-        input_cols = set(input_sample[0].keys()) if input_sample else set()
-        output_cols = set(output_sample[0].keys()) if output_sample else set()
+        input_cols = set(in_columns)
+        output_cols = set(out_columns)
         common_cols = input_cols & output_cols
+        new_cols = output_cols - input_cols
 
-        unique_common_examples = set()
+        # Only pairs whose rendered values differ carry mapping information
         for col in common_cols:
             guide.append(f"Column '{col}':")
-            for input_value, output_value in zip(input_sample, output_sample):
-                if (input_value[col], output_value[col]) not in unique_common_examples:
-                    unique_common_examples.add((input_value[col], output_value[col]))
-                    guide.append(f"  '{input_value[col]}' -> '{output_value[col]}'")
+            changed = dict.fromkeys(
+                (str(input_value), str(output_value))
+                for input_value, output_value in zip(in_columns[col], out_columns[col])
+                if str(input_value) != str(output_value)
+            )
+            if not changed:
+                guide.append("  Values unchanged")
+            guide.extend(f"  '{input_value}' -> '{output_value}'" for input_value, output_value in changed)
 
         # Look for new columns in output
-        new_cols = output_cols - input_cols
         for col in new_cols:
             guide.append(f"New column '{col}':")
-            output_values = set()
-            for row in output_sample:
-                if col in row and row[col] is not None:
-                    output_values.add(str(row[col]))
+            output_values = {str(value) for value in out_columns[col] if value is not None}
             for val in sorted(output_values):
                 guide.append(f"  Use value: '{val}'")
 
@@ -395,19 +645,15 @@ class PlannerAgent(BaseCSVAgent):
         info = ["PREVIOUS ATTEMPT FAILURES (LEARN FROM THESE):"]
 
         for i, attempt in enumerate(previous_attempts, 1):
-            tester_res = attempt.get("tester_result") or {}
-            if isinstance(tester_res, dict) and "comparison_result" in tester_res:
-                comparison = tester_res.get("comparison_result")
-                if isinstance(comparison, dict):
-                    suggestions = comparison.get("suggestions", [])
-                    if suggestions:
-                        info.append(f"Attempt {i} failed due to:")
-                        for suggestion in suggestions:
-                            info.append(f"  - {suggestion}")
-                else:
-                    # Execution error (no structured comparison). Surface error details if present.
-                    err = tester_res.get("error") or "Test execution failed without comparison details"
-                    info.append(f"Attempt {i} execution error: {err}")
+            cycle = attempt.get("cycle", i)
+            suggestions = attempt.get("suggestions")
+            if suggestions:
+                info.append(f"Attempt {cycle} failed due to:")
+                for suggestion in suggestions:
+                    info.append(f"  - {suggestion}")
+            elif attempt.get("error"):
+                # Execution error (no structured comparison)
+                info.append(f"Attempt {cycle} execution error: {attempt['error']}")
 
         return "\n".join(info) + "\n"
 
@@ -419,10 +665,11 @@ class PlannerAgent(BaseCSVAgent):
         feedback_info = ["AGENT FEEDBACK (INCORPORATE THESE INSIGHTS):"]
 
         if "coder_feedback" in agent_feedback:
-            coder_feedback = agent_feedback["coder_feedback"]
             feedback_info.append("Coder Agent Feedback:")
-            for feedback in coder_feedback:
-                feedback_info.append(f"  - {feedback.get('suggestion', '')}")
+            # Skip malformed entries instead of losing the whole feedback block
+            for feedback in agent_feedback["coder_feedback"] or []:
+                if isinstance(feedback, dict):
+                    feedback_info.append(f"  - {feedback.get('suggestion', '')}")
 
         if "test_report" in agent_feedback:
             feedback_info.append("Test Report Insights:")
@@ -438,7 +685,7 @@ class PlannerAgent(BaseCSVAgent):
         # Split the plan into steps (looking for numbered items)
         lines = plan_text.strip().split("\n")
         steps = []
-        current_step = ""
+        current_step: List[str] = []
 
         for line in lines:
             line = line.strip()
@@ -446,29 +693,31 @@ class PlannerAgent(BaseCSVAgent):
                 continue
 
             # Check if this is a new numbered step
-            if line and (line[0].isdigit() or line.startswith(("•", "-", "*"))):
+            if _STEP_START_RE.match(line):
                 if current_step:
-                    steps.append(current_step.strip())
-                current_step = line
+                    steps.append(" ".join(current_step))
+                current_step = [line]
             else:
-                current_step += " " + line
+                current_step.append(line)
 
         # Add the last step
         if current_step:
-            steps.append(current_step.strip())
+            steps.append(" ".join(current_step))
 
         # Infer required vs optional columns from expected output analysis (generalized, not hardcoded)
         inferred_required, inferred_optional = self._infer_required_optional_columns(output_analysis)
 
-        return {
-            "steps": steps,
-            "total_steps": len(steps),
-            "complexity": self._assess_complexity(comparison),
-            "estimated_time": "5-15 minutes",
-            "key_operations": self._extract_key_operations(plan_text),
-            "required_columns": inferred_required,
-            "optional_columns": inferred_optional,
-        }
+        return asdict(
+            PlanResult(
+                steps=steps,
+                total_steps=len(steps),
+                complexity=self._assess_complexity(comparison),
+                estimated_time="5-15 minutes",
+                key_operations=self._extract_key_operations(plan_text),
+                required_columns=inferred_required,
+                optional_columns=inferred_optional,
+            )
+        )
 
     def _infer_required_optional_columns(self, output_analysis: Dict[str, Any]) -> tuple[list, list]:
         """Infer required vs optional columns from expected output profile in a generalized way.
@@ -481,37 +730,27 @@ class PlannerAgent(BaseCSVAgent):
         columns = output_analysis.get("columns", []) or []
         null_counts = output_analysis.get("null_counts", {}) or {}
 
-        required: list = []
-        optional: list = []
-
-        import re as _re
-
-        strong_required_pattern = _re.compile(r"(id|date|amount|total|currency|qty|quantity|price|number)", _re.I)
+        required_set: set = set()
+        optional_set: set = set()
+        # (likely_required, has_nulls) -> bucket; likely-required columns with nulls stay required
+        # but get flagged for post-load cleaning, and nothing indicating optionality defaults to required
+        buckets = {
+            (True, False): required_set,
+            (True, True): required_set,
+            (False, True): optional_set,
+            (False, False): required_set,
+        }
+        has_nulls = {col: null_counts.get(col, 0) not in (None, 0) for col in columns}
 
         for col in columns:
-            name = str(col)
-            likely_required = bool(strong_required_pattern.search(name))
-            has_nulls = null_counts.get(col, 0) not in (None, 0)
-
-            if likely_required and not has_nulls:
-                required.append(col)
-            elif likely_required and has_nulls:
-                # still required but flag for post-load cleaning
-                required.append(col)
-            elif not likely_required and has_nulls:
-                optional.append(col)
-            else:
-                # default required if nothing indicates optionality
-                required.append(col)
+            buckets[(bool(_STRONG_REQUIRED_RE.search(str(col))), has_nulls[col])].add(col)
 
         # Ensure we don't classify all as required if evidence is weak; keep at least one optional when nulls exist
-        if not optional:
-            for col in columns:
-                if null_counts.get(col, 0):
-                    optional.append(col)
+        if not optional_set:
+            optional_set = {col for col in columns if has_nulls[col]}
         # Deduplicate and order as in original
-        required = [c for c in columns if c in required and c not in optional]
-        optional = [c for c in columns if c in optional]
+        required = [c for c in columns if c in required_set and c not in optional_set]
+        optional = [c for c in columns if c in optional_set]
 
         return required, optional
 
@@ -540,27 +779,6 @@ class PlannerAgent(BaseCSVAgent):
 
     def _extract_key_operations(self, plan_text: str) -> list:
         """Extract key pandas operations mentioned in the plan."""
-        operations = []
-        common_ops = [
-            "read_csv",
-            "to_csv",
-            "rename",
-            "drop",
-            "dropna",
-            "fillna",
-            "astype",
-            "to_datetime",
-            "merge",
-            "concat",
-            "groupby",
-            "sort_values",
-            "reset_index",
-            "pivot",
-            "melt",
-        ]
-
-        for op in common_ops:
-            if op in plan_text.lower():
-                operations.append(op)
-
-        return operations
+        # Plain substring checks on one lowercased copy: "dropna" also reports "drop"
+        text = plan_text.lower()
+        return [op for op in _COMMON_OPS if op in text]
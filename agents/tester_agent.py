@@ -5,7 +5,8 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 import pandas as pd
-from crewai import Crew, Task
+
+from utils.file_handlers import safe_file_path, validate_files_exist
 
 from .base_agent import BaseCSVAgent
 
@@ -120,30 +121,18 @@ class TesterAgent(BaseCSVAgent):
             # Execute the script with uv from project root
             from pathlib import Path
 
-            from utils.file_handlers import safe_file_path, validate_file_exists
-
             project_root = Path(__file__).parent.parent.parent  # Go up to project root
 
             # Use the input file path provided by the workflow
             input_file = Path(input_file_path)
             script_file = Path(script_path)
 
-            # Validate input file
-            input_exists, input_error = validate_file_exists(input_file, "input")
-            if not input_exists:
+            # Validate input and script files
+            files_exist, files_error = await validate_files_exist((input_file, "input"), (script_file, "script"))
+            if not files_exist:
                 return {
                     "success": False,
-                    "error": input_error,
-                    "output": "",
-                    "stderr": "",
-                }
-
-            # Validate script file
-            script_exists, script_error = validate_file_exists(script_file, "script")
-            if not script_exists:
-                return {
-                    "success": False,
-                    "error": script_error,
+                    "error": files_error,
                     "output": "",
                     "stderr": "",
                 }
@@ -421,20 +410,13 @@ class TesterAgent(BaseCSVAgent):
         """Generate a detailed test report with actionable feedback."""
 
         # Create the task for generating a comprehensive report
-        report_task = Task(
-            description=self._build_report_prompt(
-                execution_result, comparison_result, input_file_path, expected_output_path
-            ),
-            agent=self.agent,
-            expected_output="A detailed test report with analysis and recommendations",
+        report_task = self._task(
+            self._build_report_prompt(execution_result, comparison_result, input_file_path, expected_output_path),
+            "A detailed test report with analysis and recommendations",
         )
 
-        # Create a crew to execute the task
-        crew = Crew(agents=[self.agent], tasks=[report_task], verbose=False)
-
-        # Execute the task through the crew
-        result = crew.kickoff()
-        return str(result)
+        # Execute the task in a crew of its own
+        return await self._kickoff(report_task)
 
     def _build_report_prompt(
         self,
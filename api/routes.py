@@ -1,13 +1,26 @@
 """API routes for the CSV converter application."""
 
 import asyncio
+import json
 import logging
 import uuid
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
 
-from fastapi import APIRouter, HTTPException, status
+import orjson
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from core.workflow_executor import workflow_executor
+from core.config import settings
+from core.job_queue import (
+    get_job_history,
+    get_redis,
+    get_result,
+    inference_queue,
+    job_events_channel,
+    result_channel,
+)
+from core.workflow import csv_conversion_workflow
+from core.workflow_executor import perform_s3_setup, workflow_executor
 from models.schemas import (
     ConversionJobResponse,
     InferenceRequest,
@@ -15,13 +28,133 @@ from models.schemas import (
     JobStatus,
     OperationMode,
     TrainingJobRequest,
+    TrainingUploadCompleteRequest,
+    TrainingUploadInitRequest,
+    TrainingUploadInitResponse,
+)
+from utils.file_handlers import (
+    cache_job_metadata,
+    delete_s3_job_folder,
+    delete_s3_user_folder,
+    find_missing_s3_objects,
+    generate_presigned_upload_url,
+    get_cached_job_metadata,
+    get_job_metadata_from_s3,
+    get_user_jobs_from_s3,
+    get_user_overview_from_s3,
 )
-from utils.job_manager import job_manager
+from utils.job_manager import job_manager, serialize_job
 
-router = APIRouter()
+# Responses without an explicit class (pydantic models, plain dicts) are rendered by orjson
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 # Note: Job storage is now handled by the JobManager
 
+# Strong references to fire-and-forget tasks so they are not garbage collected mid-run
+_background_tasks: Set[asyncio.Task] = set()
+
+# Training S3 setups running at once in this process (settings.s3_setup_concurrency)
+_S3_SETUP_ACQUIRE_TIMEOUT = 2.0  # seconds a request waits for a slot before getting a 503
+_s3_setup_slots = asyncio.Semaphore(settings.s3_setup_concurrency)
+
+# In-process inference runs at once; further requests wait for a slot instead of piling onto the CPU
+_inference_slots = asyncio.Semaphore(settings.max_concurrent_jobs)
+
+
+def _background_task_done(task: asyncio.Task) -> None:
+    """Forget a finished background task and log an exception nobody awaited."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Background task %s failed", task.get_name(), exc_info=task.exception())
+
+
+def _run_in_background(coro: Any, name: str) -> asyncio.Task:
+    """Start a named task that outlives the request, holding a reference until it finishes."""
+    task = asyncio.create_task(coro, name=name)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_task_done)
+    return task
+
+
+async def _acquire_s3_setup_slot() -> None:
+    """Wait briefly for an S3 setup slot, then shed load with a 503."""
+    try:
+        await asyncio.wait_for(_s3_setup_slots.acquire(), timeout=_S3_SETUP_ACQUIRE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Rejecting training job: all S3 setup slots are busy")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many training jobs are being set up. Please retry shortly.",
+        )
+
+
+def _start_s3_setup(job_id: str, request: TrainingJobRequest) -> "asyncio.Task[Dict[str, str]]":
+    """Run a job's S3 setup in the background, releasing its slot when it finishes."""
+    s3_setup = asyncio.create_task(perform_s3_setup(job_id, request, logger, job_manager), name=f"s3-setup-{job_id}")
+    s3_setup.add_done_callback(lambda _: _s3_setup_slots.release())
+    return s3_setup
+
+
+async def _submit_after_s3_setup(
+    job_id: str,
+    request: TrainingJobRequest,
+    s3_setup: "asyncio.Task[Dict[str, str]]",
+    job_record: "Optional[asyncio.Task[Dict[str, Any]]]" = None,
+) -> None:
+    """Hand a training job to the workers once its record is written and its S3 setup has finished."""
+    if job_record is not None:
+        try:
+            await job_record
+        except Exception as e:
+            s3_setup.cancel()
+            logger.error("Failed to create job record for %s, not submitting workflow: %s", job_id, e)
+            return
+
+    try:
+        # perform_s3_setup marks the job FAILED itself
+        s3_paths = await s3_setup
+    except Exception as e:
+        logger.error("S3 setup failed for job %s, not submitting workflow: %s", job_id, e)
+        return
+
+    try:
+        workflow_submitted = await workflow_executor.submit_workflow(
+            job_id,
+            input_file_path=s3_paths["input_file_path"],
+            expected_output_file_path=s3_paths["expected_output_file_path"],
+            job_description=request.description,
+            general_instructions=request.general_instructions,
+            column_instructions=request.column_instructions,
+            use_full_paths=True,
+        )
+        error_message = None if workflow_submitted else "Unable to submit workflow job. Server may be overloaded."
+    except Exception as e:
+        error_message = str(e)
+
+    if error_message:
+        logger.error("Failed to submit workflow for job %s: %s", job_id, error_message)
+        await job_manager.update_job_status(
+            job_id, JobStatus.FAILED, current_step="Workflow submission failed", error_message=error_message
+        )
+
+
+def _submit_when_ready(
+    job_id: str,
+    request: TrainingJobRequest,
+    s3_setup: "asyncio.Task[Dict[str, str]]",
+    job_record: "Optional[asyncio.Task[Dict[str, Any]]]" = None,
+) -> None:
+    """Start the background task that submits the workflow after S3 setup."""
+    _run_in_background(_submit_after_s3_setup(job_id, request, s3_setup, job_record), name=f"submit-{job_id}")
+
+
+def _training_upload_keys(user_id: str, job_id: str) -> Dict[str, str]:
+    """S3 keys of a training job's input and expected output files."""
+    return {
+        "input_file": f"{user_id}/{job_id}/input/input.csv",
+        "expected_output_file": f"{user_id}/{job_id}/input/expected_output.csv",
+    }
+
 
 @router.post(
     "/train",
@@ -34,76 +167,205 @@ async def start_training_job(request: TrainingJobRequest) -> ConversionJobRespon
     """
     Starts a new training job:
     1. Creates a job with a unique ID.
-    2. Sets up the necessary folder structure in S3.
-    3. Uploads the input and expected output files to S3.
-    4. Kicks off the background processing workflow.
-    5. Returns the job information.
+    2. Sets up the necessary folder structure in S3 and uploads the input and
+       expected output files, concurrently with step 1 for new jobs.
+    3. Kicks off the background processing workflow once the S3 setup is done.
+    4. Returns the job information without waiting for steps 2 and 3, or for
+       the job record write of step 1 when this is a new job.
+
+    Responds 503 when too many S3 setups are already running in this process.
     """
+    await _acquire_s3_setup_slot()
+    s3_setup = None
     try:
         # Check if this is a job replacement request
         if request.job_id:
-            logger.info(f"🔄 Job replacement request for job: {request.job_id}")
+            logger.info("🔄 Job replacement request for job: %s", request.job_id)
+            # The old job folder is deleted while creating the record, so S3 setup has to follow it
+            job_data = await job_manager.create_training_job_fast(request)
+            job_id = job_data["job_id"]
+            s3_setup = _start_s3_setup(job_id, request)
+            _submit_when_ready(job_id, request, s3_setup)
         else:
-            logger.info(f"⚡ New training job creation request")
-            
-        # ⚡ SONIC SPEED: Create job record instantly (no S3 operations)
-        job_data = await job_manager.create_training_job_fast(request)
-        job_id = job_data["job_id"]
-        
-        # 🚀 Submit to worker process (includes S3 setup + CrewAI workflow)
-        workflow_submitted = await workflow_executor.submit_workflow(
-            job_id,
-            request_data=request,  # Pass full request for S3 operations
-            input_file_path=job_data["input_file"],  # Original S3 paths
-            expected_output_file_path=job_data["expected_output_file"],
-            job_description=request.description,
-            general_instructions=request.general_instructions,
-            column_instructions=request.column_instructions,
-            use_full_paths=True,
-            perform_s3_setup=True,  # Flag to handle S3 in worker
-        )
-        
-        if not workflow_submitted:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Unable to submit workflow job. Server may be overloaded.",
+            logger.info("⚡ New training job creation request")
+            # ⚡ SONIC SPEED: Write the job record and run S3 setup in the background, without awaiting either.
+            # The record task is scheduled first, so the record is inserted before the setup's progress updates.
+            job_id = str(uuid.uuid4())
+            job_record = asyncio.create_task(
+                job_manager.create_training_job_fast(request, job_id=job_id), name=f"job-record-{job_id}"
             )
+            s3_setup = _start_s3_setup(job_id, request)
+            # 🚀 Submit to the workers as soon as the record is written and S3 setup completes
+            _submit_when_ready(job_id, request, s3_setup, job_record)
 
         return ConversionJobResponse(
             job_id=job_id,
             status=JobStatus.PENDING,
-            input_file=job_data["input_file"],
-            expected_output_file=job_data["expected_output_file"],
+            input_file=request.input_file,
+            expected_output_file=request.expected_output_file,
             description=request.description,
-            client_id=job_data["client_id"],
+            client_id=request.user_id,
             mode=OperationMode.TRAINING,
             message="Training job created successfully. Processing will begin shortly.",
         )
     except Exception as e:
-        logger.error(f"Failed to start training job: {e}")
+        if s3_setup is None:
+            # No setup task took ownership of the slot
+            _s3_setup_slots.release()
+        logger.error("Failed to start training job: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to start training job: {str(e)}",
         )
 
 
+@router.post(
+    "/train/init",
+    response_model=TrainingUploadInitResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start Training Job With Direct Uploads",
+    description="Creates a training job and returns presigned S3 URLs to PUT the input and expected output CSVs to. Call /train/complete once both uploads have finished.",
+)
+async def init_training_upload(request: TrainingUploadInitRequest) -> TrainingUploadInitResponse:
+    """
+    Create a training job whose files the client uploads directly to S3.
+
+    The files never pass through the API; large CSVs should use this instead
+    of sending them (base64 or by URL) to /train.
+    """
+    try:
+        job_id = str(uuid.uuid4())
+        bucket_name = settings.aws_bucket_name
+        keys = _training_upload_keys(request.user_id, job_id)
+
+        training_request = TrainingJobRequest(
+            **request.model_dump(),
+            input_file=f"s3://{bucket_name}/{keys['input_file']}",
+            expected_output_file=f"s3://{bucket_name}/{keys['expected_output_file']}",
+        )
+        await job_manager.create_training_job_fast(training_request, job_id=job_id)
+        await job_manager.update_job_status(
+            job_id, JobStatus.INITIALIZING, current_step="Waiting for client uploads"
+        )
+
+        return TrainingUploadInitResponse(
+            job_id=job_id,
+            input_upload_url=generate_presigned_upload_url(bucket_name, keys["input_file"]),
+            expected_output_upload_url=generate_presigned_upload_url(bucket_name, keys["expected_output_file"]),
+            expires_in=settings.presigned_url_expiry,
+        )
+    except Exception as e:
+        logger.error("Failed to initialize training upload: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to initialize training upload: {str(e)}",
+        )
+
+
+@router.post(
+    "/train/complete",
+    response_model=ConversionJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Complete Training Job Uploads",
+    description="Verifies that the files of a job created with /train/init were uploaded and kicks off the conversion workflow.",
+)
+async def complete_training_upload(request: TrainingUploadCompleteRequest) -> ConversionJobResponse:
+    """
+    Start the workflow of a job created with /train/init:
+    1. Checks that both uploaded files exist in S3.
+    2. Creates the job's S3 folders and metadata (the files are already in place).
+    3. Kicks off the background processing workflow once that is done.
+
+    Responds 409 when the job was already started and 503 when too many S3
+    setups are running; the job stays startable after a 503.
+    """
+    job_data = await job_manager.get_job(request.job_id)
+    if not job_data or job_data.get("client_id") != request.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {request.job_id} not found for user {request.user_id}",
+        )
+
+    keys = _training_upload_keys(request.user_id, request.job_id)
+    missing = await find_missing_s3_objects(settings.aws_bucket_name, list(keys.values()))
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Files not uploaded yet: {', '.join(missing)}",
+        )
+
+    # Take the slot before leaving INITIALIZING, so a 503 leaves the job startable by a retry
+    await _acquire_s3_setup_slot()
+    s3_setup = None
+    try:
+        # Compare-and-set: of concurrent or repeated calls, only one moves the job out of INITIALIZING
+        started = await job_manager.update_job_status(
+            request.job_id,
+            JobStatus.PENDING,
+            current_step="Uploads received",
+            expected_status=JobStatus.INITIALIZING,
+        )
+        if not started:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Job {request.job_id} has already been started",
+            )
+
+        request_data = job_data.get("_request_data", {})
+        training_request = TrainingJobRequest(
+            user_id=request.user_id,
+            input_file=job_data["input_file"],
+            expected_output_file=job_data["expected_output_file"],
+            job_title=request_data.get("job_title", ""),
+            owner=request_data.get("owner", ""),
+            description=job_data.get("description"),
+            general_instructions=job_data.get("general_instructions"),
+            column_instructions=job_data.get("column_instructions"),
+        )
+
+        # Uploading an S3 URI onto itself is skipped, so the setup only writes folders and metadata
+        s3_setup = _start_s3_setup(request.job_id, training_request)
+        _submit_when_ready(request.job_id, training_request, s3_setup)
+    finally:
+        if s3_setup is None:
+            # No setup task took ownership of the slot
+            _s3_setup_slots.release()
+
+    return ConversionJobResponse(
+        job_id=request.job_id,
+        status=JobStatus.PENDING,
+        input_file=job_data["input_file"],
+        expected_output_file=job_data["expected_output_file"],
+        description=job_data.get("description"),
+        client_id=request.user_id,
+        mode=OperationMode.TRAINING,
+        message="Uploads verified. Processing will begin shortly.",
+    )
+
+
 @router.post(
     "/inference/run",
     response_model=InferenceResponse,
     status_code=status.HTTP_200_OK,
     summary="Run Inference Job",
-    description="Runs an inference job using a specified trained model and input file. Returns the Python script and output CSV as base64 encoded strings.",
+    description="Runs an inference job using a specified trained model and input file. Returns presigned download URLs for the Python script and output CSV, plus their base64 content when under 64 KiB. When a Redis queue is configured the job is queued instead and a 202 with a stream URL for the result is returned.",
 )
-async def run_inference_job(request: InferenceRequest) -> InferenceResponse:
+async def run_inference_job(request: InferenceRequest, response: Response) -> InferenceResponse:
     """
     Runs an inference job and waits for completion:
     1. Creates a new job with a unique ID for tracking.
     2. Executes the inference workflow synchronously.
-    3. Returns the job information along with base64 encoded Python script and output CSV.
+    3. Returns the job information along with presigned S3 URLs for the Python script and
+       output CSV, inlining them as base64 only when small.
+
+    Without a queue, at most ``MAX_CONCURRENT_JOBS`` inference workflows run
+    at once in this process; further requests wait for a free slot.
+    With ``REDIS_URL`` set, step 2 is handed to the queue workers and the
+    response is a 202 pointing at ``/inference/{job_id}/stream``.
     """
     try:
         # Create a new job for this inference task
-        inference_job_id = str(uuid.uuid4())
+        inference_job_id = uuid.uuid4().hex
 
         job_data = await job_manager.create_job(
             job_id=inference_job_id,
@@ -113,16 +375,41 @@ async def run_inference_job(request: InferenceRequest) -> InferenceResponse:
             description=f"Inference for job {request.job_id}",
         )
 
+        if get_redis() is not None:
+            # Hand the job to a queue worker; the result is published on the job's channel
+            await inference_queue.enqueue(
+                inference_job_id,
+                {
+                    "inference_args": {
+                        "inference_job_id": inference_job_id,
+                        "user_id": request.user_id,
+                        "training_job_id": request.job_id,
+                        "input_file": request.input_file,
+                    },
+                    "job": serialize_job(job_data),
+                },
+            )
+            response.status_code = status.HTTP_202_ACCEPTED
+            return InferenceResponse(
+                job_id=inference_job_id,
+                status=JobStatus.PENDING,
+                input_file=request.input_file,
+                client_id=request.user_id,
+                mode=OperationMode.INFERENCE,
+                message="Inference job queued. Subscribe to the stream URL for the result.",
+                channel=result_channel(inference_job_id),
+                stream_url=f"/api/v1/inference/{inference_job_id}/stream",
+            )
+
         # Execute the inference workflow and wait for completion
-        from core.workflow import csv_conversion_workflow
-        
         # Run inference job synchronously to get the results
-        inference_result = await csv_conversion_workflow.run_inference_job(
-            inference_job_id=inference_job_id,
-            user_id=request.user_id,
-            training_job_id=request.job_id,
-            input_file=request.input_file,
-        )
+        async with _inference_slots:
+            inference_result = await csv_conversion_workflow.run_inference_job(
+                inference_job_id=inference_job_id,
+                user_id=request.user_id,
+                training_job_id=request.job_id,
+                input_file=request.input_file,
+            )
 
         if inference_result["success"]:
             return InferenceResponse(
@@ -136,6 +423,8 @@ async def run_inference_job(request: InferenceRequest) -> InferenceResponse:
                 output_csv_base64=inference_result.get("output_csv_base64"),
                 output_s3_path=inference_result.get("output_s3_path"),
                 script_s3_path=inference_result.get("script_s3_path"),
+                script_s3_url=inference_result.get("script_s3_url"),
+                output_csv_s3_url=inference_result.get("output_csv_s3_url"),
             )
         else:
             # Return failed response but include script content if available
@@ -150,22 +439,156 @@ async def run_inference_job(request: InferenceRequest) -> InferenceResponse:
                 output_csv_base64=inference_result.get("output_csv_base64"),
                 output_s3_path=inference_result.get("output_s3_path"),
                 script_s3_path=inference_result.get("script_s3_path"),
+                script_s3_url=inference_result.get("script_s3_url"),
+                output_csv_s3_url=inference_result.get("output_csv_s3_url"),
             )
     except Exception as e:
-        logger.error(f"Failed to start inference job: {e}")
+        logger.error("Failed to start inference job: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to start inference job: {str(e)}",
         )
 
 
+@router.get(
+    "/inference/{job_id}/stream",
+    summary="Stream Inference Result",
+    description="Server-sent events stream that delivers the result of a queued inference job once it finishes.",
+)
+async def stream_inference_result(job_id: str) -> StreamingResponse:
+    """
+    Stream the final result of a queued inference job.
+
+    Subscribes to the job's Redis channel and sends the result as a single
+    ``data:`` event, then closes. A result published before the client
+    connected is served from the stored copy.
+    """
+    redis = get_redis()
+    if redis is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Result streaming requires the Redis job queue (REDIS_URL is not set)",
+        )
+
+    async def events() -> AsyncIterator[str]:
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(result_channel(job_id))
+        try:
+            # Subscribe first so a result published meanwhile is not missed
+            stored = await get_result(job_id)
+            if stored is not None:
+                yield f"data: {stored}\n\n"
+                return
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=15.0)
+                if message is None:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"data: {message['data']}\n\n"
+                return
+        finally:
+            await pubsub.unsubscribe(result_channel(job_id))
+            await pubsub.aclose()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+def _stream_id_key(event_id: str) -> tuple:
+    """Sort key of a Redis stream entry ID ("<ms>-<seq>")."""
+    ms, _, seq = event_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+@router.get(
+    "/jobs/{job_id}/events",
+    summary="Stream Job Events",
+    description="Server-sent events stream of a job's status changes: the recorded history first, then live updates until the job completes or fails.",
+)
+async def stream_job_events(job_id: str) -> StreamingResponse:
+    """
+    Stream a job's status events instead of polling for them.
+
+    Replays the job's event history from Redis, then forwards live events
+    published by the API or queue workers. The stream ends after a
+    ``completed`` or ``failed`` event.
+    """
+    redis = get_redis()
+    if redis is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Event streaming requires Redis (REDIS_URL is not set)",
+        )
+
+    terminal_statuses = {JobStatus.COMPLETED.value, JobStatus.FAILED.value}
+
+    def _is_terminal(data: str) -> bool:
+        return json.loads(data).get("status") in terminal_statuses
+
+    async def events() -> AsyncIterator[str]:
+        pubsub = redis.pubsub()
+        await pubsub.subscribe(job_events_channel(job_id))
+        try:
+            # Subscribe before replaying so nothing published in between is lost
+            last_seen = (0, 0)
+            for event_id, data in await get_job_history(job_id):
+                last_seen = _stream_id_key(event_id)
+                yield f"id: {event_id}\ndata: {data}\n\n"
+                if _is_terminal(data):
+                    return
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=15.0)
+                if message is None:
+                    yield ": keepalive\n\n"
+                    continue
+                event = json.loads(message["data"])
+                if _stream_id_key(event["id"]) <= last_seen:
+                    continue  # already sent during the replay
+                last_seen = _stream_id_key(event["id"])
+                yield f"id: {event['id']}\ndata: {event['data']}\n\n"
+                if _is_terminal(event["data"]):
+                    return
+        finally:
+            await pubsub.unsubscribe(job_events_channel(job_id))
+            await pubsub.aclose()
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+# Declared before "/{client_id}/{job_id}", which would otherwise match "/users/{client_id}"
+@router.get(
+    "/users/{client_id}",
+    response_model=Dict[str, List[Dict[str, Any]]],
+    response_class=ORJSONResponse,
+    summary="Get a user's jobs and scripts",
+    description="List all jobs and generated scripts of a user with a single S3 listing.",
+)
+async def get_user_overview(client_id: str) -> ORJSONResponse:
+    """
+    Get everything a user's dashboard needs in one round-trip.
+
+    Returns ``{"jobs": [...], "scripts": [...]}`` where jobs are the job
+    metadata documents and scripts are the generated scripts, newest first.
+    """
+    try:
+        overview = await get_user_overview_from_s3(client_id)
+        return ORJSONResponse(content=overview)
+    except Exception as e:
+        logger.error("Failed to list objects for user %s: %s", client_id, e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list objects for user {client_id}: {str(e)}",
+        )
+
+
 @router.get(
     "/{client_id}/{job_id}",
     response_model=Dict[str, Any],
+    response_class=ORJSONResponse,
     summary="Get specific job metadata",
     description="Retrieve the complete job metadata JSON for a specific job belonging to a user.",
 )
-async def get_job_metadata(client_id: str, job_id: str) -> Dict[str, Any]:
+async def get_job_metadata(client_id: str, job_id: str) -> ORJSONResponse:
     """
     Get detailed metadata for a specific job.
     
@@ -179,21 +602,26 @@ async def get_job_metadata(client_id: str, job_id: str) -> Dict[str, Any]:
     Raises HTTPException for other errors (access denied, server errors, etc.)
     """
     try:
-        logger.info(f"📄 Retrieving job metadata for {client_id}/{job_id}")
-        
-        # First, try to get metadata from S3 (most complete)
+        logger.info("📄 Retrieving job metadata for %s/%s", client_id, job_id)
+
+        # Redis holds a copy written on every metadata save and dropped on replace/delete, shared by
+        # every replica; fall back to S3 on a miss
+        job_metadata = await get_cached_job_metadata(client_id, job_id)
+        if job_metadata is not None:
+            return ORJSONResponse(content=job_metadata)
+
         try:
-            from utils.file_handlers import get_job_metadata_from_s3
-            logger.info(f"Calling get_job_metadata_from_s3 for {client_id}/{job_id}")
+            logger.info("Calling get_job_metadata_from_s3 for %s/%s", client_id, job_id)
             job_metadata = await get_job_metadata_from_s3(client_id, job_id)
-            logger.info(f"✅ Retrieved metadata from S3 for job {job_id}")
-            return job_metadata
+            logger.info("✅ Retrieved metadata from S3 for job %s", job_id)
+            await cache_job_metadata(client_id, job_id, orjson.dumps(job_metadata))
+            return ORJSONResponse(content=job_metadata)
             
         except HTTPException as s3_error:
             # If S3 metadata not found, return empty JSON
             if s3_error.status_code == 404:
-                logger.info(f"📂 S3 metadata not found for {client_id}/{job_id}, returning empty JSON")
-                return {}
+                logger.info("📂 S3 metadata not found for %s/%s, returning empty JSON", client_id, job_id)
+                return ORJSONResponse(content={})
             else:
                 # Re-raise other S3 errors (access denied, server errors, etc.)
                 raise s3_error
@@ -202,10 +630,8 @@ async def get_job_metadata(client_id: str, job_id: str) -> Dict[str, Any]:
         # Re-raise HTTP exceptions
         raise
     except Exception as e:
-        logger.error(f"Unexpected error getting job metadata: {e}")
-        logger.error(f"Exception type: {type(e).__name__}")
-        import traceback
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        # The handler formats the traceback only if the record is emitted
+        logger.exception("Unexpected error getting job metadata: %s: %s", type(e).__name__, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve job metadata"
@@ -215,19 +641,22 @@ async def get_job_metadata(client_id: str, job_id: str) -> Dict[str, Any]:
 @router.get(
     "/users/{client_id}/jobs",
     response_model=List[Dict[str, Any]],
+    response_class=ORJSONResponse,
     summary="List all jobs for a user",
     description="Get a list of all jobs for a specific user by reading metadata from S3.",
 )
-async def list_user_jobs(client_id: str) -> List[Dict[str, Any]]:
+async def list_user_jobs(client_id: str) -> ORJSONResponse:
     """
     List all jobs for a specific user.
+
+    The metadata dicts are returned as-is through orjson, skipping FastAPI's
+    response validation and ``jsonable_encoder`` pass.
     """
     try:
-        from utils.file_handlers import get_user_jobs_from_s3
         jobs = await get_user_jobs_from_s3(client_id)
-        return jobs
+        return ORJSONResponse(content=jobs)
     except Exception as e:
-        logger.error(f"Failed to list jobs for user {client_id}: {e}")
+        logger.error("Failed to list jobs for user %s: %s", client_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to list jobs for user {client_id}: {str(e)}",
@@ -245,11 +674,10 @@ async def delete_job_folder(user_id: str, job_id: str):
     Deletes a specific job folder from S3.
     """
     try:
-        from utils.file_handlers import delete_s3_job_folder
         await delete_s3_job_folder(user_id, job_id)
         return {"message": f"Job {job_id} for user {user_id} deleted successfully."}
     except Exception as e:
-        logger.error(f"Failed to delete job {job_id} for user {user_id}: {e}")
+        logger.error("Failed to delete job %s for user %s: %s", job_id, user_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete job folder: {str(e)}",
@@ -267,11 +695,10 @@ async def delete_user_folder(user_id: str):
     Deletes a user's entire folder from S3.
     """
     try:
-        from utils.file_handlers import delete_s3_user_folder
         await delete_s3_user_folder(user_id)
         return {"message": f"User folder {user_id} deleted successfully."}
     except Exception as e:
-        logger.error(f"Failed to delete user folder {user_id}: {e}")
+        logger.error("Failed to delete user folder %s: %s", user_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete user folder: {str(e)}",
@@ -293,13 +720,13 @@ async def get_queue_status():
             "status": "healthy",
             "queue_info": status,
             "capacity_utilization": {
-                "workers_busy_percent": (status["active_jobs"] / status["max_workers"]) * 100,
+                "workers_busy_percent": (status["active_jobs"] / max(1, status["max_workers"])) * 100,
                 "can_accept_new_jobs": status["available_workers"] > 0,
                 "estimated_wait_time_minutes": max(0, (status["queue_size"] / max(1, status["max_workers"])) * 3)  # Assuming 3 min average per job
             }
         }
     except Exception as e:
-        logger.error(f"Failed to get queue status: {e}")
+        logger.error("Failed to get queue status: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get queue status: {str(e)}",
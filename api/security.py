@@ -1,3 +1,5 @@
+import hmac
+
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 
@@ -5,13 +7,16 @@ from core.config import settings
 
 api_key_header = APIKeyHeader(name="X-API-KEY", auto_error=False)
 
+# Encoded once; compared in constant time so response timing does not leak the key
+_SECRET_KEY = settings.fastapi_and_wep_app_secret_key.encode() if settings.fastapi_and_wep_app_secret_key else None
+
 
 async def get_api_key(api_key_header: str = Security(api_key_header)):
     # If the secret key is not set in the environment, disable security
-    if not settings.fastapi_and_wep_app_secret_key:
+    if _SECRET_KEY is None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="API key is missing")
 
     if not api_key_header:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="API key is missing")
-    if api_key_header != settings.fastapi_and_wep_app_secret_key:
+    if not hmac.compare_digest(api_key_header.encode(), _SECRET_KEY):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API key")
@@ -18,15 +18,18 @@ How to use in code:
 - from app.core.config import settings
 - settings.openai_api_key  # pulled from .env if present
 - settings.upload_dir  # overrides default if UPLOAD_DIR is set
+- get_settings()  # the same cached instance, e.g. as a FastAPI dependency
 
 Note: On Linux/macOS, environment variable names are case-sensitive. Use uppercase names (e.g., OPENAI_API_KEY) to map to `openai_api_key`.
 
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from dotenv import load_dotenv
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 # Load environment variables from .env file
@@ -47,11 +50,19 @@ class Settings(BaseSettings):
     upload_dir: Path = Path(__file__).parent.parent.parent / "uploads"
     temp_dir: Path = Path(__file__).parent.parent.parent / "temp"
     max_file_size: int = 10 * 1024 * 1024  # 10MB
+    scratch_dir: Optional[Path] = Path("/dev/shm")  # memory-backed dir for inference output; unset uses the temp dir
+    scratch_min_free_bytes: int = 256 * 1024 * 1024  # scratch_dir is skipped when it has less free space than this
 
     # CrewAI Settings
     openai_api_key: Optional[str] = None
     openai_model: str = "gpt-4"
     openai_temperature: float = 0.1
+    openai_rpm: int = 500  # requests per minute shared by all agents in a process
+    openai_tpm: int = 200_000  # prompt tokens per minute shared by all agents in a process
+    agent_pool_min_size: int = 1
+    agent_pool_max_size: int = 4
+    agent_pool_idle_timeout: float = 300.0  # seconds before a surplus pooled agent is dropped
+    max_job_seconds: float = 1800.0  # no new improvement cycle is started once a training job has run this long
 
     # Logging Settings
     log_level: str = "INFO"
@@ -59,10 +70,19 @@ class Settings(BaseSettings):
     otel_sdk_disabled: bool = True
     otel_traces_exporter: str = "none"
 
+    # Redis job queue (optional; workflows run in the in-process pool when unset)
+    redis_url: Optional[str] = None
+    queue_visibility_timeout: float = 900.0  # seconds without a heartbeat before a claimed job is re-queued
+    queue_worker_concurrency: int = 4  # jobs processed at once by each `python -m core.queue_worker`
+    max_concurrent_jobs: int = 4  # inference workflows run at once inside an API process when there is no queue
+    s3_setup_concurrency: int = 32  # training S3 setups run at once in an API process; matches the S3 connection pool
+
     # aws settings
     aws_access_key_id: Optional[str] = None
     aws_secret_access_key: Optional[str] = None
     aws_bucket_name: str = "madular-data-files"
+    presigned_url_expiry: int = 3600  # seconds inference artifact download links stay valid
+    inline_artifact_max_bytes: int = 64 * 1024  # larger inference artifacts are only returned as links
 
     # fastapi & webapp settings
     fastapi_and_wep_app_secret_key: str = None
@@ -71,11 +91,20 @@ class Settings(BaseSettings):
         env_file = ".env"
         env_file_encoding = "utf-8"
 
-    def __post_init__(self) -> None:
+    @model_validator(mode="after")
+    def _create_directories(self) -> "Settings":
         """Create necessary directories after initialization."""
-        self.upload_dir.mkdir(exist_ok=True)
-        self.temp_dir.mkdir(exist_ok=True)
+        # BaseSettings never calls a dataclass-style __post_init__, so this runs as a validator
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        return self
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Return the process-wide settings; usable as a FastAPI dependency (``Depends(get_settings)``)."""
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -0,0 +1,330 @@
+"""
+Redis-backed job queue shared by API replicas and external worker processes.
+
+The queue is enabled by setting ``REDIS_URL``. Without it the API keeps running
+workflows in the in-process ``WorkflowExecutorService`` pool.
+
+Each queue uses three lists and one hash per job:
+
+- ``queue:{name}:pending``: job IDs waiting for a worker (LPUSH in, consumed from the right)
+- ``queue:{name}:processing``: job IDs claimed by a worker (BLMOVE from pending)
+- ``queue:{name}:completed``: the most recent finished job IDs, capped
+- ``queue:{name}:job:{job_id}``: payload, claim time and claim token of a job
+
+A job that stays in the processing list longer than the visibility timeout
+without a heartbeat is moved back to pending, giving at-least-once delivery.
+
+Running workers register in the ``queue:workers`` set with a
+``queue:worker:{worker_id}`` key holding their slot count; the key expires unless
+refreshed, so crashed workers drop out of the reported capacity on their own.
+
+Workers publish a job's final result on the ``job:{job_id}`` channel and keep a
+copy under ``job:{job_id}:result`` for clients that subscribe late. Every job
+status change is appended to the ``job:{job_id}:history`` stream and announced on
+``job:{job_id}:events``.
+"""
+
+import asyncio
+import json
+import time
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+from uuid import uuid4
+
+import orjson
+from loguru import logger
+
+from core.config import settings
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+_COMPLETED_HISTORY = 1000
+_RESULT_TTL = 3600  # seconds a published result stays readable for late subscribers
+_EVENT_HISTORY = 1000  # status events kept per job
+_EVENT_HISTORY_TTL = 24 * 3600
+_WORKERS_KEY = "queue:workers"
+WORKER_TTL = 30  # seconds a worker registration lives without a refresh
+
+# Refresh the claim time only while the caller still holds the claim
+# KEYS: job hash; ARGV: claim token, now in ms
+_HEARTBEAT_IF_OWNER = """
+if redis.call('HGET', KEYS[1], 'claim_token') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'claimed_at_ms', ARGV[2])
+return 1
+"""
+
+# Finish a job only while the caller still holds the claim; a reclaimed copy left in pending is dropped too
+# KEYS: job hash, processing list, completed list, pending list; ARGV: claim token, job ID, history size, TTL
+_COMPLETE_IF_OWNER = """
+if redis.call('HGET', KEYS[1], 'claim_token') ~= ARGV[1] then
+    return 0
+end
+redis.call('LREM', KEYS[2], 1, ARGV[2])
+redis.call('LREM', KEYS[4], 0, ARGV[2])
+redis.call('LPUSH', KEYS[3], ARGV[2])
+redis.call('LTRIM', KEYS[3], 0, tonumber(ARGV[3]) - 1)
+redis.call('HDEL', KEYS[1], 'claim_token')
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+# Redis clients keyed by event loop; worker processes run jobs on their own loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = weakref.WeakKeyDictionary()
+
+
+def get_redis() -> Optional["Redis"]:
+    """Return the Redis client for the running event loop, or None when Redis is not configured."""
+    if not settings.redis_url:
+        return None
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        from redis.asyncio import Redis
+
+        client = Redis.from_url(settings.redis_url, decode_responses=True)
+        _clients[loop] = client
+    return client
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+@dataclass
+class ClaimedJob:
+    """A job taken off the pending list by a worker."""
+
+    job_id: str
+    payload: Dict[str, Any]
+    claim_token: str
+
+
+class JobQueue:
+    """A named at-least-once work queue stored in Redis."""
+
+    def __init__(self, name: str, visibility_timeout: Optional[float] = None) -> None:
+        self.name = name
+        self.visibility_timeout = visibility_timeout or settings.queue_visibility_timeout
+        self.pending_key = f"queue:{name}:pending"
+        self.processing_key = f"queue:{name}:processing"
+        self.completed_key = f"queue:{name}:completed"
+        # Processing entries seen without a claim time; claim() stamps it in a second round-trip
+        self._unstamped: Set[str] = set()
+        self.logger = logger.bind(component="job_queue", queue=name)
+
+    def _job_key(self, job_id: str) -> str:
+        return f"queue:{self.name}:job:{job_id}"
+
+    @property
+    def redis(self) -> "Redis":
+        client = get_redis()
+        if client is None:
+            raise RuntimeError("Redis is not configured; set REDIS_URL to use the job queue")
+        return client
+
+    async def enqueue(self, job_id: str, payload: Dict[str, Any]) -> None:
+        """Store the job payload and push the job onto the pending list."""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(self._job_key(job_id), mapping={"payload": json.dumps(payload), "enqueued_at_ms": _now_ms()})
+        pipe.lpush(self.pending_key, job_id)
+        await pipe.execute()
+        self.logger.info(f"Enqueued job {job_id}")
+
+    async def claim(self, timeout: float = 5.0) -> Optional[ClaimedJob]:
+        """Block up to ``timeout`` seconds for a pending job and move it to the processing list."""
+        job_id = await self.redis.blmove(self.pending_key, self.processing_key, timeout, "RIGHT", "LEFT")
+        if job_id is None:
+            return None
+
+        claim_token = uuid4().hex
+        job_key = self._job_key(job_id)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.hset(job_key, mapping={"claimed_at_ms": _now_ms(), "claim_token": claim_token})
+        pipe.hget(job_key, "payload")
+        _, raw_payload = await pipe.execute()
+
+        if raw_payload is None:
+            # Payload expired or was removed; drop the orphaned ID
+            self.logger.warning(f"Discarding job {job_id} without a payload")
+            await self.redis.lrem(self.processing_key, 1, job_id)
+            return None
+        return ClaimedJob(job_id=job_id, payload=json.loads(raw_payload), claim_token=claim_token)
+
+    async def heartbeat(self, job: ClaimedJob) -> bool:
+        """Refresh the claim time of a job that is still being processed.
+
+        Returns False when the claim was lost, i.e. the job was reclaimed and claimed again by another worker.
+        """
+        refreshed = await self.redis.eval(_HEARTBEAT_IF_OWNER, 1, self._job_key(job.job_id), job.claim_token, _now_ms())
+        return bool(refreshed)
+
+    async def complete(self, job: ClaimedJob) -> bool:
+        """Move a finished job from the processing list to the capped completed list.
+
+        Returns False, leaving the queue untouched, when another worker holds the claim by now.
+        """
+        completed = await self.redis.eval(
+            _COMPLETE_IF_OWNER,
+            4,
+            self._job_key(job.job_id),
+            self.processing_key,
+            self.completed_key,
+            self.pending_key,
+            job.claim_token,
+            job.job_id,
+            _COMPLETED_HISTORY,
+            24 * 3600,
+        )
+        if not completed:
+            self.logger.warning(f"Claim on job {job.job_id} was lost; leaving it to its new owner")
+        return bool(completed)
+
+    async def reclaim_stale(self) -> int:
+        """Return jobs whose claim is older than the visibility timeout to the pending list."""
+        job_ids = await self.redis.lrange(self.processing_key, 0, -1)
+        if not job_ids:
+            return 0
+
+        pipe = self.redis.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.hget(self._job_key(job_id), "claimed_at_ms")
+        claimed_at = await pipe.execute()
+
+        cutoff = _now_ms() - int(self.visibility_timeout * 1000)
+        reclaimed = 0
+        unstamped = set()
+        for job_id, claimed_at_ms in zip(job_ids, claimed_at):
+            if claimed_at_ms is None:
+                # Possibly claimed a moment ago; only reclaim it if it is still unstamped on the next pass
+                if job_id not in self._unstamped:
+                    unstamped.add(job_id)
+                    continue
+            elif int(claimed_at_ms) >= cutoff:
+                continue
+            # Only the reclaimer that actually removes the entry re-queues it
+            if await self.redis.lrem(self.processing_key, 1, job_id):
+                await self.redis.rpush(self.pending_key, job_id)
+                reclaimed += 1
+                self.logger.warning(f"Reclaimed stale job {job_id}")
+        self._unstamped = unstamped
+        return reclaimed
+
+    async def depth(self) -> Dict[str, int]:
+        """Number of pending and processing jobs."""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.llen(self.pending_key)
+        pipe.llen(self.processing_key)
+        pending, processing = await pipe.execute()
+        return {"pending": pending, "processing": processing}
+
+
+def _worker_key(worker_id: str) -> str:
+    return f"queue:worker:{worker_id}"
+
+
+async def register_worker(worker_id: str, slots: int) -> None:
+    """Announce (or refresh) a worker and the number of jobs it runs at once."""
+    redis = get_redis()
+    if redis is None:
+        return
+    pipe = redis.pipeline(transaction=True)
+    pipe.sadd(_WORKERS_KEY, worker_id)
+    pipe.set(_worker_key(worker_id), slots, ex=WORKER_TTL)
+    await pipe.execute()
+
+
+async def unregister_worker(worker_id: str) -> None:
+    """Remove a worker that is shutting down."""
+    redis = get_redis()
+    if redis is None:
+        return
+    pipe = redis.pipeline(transaction=True)
+    pipe.srem(_WORKERS_KEY, worker_id)
+    pipe.delete(_worker_key(worker_id))
+    await pipe.execute()
+
+
+async def worker_capacity() -> int:
+    """Total slots of the live workers, pruning registrations that have expired."""
+    redis = get_redis()
+    if redis is None:
+        return 0
+    worker_ids = list(await redis.smembers(_WORKERS_KEY))
+    if not worker_ids:
+        return 0
+    slots = await redis.mget([_worker_key(worker_id) for worker_id in worker_ids])
+    expired = [worker_id for worker_id, value in zip(worker_ids, slots) if value is None]
+    if expired:
+        await redis.srem(_WORKERS_KEY, *expired)
+    return sum(int(value) for value in slots if value is not None)
+
+
+def result_channel(job_id: str) -> str:
+    """Pub/sub channel on which the final result of a job is announced."""
+    return f"job:{job_id}"
+
+
+async def publish_result(job_id: str, result: Dict[str, Any]) -> None:
+    """Store a job's final result and announce it to subscribers."""
+    # Results carry the planner, coder and tester outputs (scripts, reports); orjson keeps this off the hot path
+    message = orjson.dumps(result, default=str, option=orjson.OPT_NON_STR_KEYS)
+    redis = get_redis()
+    if redis is None:
+        return
+    pipe = redis.pipeline(transaction=True)
+    pipe.set(f"{result_channel(job_id)}:result", message, ex=_RESULT_TTL)
+    pipe.publish(result_channel(job_id), message)
+    await pipe.execute()
+
+
+async def get_result(job_id: str) -> Optional[str]:
+    """Return the stored result message of a finished job, if any."""
+    redis = get_redis()
+    if redis is None:
+        return None
+    return await redis.get(f"{result_channel(job_id)}:result")
+
+
+def job_events_channel(job_id: str) -> str:
+    """Pub/sub channel on which a job's status events are announced."""
+    return f"job:{job_id}:events"
+
+
+def _job_history_key(job_id: str) -> str:
+    return f"job:{job_id}:history"
+
+
+async def publish_job_event(job_id: str, event: Dict[str, Any]) -> None:
+    """Append a status event to the job's history stream and announce it.
+
+    The published message carries the stream entry ID so subscribers that
+    replayed the history can skip events they have already seen.
+    """
+    redis = get_redis()
+    if redis is None:
+        return
+    data = json.dumps(event, default=str)
+    history_key = _job_history_key(job_id)
+    event_id = await redis.xadd(history_key, {"data": data}, maxlen=_EVENT_HISTORY, approximate=True)
+    pipe = redis.pipeline(transaction=False)
+    pipe.expire(history_key, _EVENT_HISTORY_TTL)
+    pipe.publish(job_events_channel(job_id), json.dumps({"id": event_id, "data": data}))
+    await pipe.execute()
+
+
+async def get_job_history(job_id: str) -> List[Tuple[str, str]]:
+    """Return the recorded ``(event_id, data)`` status events of a job, oldest first."""
+    redis = get_redis()
+    if redis is None:
+        return []
+    entries = await redis.xrange(_job_history_key(job_id))
+    return [(event_id, fields["data"]) for event_id, fields in entries]
+
+
+# Queues consumed by the worker processes
+workflow_queue = JobQueue("workflow")
+inference_queue = JobQueue("inference")
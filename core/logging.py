@@ -22,7 +22,16 @@ def setup_logging() -> None:
         "<level>{message}</level>"
     )
 
-    logger.add(sys.stdout, format=log_format, level=settings.log_level, colorize=True, backtrace=True, diagnose=True)
+    # enqueue=True hands records to a writer thread, so logging calls never block on the sink
+    logger.add(
+        sys.stdout,
+        format=log_format,
+        level=settings.log_level,
+        colorize=True,
+        backtrace=True,
+        diagnose=True,
+        enqueue=True,
+    )
 
     # File handler if log file is specified
     if settings.log_file:
@@ -41,6 +50,7 @@ def setup_logging() -> None:
             compression="zip",
             backtrace=True,
             diagnose=True,
+            enqueue=True,
         )
 
     # Log startup information
@@ -0,0 +1,152 @@
+"""
+Worker process for the Redis job queue.
+
+Run one or more of these from the project root, on the API host or on other
+hosts, when ``REDIS_URL`` is set:
+
+    python -m core.queue_worker
+"""
+
+import asyncio
+import os
+import socket
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from core.config import settings
+from core.job_queue import (
+    WORKER_TTL,
+    ClaimedJob,
+    JobQueue,
+    inference_queue,
+    publish_result,
+    register_worker,
+    unregister_worker,
+    workflow_queue,
+)
+from core.logging import setup_logging
+from core.workflow_executor import run_workflow
+from models.schemas import JobStatus
+from utils.job_manager import JobManager, deserialize_job
+
+_RECLAIM_INTERVAL = 30.0  # seconds
+
+
+async def _heartbeat(queue: JobQueue, job: ClaimedJob) -> None:
+    """Keep a long-running job's claim fresh so the reclaimer leaves it alone."""
+    while True:
+        await asyncio.sleep(queue.visibility_timeout / 3)
+        try:
+            still_owner = await queue.heartbeat(job)
+        except Exception as e:
+            # One failed beat is not fatal; the next one lands well within the visibility timeout
+            logger.warning(f"Heartbeat for job {job.job_id} failed: {e}")
+            continue
+        if not still_owner:
+            logger.warning(f"Lost the claim on job {job.job_id}; it was reclaimed by another worker")
+            return
+
+
+async def _register_job(job: ClaimedJob) -> None:
+    """Make the job record created by the API process known to this process' job manager."""
+    job_data = job.payload.get("job")
+    if job_data:
+        await JobManager().register_job(deserialize_job(job_data))
+
+
+async def _run_workflow_job(job: ClaimedJob) -> None:
+    """Run one claimed training workflow."""
+    process_logger = logger.bind(job_id=job.job_id, process=os.getpid())
+    await _register_job(job)
+    try:
+        result = await run_workflow(job.payload["workflow_args"], process_logger)
+        process_logger.info(f"Workflow job {job.job_id} finished with success={result.get('success')}")
+    except Exception as e:
+        process_logger.error(f"Workflow execution failed for job {job.job_id}: {e}")
+        try:
+            await JobManager().update_job_status(
+                job.job_id, JobStatus.FAILED, current_step="Workflow failed", error_message=str(e)
+            )
+        except Exception as update_error:
+            process_logger.error(f"Failed to update job status: {update_error}")
+
+
+async def _run_inference_job(job: ClaimedJob) -> None:
+    """Run one claimed inference job and publish its result."""
+    from core.workflow import CSVConversionWorkflow
+
+    await _register_job(job)
+    args = job.payload["inference_args"]
+    try:
+        result = await CSVConversionWorkflow(use_fresh_instances=True).run_inference_job(**args)
+    except Exception as e:
+        result = {"success": False, "error": str(e), "job_id": job.job_id}
+    result["status"] = JobStatus.COMPLETED.value if result.get("success") else JobStatus.FAILED.value
+    await publish_result(job.job_id, result)
+
+
+async def _consume(queue: JobQueue, handler: Callable[[ClaimedJob], Awaitable[None]]) -> None:
+    """Claim and process jobs one at a time, forever."""
+    while True:
+        try:
+            job = await queue.claim()
+        except Exception as e:
+            logger.error(f"Failed to claim a job from {queue.pending_key}: {e}")
+            await asyncio.sleep(1)
+            continue
+        if job is None:
+            continue
+
+        heartbeat = asyncio.create_task(_heartbeat(queue, job))
+        try:
+            await handler(job)
+        except Exception as e:
+            logger.error(f"Unhandled error processing job {job.job_id}: {e}")
+        finally:
+            heartbeat.cancel()
+            await queue.complete(job)
+
+
+async def _reclaim(queue: JobQueue) -> None:
+    """Periodically return jobs abandoned by crashed workers to the pending list."""
+    while True:
+        try:
+            await queue.reclaim_stale()
+        except Exception as e:
+            logger.error(f"Failed to reclaim stale jobs: {e}")
+        await asyncio.sleep(_RECLAIM_INTERVAL)
+
+
+async def _keep_registered(worker_id: str, slots: int) -> None:
+    """Refresh this worker's registration well within its TTL."""
+    while True:
+        try:
+            await register_worker(worker_id, slots)
+        except Exception as e:
+            logger.error(f"Failed to refresh worker registration: {e}")
+        await asyncio.sleep(WORKER_TTL / 3)
+
+
+async def main(concurrency: int) -> None:
+    """Run ``concurrency`` consumers and one reclaimer per queue until cancelled."""
+    if not settings.redis_url:
+        raise SystemExit("REDIS_URL is not set; the queue worker has nothing to consume")
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Queue worker {worker_id} started with {concurrency} slots per queue")
+    try:
+        await asyncio.gather(
+            _keep_registered(worker_id, concurrency),
+            _reclaim(workflow_queue),
+            _reclaim(inference_queue),
+            *(_consume(workflow_queue, _run_workflow_job) for _ in range(concurrency)),
+            *(_consume(inference_queue, _run_inference_job) for _ in range(concurrency)),
+        )
+    finally:
+        await unregister_worker(worker_id)
+
+
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main(settings.queue_worker_concurrency))
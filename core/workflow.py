@@ -1,17 +1,95 @@
 """Main workflow orchestration for CSV conversion using CrewAI agents."""
 
+import asyncio
+import base64
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timezone
+import errno
+import hashlib
+import json
+import mmap
+import os
+import shutil
 import tempfile
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
+import httpx
+from botocore.exceptions import ClientError
 from loguru import logger
 
-from agents.agent_factory import agent_factory
+from agents.agent_factory import AgentFactory, agent_factory
 from core.config import settings
 from models.schemas import JobStatus
-from utils.file_handlers import download_from_s3
-from utils.job_manager import job_manager
+from utils.file_handlers import (
+    download_from_s3,
+    generate_presigned_download_url,
+    get_latest_user_script,
+    get_s3_client,
+    safe_file_path,
+    save_generated_script_to_s3,
+    validate_files_exist,
+)
+from utils.job_manager import JobManager, job_manager
+
+
+# What a script's stderr contains when it could not write its output because the disk is full
+_NO_SPACE_MESSAGE = os.strerror(errno.ENOSPC)
+
+
+def _scratch_dir() -> Optional[Path]:
+    """Directory for inference output: the configured scratch dir while it exists and has room, else None (temp dir).
+
+    Inference output is written by the script and read straight back, so a memory-backed tmpfs saves disk I/O;
+    container tmpfs mounts are often small, hence the free space check.
+    """
+    scratch_dir = settings.scratch_dir
+    if scratch_dir is None or not scratch_dir.is_dir():
+        return None
+    try:
+        if shutil.disk_usage(scratch_dir).free < settings.scratch_min_free_bytes:
+            return None
+    except OSError:
+        return None
+    return scratch_dir
+
+# Failed attempts the planner is shown; older ones are already reflected in the latest feedback
+_PREVIOUS_ATTEMPTS_KEPT = 2
+
+
+def _summarize_attempt(cycle: int, tester_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a failed cycle to what the planner prompt uses: the tester's suggestions or its error."""
+    comparison = tester_result.get("comparison_result")
+    if isinstance(comparison, dict):
+        return {"cycle": cycle, "suggestions": list(comparison.get("suggestions") or [])}
+    return {"cycle": cycle, "error": tester_result.get("error") or "Test execution failed without comparison details"}
+
+
+@dataclass(frozen=True, slots=True)
+class _JobPaths:
+    """A job's input and expected output paths, resolved once and shared by every phase and cycle."""
+
+    input_path: str
+    expected_output_path: Optional[str]
+    use_full_paths: bool
+
+    @classmethod
+    def resolve(
+        cls, input_file_path: str, expected_output_file_path: Optional[str], use_full_paths: bool
+    ) -> "_JobPaths":
+        """Resolve the paths as given (full paths) or relative to the upload directory."""
+        base = None if use_full_paths else Path(settings.upload_dir)
+
+        def _resolve(file_path: str) -> str:
+            return str((Path(file_path) if base is None else base / file_path).resolve())
+
+        return cls(
+            input_path=_resolve(input_file_path),
+            expected_output_path=_resolve(expected_output_file_path) if expected_output_file_path else None,
+            use_full_paths=use_full_paths,
+        )
 
 
 class CSVConversionWorkflow:
@@ -20,8 +98,6 @@ class CSVConversionWorkflow:
     def __init__(self, use_fresh_instances: bool = False) -> None:
         if use_fresh_instances:
             # Create fresh instances for worker processes to avoid asyncio conflicts
-            from agents.agent_factory import AgentFactory
-            from utils.job_manager import JobManager
             self.agent_factory = AgentFactory()
             self.job_manager = JobManager()
         else:
@@ -100,9 +176,16 @@ class CSVConversionWorkflow:
 
                 return await self.execute_inference_job(job_id, input_file_path, client_id, job_description)
 
+            # Always use full paths for the agents; resolved here instead of in every phase of every cycle
+            job_paths = _JobPaths.resolve(
+                planner_input_file_path, planner_expected_output_file_path, use_full_paths=True
+            )
+
             max_cycles = 5  # Allow up to 5 improvement cycles
             current_cycle = 0
-            previous_attempts: List[Dict[str, Any]] = []
+            cycles_started_at = time.monotonic()
+            seen_feedback_fingerprints: Set[str] = set()
+            previous_attempts: Deque[Dict[str, Any]] = deque(maxlen=_PREVIOUS_ATTEMPTS_KEPT)
             agent_feedback: Dict[str, Any] = {}
 
             # Initialize result variables to prevent UnboundLocalError
@@ -114,6 +197,17 @@ class CSVConversionWorkflow:
                 current_cycle += 1
                 self.logger.info(f"Starting improvement cycle {current_cycle} of {max_cycles}")
 
+                elapsed = time.monotonic() - cycles_started_at
+                if current_cycle > 1 and elapsed > settings.max_job_seconds:
+                    await self._handle_job_failure(
+                        job_id_str,
+                        "Time limit exceeded",
+                        f"Stopped before cycle {current_cycle} after {elapsed:.0f}s of improvement cycles",
+                    )
+                    final_status = JobStatus.FAILED
+                    success = False
+                    break
+
                 try:
                     # Update job status to planning phase
                     await self.job_manager.update_job_status(
@@ -126,26 +220,16 @@ class CSVConversionWorkflow:
                     # Step 1: Execute Planner Agent with feedback
                     planner_result = await self._execute_planner_phase(
                         job_id_str,
-                        planner_input_file_path,
-                        planner_expected_output_file_path,
+                        job_paths,
                         job_description,
                         general_instructions,
                         column_instructions,
                         previous_attempts,
                         agent_feedback,
-                        True,  # Always use full paths for planner
                     )
 
                     if not planner_result["success"]:
                         # Do not hard-stop; capture feedback and continue to next cycle
-                        attempt_result = {
-                            "planner_result": planner_result,
-                            "coder_result": None,
-                            "tester_result": None,
-                            "cycle": current_cycle,
-                        }
-                        previous_attempts.append(attempt_result)
-
                         error_msg = planner_result.get("error", "Unknown planning error")
                         agent_feedback["coder_feedback"] = [
                             {
@@ -177,27 +261,20 @@ class CSVConversionWorkflow:
                         progress_details={"phase": "generation", "step": 2, "total_steps": 3, "cycle": current_cycle},
                     )
 
+                    previous_coder_result = coder_result
                     coder_result = await self._execute_coder_phase(
                         job_id_str,
                         planner_result,
-                        planner_input_file_path,
+                        job_paths,
                         job_description,
                         general_instructions,
                         column_instructions,
                         agent_feedback,
-                        True,  # Always use full paths for coder
+                        previous_coder_result,
                     )
 
                     if not coder_result["success"]:
                         # Do not hard-stop; capture feedback and continue to next cycle
-                        attempt_result = {
-                            "planner_result": planner_result,
-                            "coder_result": coder_result,
-                            "tester_result": None,
-                            "cycle": current_cycle,
-                        }
-                        previous_attempts.append(attempt_result)
-
                         error_msg = coder_result.get("error", "Unknown code generation error")
                         agent_feedback["coder_feedback"] = [
                             {
@@ -229,9 +306,11 @@ class CSVConversionWorkflow:
                         progress_details={"phase": "validation", "step": 3, "total_steps": 3, "cycle": current_cycle},
                     )
 
-                    tester_result = await self._execute_tester_phase(
-                        job_id_str, coder_result, planner_input_file_path, planner_expected_output_file_path, True
-                    )
+                    if coder_result.get("script_unchanged"):
+                        # Same script against the same input: the previous cycle's test result still holds
+                        self.logger.info(f"Script unchanged for job {job_id_str}; reusing previous test result")
+                    else:
+                        tester_result = await self._execute_tester_phase(job_id_str, coder_result, job_paths)
 
                     # Determine if we need another improvement cycle
                     if tester_result and tester_result["success"] and tester_result.get("test_passed", False):
@@ -240,14 +319,9 @@ class CSVConversionWorkflow:
                         success = True
                         break  # Success, exit improvement cycles
                     else:
-                        # Store this attempt for learning
-                        attempt_result = {
-                            "planner_result": planner_result,
-                            "coder_result": coder_result,
-                            "tester_result": tester_result,
-                            "cycle": current_cycle,
-                        }
-                        previous_attempts.append(attempt_result)
+                        # Store a summary of this attempt for learning (full results would grow every prompt)
+                        if tester_result:
+                            previous_attempts.append(_summarize_attempt(current_cycle, tester_result))
 
                         # Extract feedback for next cycle - handle both execution errors and test failures
                         feedback_for_coder = []
@@ -289,6 +363,23 @@ class CSVConversionWorkflow:
                             )
 
                         if feedback_for_coder:
+                            # Feedback seen in any earlier cycle means the agents are going in circles
+                            # (including A -> B -> A oscillation); stop early
+                            feedback_fingerprint = hashlib.blake2b(
+                                json.dumps(feedback_for_coder, sort_keys=True, default=str).encode("utf-8"),
+                                digest_size=16,
+                            ).hexdigest()
+                            if feedback_fingerprint in seen_feedback_fingerprints:
+                                await self._handle_job_failure(
+                                    job_id_str,
+                                    "No progress",
+                                    f"Cycle {current_cycle} produced the same feedback as an earlier cycle",
+                                )
+                                final_status = JobStatus.FAILED
+                                success = False
+                                break
+                            seen_feedback_fingerprints.add(feedback_fingerprint)
+
                             agent_feedback["coder_feedback"] = feedback_for_coder
                             if tester_result and "test_report" in tester_result:
                                 agent_feedback["test_report"] = tester_result.get("test_report", "")
@@ -379,8 +470,6 @@ class CSVConversionWorkflow:
             )
 
             # Get the latest trained script for the client
-            from utils.file_handlers import get_latest_user_script
-
             script_path = get_latest_user_script(client_id)
 
             if not script_path:
@@ -418,48 +507,30 @@ class CSVConversionWorkflow:
     async def _execute_planner_phase(
         self,
         job_id: str,
-        input_file_path: str,
-        expected_output_file_path: Optional[str],
+        paths: _JobPaths,
         job_description: Optional[str],
         general_instructions: Optional[str] = None,
         column_instructions: Optional[Dict[str, str]] = None,
-        previous_attempts: Optional[List[Dict[str, Any]]] = None,
+        previous_attempts: Optional[Deque[Dict[str, Any]]] = None,
         agent_feedback: Optional[Dict[str, Any]] = None,
-        use_full_paths: bool = False,
     ) -> Dict[str, Any]:
         """Execute the planning phase with feedback from other agents."""
         self.logger.info(f"Executing planner phase for job {job_id}")
 
         try:
-            planner_agent = self.agent_factory.get_planner_agent()
-
-            if use_full_paths:
-                resolved_input_path = str(Path(input_file_path).resolve())
-                resolved_expected_path = (
-                    str(Path(expected_output_file_path).resolve()) if expected_output_file_path else None
-                )
-            else:
-                resolved_input_path = str((Path(settings.upload_dir) / input_file_path).resolve())
-                resolved_expected_path = (
-                    str((Path(settings.upload_dir) / expected_output_file_path).resolve())
-                    if expected_output_file_path
-                    else None
-                )
-
             task_data = {
-                "input_file_path": resolved_input_path,
-                "expected_output_file_path": resolved_expected_path,
+                "input_file_path": paths.input_path,
+                "expected_output_file_path": paths.expected_output_path,
                 "job_description": job_description,
                 "general_instructions": general_instructions,
                 "column_instructions": column_instructions or {},
-                "previous_attempts": previous_attempts or [],
+                "previous_attempts": list(previous_attempts or ()),
                 "agent_feedback": agent_feedback or {},
             }
 
-            import time
-
             start_time = time.time()
-            result = await planner_agent.execute_task(task_data)
+            async with self.agent_factory.pool.acquire("planner") as planner_agent:
+                result = await planner_agent.execute_task(task_data)
             execution_time = time.time() - start_time
 
             # Add agent result to job
@@ -486,27 +557,24 @@ class CSVConversionWorkflow:
         self,
         job_id: str,
         planner_result: Dict[str, Any],
-        input_file_path: str,
+        paths: _JobPaths,
         job_description: Optional[str],
         general_instructions: Optional[str] = None,
         column_instructions: Optional[Dict[str, str]] = None,
         agent_feedback: Optional[Dict[str, Any]] = None,
-        use_full_paths: bool = False,
+        previous_result: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Execute the coding phase with feedback from tester agent."""
+        """Execute the coding phase with feedback from tester agent.
+
+        When the coder returns exactly the script of ``previous_result`` (the prior cycle), the saved script is
+        reused and the result is flagged ``script_unchanged`` instead of being written and stored again.
+        """
         self.logger.info(f"Executing coder phase for job {job_id}")
 
         try:
-            coder_agent = self.agent_factory.get_coder_agent()
-
-            if use_full_paths:
-                resolved_input_path = str(Path(input_file_path).resolve())
-            else:
-                resolved_input_path = str((Path(settings.upload_dir) / input_file_path).resolve())
-
             task_data = {
                 "plan": planner_result["plan"],
-                "input_file_path": resolved_input_path,
+                "input_file_path": paths.input_path,
                 "required_libraries": planner_result.get("required_libraries", ["pandas"]),
                 "job_description": job_description,
                 "general_instructions": general_instructions,
@@ -514,36 +582,55 @@ class CSVConversionWorkflow:
                 "agent_feedback": agent_feedback or {},
             }
 
-            import time
-
             start_time = time.time()
-            result = await coder_agent.execute_task(task_data)
+            async with self.agent_factory.pool.acquire("coder") as coder_agent:
+                result = await coder_agent.execute_task(task_data)
+                if result["success"] and result.get("script_content"):
+                    # A script that does not parse goes straight back to the coder instead of through the tester
+                    syntax = await coder_agent.validate_script_syntax(result["script_content"])
+                    if not syntax["valid"]:
+                        result = {
+                            "success": False,
+                            "error": f"Generated script is not valid Python: {syntax['error']}",
+                            "script_content": None,
+                        }
             execution_time = time.time() - start_time
-            local_script_path = Path(input_file_path).parent / "generatedScript.py"
-            # Save generated script to job and user-specific directory
-            if result["success"] and result.get("script_content"):
-                with open(local_script_path, "w", encoding="utf-8") as f:
-                    f.write(result["script_content"])
-
-                # Save to job manager with script path
-                await self.job_manager.set_generated_script(
+            local_script_path = Path(paths.input_path).parent / "generatedScript.py"
+            # Script and agent result are stored with a single job store write
+            async with self.job_manager.batch():
+                # Save generated script to job and user-specific directory
+                if (
+                    result["success"]
+                    and result.get("script_content")
+                    and previous_result
+                    and previous_result.get("generated_script_path")
+                    and previous_result.get("script_content") == result["script_content"]
+                ):
+                    result["generated_script_path"] = previous_result["generated_script_path"]
+                    result["script_unchanged"] = True
+                elif result["success"] and result.get("script_content"):
+                    with open(local_script_path, "w", encoding="utf-8") as f:
+                        f.write(result["script_content"])
+
+                    # Save to job manager with script path
+                    await self.job_manager.set_generated_script(
+                        job_id,
+                        result["script_content"],
+                        str(local_script_path),
+                    )
+                    result["generated_script_path"] = str(local_script_path)
+
+                # Add agent result to job
+                await self.job_manager.add_agent_result(
                     job_id,
-                    result["script_content"],
-                    str(local_script_path),
+                    "Coder",
+                    result["success"],
+                    output=f"Generated {len(result.get('script_content', ''))} character script"
+                    if result["success"]
+                    else None,
+                    error=result.get("error"),
+                    execution_time=execution_time,
                 )
-                result["generated_script_path"] = str(local_script_path)
-
-            # Add agent result to job
-            await self.job_manager.add_agent_result(
-                job_id,
-                "Coder",
-                result["success"],
-                output=f"Generated {len(result.get('script_content', ''))} character script"
-                if result["success"]
-                else None,
-                error=result.get("error"),
-                execution_time=execution_time,
-            )
 
             return result
 
@@ -559,16 +646,12 @@ class CSVConversionWorkflow:
         self,
         job_id: str,
         coder_result: Dict[str, Any],
-        input_file_path: str,
-        expected_output_file_path: Optional[str],
-        use_full_paths: bool = False,
+        paths: _JobPaths,
     ) -> Dict[str, Any]:
         """Execute the testing phase."""
         self.logger.info(f"Executing tester phase for job {job_id}")
         temp_dir_tester = None
         try:
-            tester_agent = self.agent_factory.get_tester_agent()
-
             # Ensure we have the script path
             if "generated_script_path" not in coder_result:
                 error_msg = "No script path found in coder result"
@@ -578,57 +661,47 @@ class CSVConversionWorkflow:
             generated_script_path = coder_result["generated_script_path"]
             local_script_path = None
 
-            if use_full_paths and generated_script_path.startswith("s3://"):
+            if paths.use_full_paths and generated_script_path.startswith("s3://"):
                 temp_dir_tester = tempfile.TemporaryDirectory()
                 temp_dir_path = Path(temp_dir_tester.name)
                 local_script_path = temp_dir_path / "generated_script.py"
                 download_from_s3(generated_script_path, local_script_path)
                 generated_script_path = str(local_script_path)
 
-            if use_full_paths:
-                resolved_input_path = str(Path(input_file_path).resolve())
-                resolved_expected_path = (
-                    str(Path(expected_output_file_path).resolve()) if expected_output_file_path else None
-                )
-            else:
-                resolved_input_path = str((Path(settings.upload_dir) / input_file_path).resolve())
-                resolved_expected_path = (
-                    str((Path(settings.upload_dir) / expected_output_file_path).resolve())
-                    if expected_output_file_path
-                    else None
-                )
-
             task_data = {
                 "generated_script_path": generated_script_path,
-                "input_file_path": resolved_input_path,
-                "expected_output_file_path": resolved_expected_path,
+                "input_file_path": paths.input_path,
+                "expected_output_file_path": paths.expected_output_path,
                 "job_id": job_id,
             }
 
-            import time
-
             start_time = time.time()
-            result = await tester_agent.execute_task(task_data)
+            async with self.agent_factory.pool.acquire("tester") as tester_agent:
+                result = await tester_agent.execute_task(task_data)
             execution_time = time.time() - start_time
 
-            # Save test results to job
-            if result["success"]:
-                test_results = {
-                    "test_passed": result.get("test_passed", False),
-                    "comparison_result": result.get("comparison_result", {}),
-                    "execution_time": execution_time,
-                }
-                await self.job_manager.set_test_results(job_id, test_results)
+            # Test results and agent result are stored with a single job store write
+            async with self.job_manager.batch():
+                # Save test results to job
+                if result["success"]:
+                    test_results = {
+                        "test_passed": result.get("test_passed", False),
+                        "comparison_result": result.get("comparison_result", {}),
+                        "execution_time": execution_time,
+                    }
+                    await self.job_manager.set_test_results(job_id, test_results)
 
-            # Add agent result to job
-            await self.job_manager.add_agent_result(
-                job_id,
-                "Tester",
-                result["success"],
-                output=f"Test {'passed' if result.get('test_passed') else 'failed'}" if result["success"] else None,
-                error=result.get("error"),
-                execution_time=execution_time,
-            )
+                # Add agent result to job
+                await self.job_manager.add_agent_result(
+                    job_id,
+                    "Tester",
+                    result["success"],
+                    output=f"Test {'passed' if result.get('test_passed') else 'failed'}"
+                    if result["success"]
+                    else None,
+                    error=result.get("error"),
+                    execution_time=execution_time,
+                )
 
             return result
 
@@ -650,94 +723,83 @@ class CSVConversionWorkflow:
         self.logger.info(f"Executing inference phase for job {job_id}")
 
         try:
-            import subprocess
-            from pathlib import Path
-
-            from utils.file_handlers import safe_file_path, validate_file_exists
-
             # Prepare the command with temporary output
             input_full_path = Path(settings.upload_dir) / input_file_path
 
-            # Create a temporary file for output (will be deleted after reading)
-            import tempfile
-
-            temp_output = tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False)
-            temp_output_path = Path(temp_output.name)
-            temp_output.close()
-
-            # Validate script file
-            script_exists, script_error = validate_file_exists(script_path, "script")
-            if not script_exists:
-                self.logger.error(script_error)
-                return {"success": False, "error": script_error}
-
-            # Validate input file
-            input_exists, input_error = validate_file_exists(input_full_path, "input")
-            if not input_exists:
-                self.logger.error(input_error)
-                return {"success": False, "error": input_error}
-
-            cmd = [
-                "uv",
-                "run",
-                safe_file_path(script_path),
-                safe_file_path(input_full_path),
-                "--save-csv",
-                safe_file_path(temp_output_path),
-            ]
-
-            self.logger.info(f"Executing command: {' '.join(cmd)}")
-
-            # Execute the script
-            import time
-
-            start_time = time.time()
+            # Validate the input file; script_path comes from the user's script listing, and a script removed since
+            # then surfaces as a script execution failure
+            files_exist, files_error = await validate_files_exist((input_full_path, "input"))
+            if not files_exist:
+                self.logger.error(files_error)
+                return {"success": False, "error": files_error}
+
+            # Write the output to the scratch dir when it has room; if it fills up, run again in the temp dir
+            scratch_dir = _scratch_dir()
+            output_dirs = [scratch_dir, None] if scratch_dir is not None else [None]
+            for output_dir in output_dirs:
+                # Create a temporary file for output (removed once read, or on any failure)
+                try:
+                    temp_output = tempfile.NamedTemporaryFile(suffix=".csv", dir=output_dir, delete=False)
+                except OSError as e:
+                    if output_dir is not None and e.errno == errno.ENOSPC:
+                        continue
+                    raise
+                temp_output_path = Path(temp_output.name)
+                temp_output.close()
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout
-                cwd=script_path.parent,  # Run from script directory
-            )
+                try:
+                    cmd = [
+                        "uv",
+                        "run",
+                        safe_file_path(script_path),
+                        safe_file_path(input_full_path),
+                        "--save-csv",
+                        safe_file_path(temp_output_path),
+                    ]
 
-            execution_time = time.time() - start_time
+                    self.logger.info(f"Executing command: {' '.join(cmd)}")
 
-            if result.returncode != 0:
-                error_msg = f"Script execution failed: {result.stderr}"
-                self.logger.error(error_msg)
-                return {"success": False, "error": error_msg}
+                    # Execute the script
+                    start_time = time.time()
 
-            # Read the output CSV content and clean up temp file
-            if temp_output_path.exists():
-                try:
-                    # Read CSV content into memory
-                    with open(temp_output_path, "r", encoding="utf-8") as f:
-                        csv_content = f.read()
+                    # Run from script directory
+                    returncode, _, stderr = await self._run_script(cmd, cwd=script_path.parent)
 
-                    # Clean up temporary file
-                    temp_output_path.unlink()
+                    execution_time = time.time() - start_time
 
-                    # Save output content to job manager (not file path)
-                    await self.job_manager.set_inference_output(job_id, csv_content, is_content=True)
+                    if returncode != 0:
+                        if output_dir is not None and _NO_SPACE_MESSAGE in stderr:
+                            self.logger.warning(f"Scratch dir {output_dir} is full, retrying in the temp dir")
+                            continue
+                        error_msg = f"Script execution failed: {stderr}"
+                        self.logger.error(error_msg)
+                        return {"success": False, "error": error_msg}
+
+                    # Read the output CSV content
+                    if not temp_output_path.exists():
+                        error_msg = "Script executed but no output file was created"
+                        return {"success": False, "error": error_msg}
+                    try:
+                        # Decode CSV content straight from the mapped file (no intermediate bytes copy)
+                        csv_content = self._read_mapped_text(temp_output_path)
+                    except Exception as e:
+                        error_msg = f"Failed to read output CSV: {str(e)}"
+                        return {"success": False, "error": error_msg}
+                finally:
+                    temp_output_path.unlink(missing_ok=True)
+                break
+
+            # Save output content to job manager (not file path)
+            await self.job_manager.set_inference_output(job_id, csv_content, is_content=True)
 
-                    return {
-                        "success": True,
-                        "output_csv_content": csv_content,
-                        "execution_time": execution_time,
-                        "script_path": str(script_path),
-                    }
-                except Exception as e:
-                    # Clean up temp file even if reading fails
-                    if temp_output_path.exists():
-                        temp_output_path.unlink()
-                    error_msg = f"Failed to read output CSV: {str(e)}"
-                    return {"success": False, "error": error_msg}
-            else:
-                error_msg = "Script executed but no output file was created"
-                return {"success": False, "error": error_msg}
+            return {
+                "success": True,
+                "output_csv_content": csv_content,
+                "execution_time": execution_time,
+                "script_path": str(script_path),
+            }
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             error_msg = "Script execution timed out after 5 minutes"
             return {"success": False, "error": error_msg}
         except Exception as e:
@@ -753,8 +815,6 @@ class CSVConversionWorkflow:
         if coder_result.get("success") and coder_result.get("script_content"):
             job_data = await self.job_manager.get_job(job_id)
             if job_data and job_data.get("client_id"):
-                from utils.file_handlers import save_generated_script_to_s3
-
                 s3_script_path = await save_generated_script_to_s3(
                     coder_result["script_content"],
                     job_data["client_id"],
@@ -831,9 +891,6 @@ class CSVConversionWorkflow:
         temp_dir = None
         try:
             # 1. Get the script path from S3
-            from utils.file_handlers import get_s3_client
-            from botocore.exceptions import ClientError
-
             s3_client = get_s3_client()
             bucket_name = settings.aws_bucket_name
             script_key = f"{user_id}/{training_job_id}/script/generatedScript_{training_job_id}.py"
@@ -868,9 +925,6 @@ class CSVConversionWorkflow:
             output_file_name = f"{int(datetime.now(timezone.utc).timestamp())}.csv"
             local_output_path = temp_dir_path / output_file_name
 
-            import subprocess
-            from utils.file_handlers import safe_file_path
-
             cmd = [
                 "uv",
                 "run",
@@ -882,54 +936,40 @@ class CSVConversionWorkflow:
 
             self.logger.info(f"Executing command: {' '.join(cmd)}")
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout
-                cwd=local_script_path.parent,
-            )
+            returncode, stdout, stderr = await self._run_script(cmd, cwd=local_script_path.parent)
+
+            script_s3_path = f"s3://{bucket_name}/{script_key}"
+            script_s3_url = generate_presigned_download_url(bucket_name, script_key, s3_client)
 
-            if result.returncode != 0:
-                error_msg = f"Script execution failed: {result.stderr}"
+            if returncode != 0:
+                error_msg = f"Script execution failed: {stderr}"
                 self.logger.error(error_msg)
                 await self._handle_job_failure(inference_job_id, "Script execution failed", error_msg)
                 
-                # Still return script content even if execution failed
-                import base64
-                with open(local_script_path, 'r', encoding='utf-8') as f:
-                    script_content = f.read()
-                python_script_base64 = base64.b64encode(script_content.encode('utf-8')).decode('utf-8')
-                script_s3_path = f"s3://{bucket_name}/{script_key}"
-                
+                # Still return the script even if execution failed
                 return {
                     "success": False, 
                     "error": error_msg, 
                     "job_id": inference_job_id,
-                    "python_script_base64": python_script_base64,
+                    "python_script_base64": self._inline_base64(local_script_path),
                     "output_csv_base64": None,
                     "output_s3_path": None,
                     "script_s3_path": script_s3_path,
+                    "script_s3_url": script_s3_url,
+                    "output_csv_s3_url": None,
                 }
 
-            # 5. Read script content and encode as base64
-            import base64
-            with open(local_script_path, 'r', encoding='utf-8') as f:
-                script_content = f.read()
-            python_script_base64 = base64.b64encode(script_content.encode('utf-8')).decode('utf-8')
+            # 5. Inline small artifacts as base64; larger ones are only served through the presigned URLs
+            python_script_base64 = self._inline_base64(local_script_path)
+            output_csv_base64 = self._inline_base64(local_output_path)
 
-            # 6. Read output CSV content and encode as base64
-            with open(local_output_path, 'r', encoding='utf-8') as f:
-                csv_content = f.read()
-            output_csv_base64 = base64.b64encode(csv_content.encode('utf-8')).decode('utf-8')
-
-            # 7. Upload the output file to S3
+            # 6. Upload the output file to S3
             output_key = f"{user_id}/{training_job_id}/output/{output_file_name}"
             s3_client.upload_file(str(local_output_path), bucket_name, output_key)
             output_s3_path = f"s3://{bucket_name}/{output_key}"
-            script_s3_path = f"s3://{bucket_name}/{script_key}"
+            output_csv_s3_url = generate_presigned_download_url(bucket_name, output_key, s3_client)
 
-            # 8. Update job status to completed
+            # 7. Update job status to completed
             await self.job_manager.update_job_status(
                 inference_job_id,
                 JobStatus.COMPLETED,
@@ -938,7 +978,7 @@ class CSVConversionWorkflow:
             )
             self.logger.info(f"Inference job {inference_job_id} completed successfully. Output at {output_s3_path}")
             
-            # 9. Return inference result with base64 content
+            # 8. Return inference result with download links and any inlined content
             return {
                 "success": True,
                 "job_id": inference_job_id,
@@ -946,7 +986,9 @@ class CSVConversionWorkflow:
                 "output_csv_base64": output_csv_base64,
                 "output_s3_path": output_s3_path,
                 "script_s3_path": script_s3_path,
-                "execution_time": result.stdout,  # Can add timing if needed
+                "script_s3_url": script_s3_url,
+                "output_csv_s3_url": output_csv_s3_url,
+                "execution_time": stdout,  # Can add timing if needed
             }
 
         except Exception as e:
@@ -958,23 +1000,51 @@ class CSVConversionWorkflow:
             if temp_dir:
                 temp_dir.cleanup()
 
+    @staticmethod
+    async def _run_script(cmd: List[str], cwd: Path, timeout: float = 300) -> Tuple[int, str, str]:
+        """Run a generated script without blocking the event loop; returns (returncode, stdout, stderr).
+
+        The process is killed and asyncio.TimeoutError raised if it runs longer than ``timeout`` seconds
+        (5 minutes by default).
+        """
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=cwd
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise asyncio.TimeoutError(f"Script execution timed out after {timeout:g} seconds") from None
+        return proc.returncode or 0, stdout.decode("utf-8", "replace"), stderr.decode("utf-8", "replace")
+
+    @staticmethod
+    def _inline_base64(path: Path) -> Optional[str]:
+        """Base64 content of a small artifact, or None when it should be fetched via its presigned URL."""
+        if path.stat().st_size > settings.inline_artifact_max_bytes:
+            return None
+        return base64.b64encode(path.read_bytes()).decode("ascii")
+
+    @staticmethod
+    def _read_mapped_text(path: Path) -> str:
+        """Decode a UTF-8 file through a read-only memory map instead of reading it into a bytes buffer first."""
+        with open(path, "rb") as f:
+            if f.seek(0, 2) == 0:
+                return ""
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return str(mm, "utf-8")
+
     async def _download_input_file(self, input_file: str, local_path: Path) -> None:
         """Download the input file from URL, S3, or Base64."""
         if input_file.startswith("s3://"):
-            from utils.file_handlers import download_from_s3
-
             download_from_s3(input_file, local_path)
         elif input_file.startswith("http"):
-            import httpx
-
             async with httpx.AsyncClient() as client:
                 response = await client.get(input_file)
                 response.raise_for_status()
                 with open(local_path, "wb") as f:
                     f.write(response.content)
         else:  # assume base64
-            import base64
-
             with open(local_path, "wb") as f:
                 f.write(base64.b64decode(input_file.split(";base64,")[-1]))
 
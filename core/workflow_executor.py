@@ -11,12 +11,13 @@ import os
 import sys
 from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
 
 from loguru import logger
 
+from core.job_queue import worker_capacity, workflow_queue
 from models.schemas import JobStatus, JobMetadata, TrainingJobRequest
-from utils.job_manager import job_manager
+from utils.job_manager import JobManager, job_manager, serialize_job
 from utils.file_handlers import create_s3_folders, save_job_metadata_to_s3, upload_to_s3
 from core.config import settings
 from datetime import datetime, timezone
@@ -33,20 +34,28 @@ class WorkflowExecutorService:
         self.queue_size = 0
         self.logger = logger.bind(component="workflow_executor")
         
-        # Initialize the executor
-        self._initialize_executor()
+        # With Redis configured, jobs go to the shared queue and external workers run them
+        self.use_queue = bool(settings.redis_url)
+        if self.use_queue:
+            self.logger.info("REDIS_URL set - workflows are delegated to the Redis job queue")
+        # The pool is started on the first submit: forkserver workers re-import this module to
+        # unpickle their entry points, and must not each build an idle pool of their own
 
     def _initialize_executor(self) -> None:
         """Initialize the ProcessPoolExecutor with optimal settings."""
         try:
-            # Configure multiprocessing for the workflow processes
+            # Workers fork from a clean forkserver (not from the threaded API process) that has
+            # the heavy third-party libraries imported once; the initializer then warms each
+            # worker's own app modules. The context is local, so the global start method is untouched.
             if sys.platform.startswith('win'):
-                multiprocessing.set_start_method('spawn', force=True)
+                mp_context = multiprocessing.get_context('spawn')
             else:
-                multiprocessing.set_start_method('fork', force=True)
+                mp_context = multiprocessing.get_context('forkserver')
+                mp_context.set_forkserver_preload(list(_FORKSERVER_PRELOAD))
             
             self.executor = ProcessPoolExecutor(
                 max_workers=self.max_workers,
+                mp_context=mp_context,
                 initializer=_init_worker_process,
             )
             self.logger.info(f"Initialized ProcessPoolExecutor with {self.max_workers} workers")
@@ -82,9 +91,27 @@ class WorkflowExecutorService:
         Returns:
             bool: True if submitted successfully, False otherwise
         """
+        if self.use_queue:
+            return await self._enqueue_workflow(
+                job_id,
+                {
+                    'job_id': job_id,
+                    'input_file_path': input_file_path,
+                    'expected_output_file_path': expected_output_file_path,
+                    'job_description': job_description,
+                    'general_instructions': general_instructions,
+                    'column_instructions': column_instructions,
+                    'use_full_paths': use_full_paths,
+                    'perform_s3_setup': perform_s3_setup,
+                    'request_data': request_data.model_dump() if hasattr(request_data, 'model_dump') else request_data,
+                },
+            )
+
         if not self.executor:
-            self.logger.error("ProcessPoolExecutor not initialized")
-            return False
+            try:
+                self._initialize_executor()
+            except Exception:
+                return False
 
         try:
             self.logger.info(f"Submitting workflow job {job_id} to process pool")
@@ -146,8 +173,36 @@ class WorkflowExecutorService:
             self.logger.error(f"Failed to submit workflow job {job_id}: {e}")
             return False
 
+    async def _enqueue_workflow(self, job_id: str, workflow_args: Dict[str, Any]) -> bool:
+        """Push a workflow onto the Redis queue together with the job record the worker needs."""
+        try:
+            job_data = await job_manager.get_job(job_id)
+            await job_manager.update_job_status(
+                job_id,
+                JobStatus.PENDING,
+                current_step="Queued for processing",
+                progress_details={"queue_position": (await workflow_queue.depth())["pending"] + 1},
+            )
+            await workflow_queue.enqueue(
+                job_id, {"workflow_args": workflow_args, "job": serialize_job(job_data) if job_data else None}
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to enqueue workflow job {job_id}: {e}")
+            return False
+
     async def get_queue_status(self) -> Dict[str, Any]:
         """Get current queue and worker status."""
+        if self.use_queue:
+            # Capacity is whatever the registered queue workers, on any host, currently offer
+            depth, max_workers = await asyncio.gather(workflow_queue.depth(), worker_capacity())
+            return {
+                "max_workers": max_workers,
+                "active_jobs": depth["processing"],
+                "queue_size": depth["pending"],
+                "available_workers": max(0, max_workers - depth["processing"]),
+                "active_job_ids": await workflow_queue.redis.lrange(workflow_queue.processing_key, 0, -1),
+            }
         return {
             "max_workers": self.max_workers,
             "active_jobs": len(self.active_jobs),
@@ -164,6 +219,12 @@ class WorkflowExecutorService:
             self.executor = None
 
 
+# Imported once in the forkserver; app modules are left to each worker since they create
+# per-process state (job manager, agent factory) at import time. CrewAI is left out: the
+# agents import it on first use, and workers that only run inference never need it.
+_FORKSERVER_PRELOAD = ("pandas", "boto3", "pydantic")
+
+
 def _init_worker_process():
     """Initialize each worker process with necessary setup."""
     # Set up logging for worker process
@@ -183,11 +244,44 @@ def _init_worker_process():
     if str(project_root) not in sys.path:
         sys.path.insert(0, str(project_root))
 
+    # Pay the import cost once per worker instead of on its first job
+    import core.workflow  # noqa: F401
+
     logger.info(f"Worker process {os.getpid()} initialized")
 
 
-async def _perform_s3_setup(job_id: str, request_data: Any, process_logger) -> Dict[str, str]:
-    """Perform S3 setup operations in worker process for sonic speed."""
+_S3_SETUP_ATTEMPTS = 3
+
+T = TypeVar("T")
+
+
+async def _with_retries(operation: Callable[[], Awaitable[T]], description: str, process_logger) -> T:
+    """Run an S3 write, retrying transient failures with exponential backoff (1s, 2s, ...)."""
+    for attempt in range(_S3_SETUP_ATTEMPTS - 1):
+        try:
+            return await operation()
+        except ValueError:
+            # Bad input (e.g. invalid base64) will not succeed on retry
+            raise
+        except Exception as e:
+            delay = 2 ** attempt
+            process_logger.warning(
+                f"{description} failed (attempt {attempt + 1}/{_S3_SETUP_ATTEMPTS}): {e}; retrying in {delay}s"
+            )
+            await asyncio.sleep(delay)
+    return await operation()
+
+
+async def perform_s3_setup(
+    job_id: str, request_data: Any, process_logger, manager: Optional[JobManager] = None
+) -> Dict[str, str]:
+    """
+    Create the S3 folders and metadata of a training job and upload its files.
+
+    Runs in the API process, concurrently with the job record write, or in a
+    worker when the workflow was submitted with ``perform_s3_setup=True``.
+    Pass the caller's ``manager`` so progress updates land in its job records.
+    """
     try:
         # Extract request data (converted from Pydantic model)
         if hasattr(request_data, 'dict'):
@@ -206,8 +300,7 @@ async def _perform_s3_setup(job_id: str, request_data: Any, process_logger) -> D
         bucket_name = settings.aws_bucket_name
         
         # Update job status to uploading
-        from utils.job_manager import JobManager
-        job_manager_instance = JobManager()
+        job_manager_instance = manager or JobManager()
         await job_manager_instance.update_job_status(
             job_id,
             JobStatus.PENDING,
@@ -220,7 +313,7 @@ async def _perform_s3_setup(job_id: str, request_data: Any, process_logger) -> D
         )
         
         # 1. Create S3 folder structure  
-        await create_s3_folders(user_id, job_id)
+        await _with_retries(lambda: create_s3_folders(user_id, job_id), "Creating S3 folders", process_logger)
         
         # Update progress
         await job_manager_instance.update_job_status(
@@ -244,13 +337,15 @@ async def _perform_s3_setup(job_id: str, request_data: Any, process_logger) -> D
             created_at=datetime.now(timezone.utc),
             job_status=JobStatus.PENDING,
         )
-        await save_job_metadata_to_s3(metadata, user_id, job_id)
+        await _with_retries(
+            lambda: save_job_metadata_to_s3(metadata, user_id, job_id), "Saving job metadata", process_logger
+        )
         
         # Update progress
         await job_manager_instance.update_job_status(
             job_id,
             JobStatus.PENDING,
-            current_step="Uploading input files",
+            current_step="Uploading input and expected output files",
             progress_details={
                 "phase": "uploading",
                 "step": "uploading_files",
@@ -258,25 +353,20 @@ async def _perform_s3_setup(job_id: str, request_data: Any, process_logger) -> D
             }
         )
         
-        # 3. Upload files to S3 (S3-to-S3 copy)
+        # 3. Upload both files to S3 concurrently
         input_file_key = f"{user_id}/{job_id}/input/input.csv"
-        await upload_to_s3(req_dict['input_file'], input_file_key)
-        input_file_path = f"s3://{bucket_name}/{input_file_key}"
-        
-        # Update progress
-        await job_manager_instance.update_job_status(
-            job_id,
-            JobStatus.PENDING,
-            current_step="Uploading expected output files",
-            progress_details={
-                "phase": "uploading",
-                "step": "uploading_expected",
-                "progress_percent": 80
-            }
-        )
-        
         expected_output_file_key = f"{user_id}/{job_id}/input/expected_output.csv"
-        await upload_to_s3(req_dict['expected_output_file'], expected_output_file_key)
+        await asyncio.gather(
+            _with_retries(
+                lambda: upload_to_s3(req_dict['input_file'], input_file_key), "Uploading input file", process_logger
+            ),
+            _with_retries(
+                lambda: upload_to_s3(req_dict['expected_output_file'], expected_output_file_key),
+                "Uploading expected output file",
+                process_logger,
+            ),
+        )
+        input_file_path = f"s3://{bucket_name}/{input_file_key}"
         expected_output_file_path = f"s3://{bucket_name}/{expected_output_file_key}"
         
         # Final S3 setup complete
@@ -302,9 +392,7 @@ async def _perform_s3_setup(job_id: str, request_data: Any, process_logger) -> D
         process_logger.error(f"❌ S3 setup failed for job {job_id}: {e}")
         # Update job status to failed
         try:
-            from utils.job_manager import JobManager
-            job_manager_instance = JobManager()
-            await job_manager_instance.update_job_status(
+            await (manager or JobManager()).update_job_status(
                 job_id,
                 JobStatus.FAILED,
                 current_step="S3 setup failed",
@@ -342,46 +430,7 @@ def _execute_workflow_process(workflow_args: Dict[str, Any]) -> Dict[str, Any]:
         asyncio.set_event_loop(loop)
         
         try:
-            # ⚡ SONIC SPEED: Handle S3 setup in worker if needed
-            if workflow_args.get('perform_s3_setup', False):
-                process_logger.info(f"🚀 Performing S3 setup in worker for job {job_id}")
-                
-                # Perform S3 operations asynchronously in worker
-                s3_result = loop.run_until_complete(
-                    _perform_s3_setup(
-                        job_id,
-                        workflow_args['request_data'],
-                        process_logger
-                    )
-                )
-                
-                # Update file paths with S3 results
-                workflow_args['input_file_path'] = s3_result['input_file_path']
-                workflow_args['expected_output_file_path'] = s3_result['expected_output_file_path']
-                
-                process_logger.info(f"✅ S3 setup completed, starting CrewAI workflow")
-            
-            # Create fresh workflow instance for this worker process
-            # This prevents sharing asyncio objects from the main process
-            from core.workflow import CSVConversionWorkflow
-            workflow_instance = CSVConversionWorkflow(use_fresh_instances=True)
-            
-            # Execute the workflow
-            result = loop.run_until_complete(
-                workflow_instance.execute_conversion_job(
-                    job_id=workflow_args['job_id'],
-                    input_file_path=workflow_args['input_file_path'],
-                    expected_output_file_path=workflow_args['expected_output_file_path'],
-                    job_description=workflow_args['job_description'],
-                    general_instructions=workflow_args['general_instructions'],
-                    column_instructions=workflow_args['column_instructions'],
-                    use_full_paths=workflow_args['use_full_paths'],
-                )
-            )
-            
-            process_logger.info(f"Workflow job {job_id} completed successfully")
-            return result
-            
+            return loop.run_until_complete(run_workflow(workflow_args, process_logger))
         finally:
             loop.close()
 
@@ -395,5 +444,50 @@ def _execute_workflow_process(workflow_args: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+async def run_workflow(workflow_args: Dict[str, Any], process_logger) -> Dict[str, Any]:
+    """
+    Run the S3 setup (when requested) and the CrewAI workflow for one job.
+
+    Shared by the process pool workers and the Redis queue workers.
+    """
+    job_id = workflow_args['job_id']
+
+    # ⚡ SONIC SPEED: Handle S3 setup in worker if needed
+    if workflow_args.get('perform_s3_setup', False):
+        process_logger.info(f"🚀 Performing S3 setup in worker for job {job_id}")
+        
+        # Perform S3 operations asynchronously in worker
+        s3_result = await perform_s3_setup(
+            job_id,
+            workflow_args['request_data'],
+            process_logger
+        )
+        
+        # Update file paths with S3 results
+        workflow_args['input_file_path'] = s3_result['input_file_path']
+        workflow_args['expected_output_file_path'] = s3_result['expected_output_file_path']
+        
+        process_logger.info(f"✅ S3 setup completed, starting CrewAI workflow")
+    
+    # Create fresh workflow instance for this worker process
+    # This prevents sharing asyncio objects from the main process
+    from core.workflow import CSVConversionWorkflow
+    workflow_instance = CSVConversionWorkflow(use_fresh_instances=True)
+    
+    # Execute the workflow
+    result = await workflow_instance.execute_conversion_job(
+        job_id=workflow_args['job_id'],
+        input_file_path=workflow_args['input_file_path'],
+        expected_output_file_path=workflow_args['expected_output_file_path'],
+        job_description=workflow_args['job_description'],
+        general_instructions=workflow_args['general_instructions'],
+        column_instructions=workflow_args['column_instructions'],
+        use_full_paths=workflow_args['use_full_paths'],
+    )
+    
+    process_logger.info(f"Workflow job {job_id} completed successfully")
+    return result
+
+
 # Global instance
 workflow_executor = WorkflowExecutorService()
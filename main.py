@@ -36,9 +36,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     else:
         logger.warning("OpenAI API key not found - AI agents will not work")
 
-    # Ensure directories exist
-    settings.upload_dir.mkdir(exist_ok=True)
-    settings.temp_dir.mkdir(exist_ok=True)
+    # Directories are created when settings are loaded
     logger.info(f"Upload directory: {settings.upload_dir}")
     logger.info(f"Temp directory: {settings.temp_dir}")
     
@@ -184,6 +184,33 @@ class TrainingJobRequest(BaseModel):
     )
 
 
+class TrainingUploadInitRequest(BaseModel):
+    """Request model for starting a training job whose files the client uploads straight to S3."""
+
+    user_id: str
+    job_title: str
+    description: Optional[str] = None
+    owner: str
+    general_instructions: Optional[str] = None
+    column_instructions: Optional[Dict[str, str]] = None
+
+
+class TrainingUploadInitResponse(BaseModelWithConfig):
+    """Presigned S3 upload URLs for the files of a new training job."""
+
+    job_id: str
+    input_upload_url: str = Field(description="Presigned PUT URL for the input CSV")
+    expected_output_upload_url: str = Field(description="Presigned PUT URL for the expected output CSV")
+    expires_in: int = Field(description="Seconds the upload URLs stay valid")
+
+
+class TrainingUploadCompleteRequest(BaseModel):
+    """Request model for starting a training job once its files are uploaded."""
+
+    user_id: str
+    job_id: str
+
+
 class InferenceRequest(BaseModel):
     """Request model for starting an inference job."""
 
@@ -215,6 +242,19 @@ class InferenceResponse(BaseModelWithConfig):
     script_s3_path: Optional[str] = Field(
         default=None, description="S3 path where the Python script is stored"
     )
+    script_s3_url: Optional[str] = Field(
+        default=None, description="Presigned URL to download the Python script directly from S3"
+    )
+    output_csv_s3_url: Optional[str] = Field(
+        default=None, description="Presigned URL to download the output CSV directly from S3"
+    )
+    # Set when the job was queued instead of run within the request
+    channel: Optional[str] = Field(
+        default=None, description="Redis pub/sub channel on which the final result is published"
+    )
+    stream_url: Optional[str] = Field(
+        default=None, description="Server-sent events URL that delivers the final result"
+    )
 
 
 class JobMetadata(BaseModelWithConfig):
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for JobManager.batch(): deferred job store writes stay scoped to the task that opened the batch.
+
+The S3 metadata update and the status event are faked out, so these run without AWS or Redis:
+
+    pytest test_job_manager.py
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List
+
+import pytest
+
+import utils.job_manager as job_manager_module
+from models.schemas import JobStatus, OperationMode
+from utils.job_manager import JobManager
+
+
+@pytest.fixture
+def writes(tmp_path, monkeypatch) -> List[bytes]:
+    """Payloads written to the job store, in order."""
+    monkeypatch.chdir(tmp_path)
+    written: List[bytes] = []
+
+    async def no_op(*args, **kwargs) -> None:
+        return None
+
+    def record_write(path: Path, payload: bytes) -> None:
+        written.append(payload)
+
+    monkeypatch.setattr(job_manager_module, "update_job_metadata_to_s3", no_op)
+    monkeypatch.setattr(job_manager_module, "publish_job_event", no_op)
+    monkeypatch.setattr(job_manager_module, "_write_jobs_file", record_write)
+    return written
+
+
+def _add_job(manager: JobManager, job_id: str) -> None:
+    manager._jobs[job_id] = {
+        "status": JobStatus.PENDING,
+        "mode": OperationMode.TRAINING.value,
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc),
+        "current_step": None,
+        "progress_details": {},
+        "error_message": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_writes_once_on_exit(writes: List[bytes]):
+    manager = JobManager()
+    _add_job(manager, "job_a")
+
+    async with manager.batch():
+        await manager.update_job_status("job_a", JobStatus.PROCESSING, current_step="one")
+        async with manager.batch():
+            await manager.update_job_status("job_a", JobStatus.PROCESSING, current_step="two")
+        assert writes == []
+
+    assert len(writes) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_does_not_defer_other_tasks(writes: List[bytes]):
+    manager = JobManager()
+    _add_job(manager, "job_a")
+    _add_job(manager, "job_b")
+    batch_open = asyncio.Event()
+    other_saved = asyncio.Event()
+
+    async def batched_job() -> None:
+        async with manager.batch():
+            await manager.update_job_status("job_a", JobStatus.PROCESSING)
+            batch_open.set()
+            await other_saved.wait()
+            assert len(writes) == 1  # only the other job's save so far
+
+    async def other_job() -> None:
+        await batch_open.wait()
+        await manager.update_job_status("job_b", JobStatus.PROCESSING)
+        other_saved.set()
+
+    await asyncio.gather(batched_job(), other_job())
+
+    assert len(writes) == 2
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Tests for the Redis job queue, the queue worker loop and the SSE endpoints built on it.
+
+Redis is replaced with fakeredis, so these run without a Redis server:
+
+    pytest test_job_queue.py
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, List
+
+import fakeredis.aioredis
+import pytest
+
+import api.routes as routes
+import core.job_queue as job_queue
+import core.queue_worker as queue_worker
+from core.job_queue import ClaimedJob, JobQueue, get_result, publish_job_event, publish_result
+
+JOB_ID = "queue_test_job"
+
+
+@pytest.fixture
+def redis(monkeypatch) -> fakeredis.aioredis.FakeRedis:
+    """An in-memory Redis used by the queue and the routes."""
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(job_queue, "get_redis", lambda: client)
+    monkeypatch.setattr(routes, "get_redis", lambda: client)
+    return client
+
+
+@pytest.fixture
+def queue(redis) -> JobQueue:
+    return JobQueue("test", visibility_timeout=60)
+
+
+async def _collect(body: AsyncIterator[str]) -> List[str]:
+    return [chunk async for chunk in body]
+
+
+def _event_data(chunk: str) -> dict:
+    data_line = next(line for line in chunk.splitlines() if line.startswith("data: "))
+    return json.loads(data_line[len("data: ") :])
+
+
+@pytest.mark.asyncio
+async def test_enqueue_claim_complete(queue: JobQueue):
+    await queue.enqueue(JOB_ID, {"workflow_args": {"job_id": JOB_ID}})
+    assert await queue.depth() == {"pending": 1, "processing": 0}
+
+    job = await queue.claim(timeout=0.1)
+    assert job is not None
+    assert job.job_id == JOB_ID
+    assert job.payload == {"workflow_args": {"job_id": JOB_ID}}
+    assert await queue.depth() == {"pending": 0, "processing": 1}
+
+    await queue.complete(job)
+    assert await queue.depth() == {"pending": 0, "processing": 0}
+    assert await queue.redis.lrange(queue.completed_key, 0, -1) == [JOB_ID]
+
+
+@pytest.mark.asyncio
+async def test_consume_runs_handler_and_publishes_result(queue: JobQueue):
+    handled = asyncio.Event()
+
+    async def handler(job: ClaimedJob) -> None:
+        await publish_result(job.job_id, {"success": True, "job_id": job.job_id})
+        handled.set()
+
+    await queue.enqueue(JOB_ID, {"inference_args": {}})
+    consumer = asyncio.create_task(queue_worker._consume(queue, handler))
+    try:
+        await asyncio.wait_for(handled.wait(), timeout=5)
+    finally:
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+
+    assert json.loads(await get_result(JOB_ID)) == {"success": True, "job_id": JOB_ID}
+    assert await queue.depth() == {"pending": 0, "processing": 0}
+
+
+@pytest.mark.asyncio
+async def test_reclaim_returns_expired_job_to_pending(queue: JobQueue):
+    await queue.enqueue(JOB_ID, {})
+    job = await queue.claim(timeout=0.1)
+
+    assert await queue.reclaim_stale() == 0  # claim is still fresh
+
+    expired_ms = job_queue._now_ms() - int(queue.visibility_timeout * 1000) - 1
+    await queue.redis.hset(queue._job_key(job.job_id), "claimed_at_ms", expired_ms)
+    assert await queue.reclaim_stale() == 1
+    assert await queue.depth() == {"pending": 1, "processing": 0}
+
+    reclaimed = await queue.claim(timeout=0.1)
+    assert reclaimed is not None
+    assert reclaimed.job_id == JOB_ID
+    assert reclaimed.claim_token != job.claim_token
+
+
+@pytest.mark.asyncio
+async def test_reclaim_spares_job_claimed_but_not_yet_stamped(queue: JobQueue):
+    # The state between claim()'s BLMOVE and its HSET of the claim time
+    await queue.redis.lpush(queue.processing_key, JOB_ID)
+
+    assert await queue.reclaim_stale() == 0
+    assert await queue.depth() == {"pending": 0, "processing": 1}
+
+    # Still unstamped on the next pass: the claiming worker is gone
+    assert await queue.reclaim_stale() == 1
+    assert await queue.depth() == {"pending": 1, "processing": 0}
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_job_claimed(queue: JobQueue):
+    await queue.enqueue(JOB_ID, {})
+    job = await queue.claim(timeout=0.1)
+    expired_ms = job_queue._now_ms() - int(queue.visibility_timeout * 1000) - 1
+    await queue.redis.hset(queue._job_key(job.job_id), "claimed_at_ms", expired_ms)
+
+    await queue.heartbeat(job)
+
+    assert await queue.reclaim_stale() == 0
+    assert await queue.depth() == {"pending": 0, "processing": 1}
+
+
+@pytest.mark.asyncio
+async def test_stale_owner_cannot_touch_reclaimed_job(queue: JobQueue):
+    await queue.enqueue(JOB_ID, {})
+    stale = await queue.claim(timeout=0.1)
+    expired_ms = job_queue._now_ms() - int(queue.visibility_timeout * 1000) - 1
+    await queue.redis.hset(queue._job_key(stale.job_id), "claimed_at_ms", expired_ms)
+    await queue.reclaim_stale()
+    owner = await queue.claim(timeout=0.1)
+
+    assert await queue.heartbeat(stale) is False
+    assert await queue.complete(stale) is False
+    assert await queue.depth() == {"pending": 0, "processing": 1}
+
+    assert await queue.heartbeat(owner) is True
+    assert await queue.complete(owner) is True
+    assert await queue.depth() == {"pending": 0, "processing": 0}
+
+
+@pytest.mark.asyncio
+async def test_job_events_replay_history_and_stop_at_terminal_event(redis):
+    await publish_job_event(JOB_ID, {"job_id": JOB_ID, "status": "processing"})
+    await publish_job_event(JOB_ID, {"job_id": JOB_ID, "status": "completed"})
+    await publish_job_event(JOB_ID, {"job_id": JOB_ID, "status": "processing"})  # after the end; never sent
+
+    response = await routes.stream_job_events(JOB_ID)
+    chunks = await asyncio.wait_for(_collect(response.body_iterator), timeout=5)
+
+    assert [_event_data(chunk)["status"] for chunk in chunks] == ["processing", "completed"]
+    assert all(chunk.startswith("id: ") for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_job_events_forward_live_events_until_terminal(redis):
+    await publish_job_event(JOB_ID, {"job_id": JOB_ID, "status": "processing"})
+
+    response = await routes.stream_job_events(JOB_ID)
+    body = response.body_iterator
+    first = await asyncio.wait_for(body.__anext__(), timeout=5)  # subscribed once the replay starts
+    await publish_job_event(JOB_ID, {"job_id": JOB_ID, "status": "failed"})
+    rest = await asyncio.wait_for(_collect(body), timeout=5)
+
+    assert _event_data(first)["status"] == "processing"
+    assert [_event_data(chunk)["status"] for chunk in rest] == ["failed"]
+
+
+@pytest.mark.asyncio
+async def test_inference_stream_serves_stored_result(redis):
+    await publish_result(JOB_ID, {"success": True, "status": "completed"})
+
+    response = await routes.stream_inference_result(JOB_ID)
+    chunks = await asyncio.wait_for(_collect(response.body_iterator), timeout=5)
+
+    assert len(chunks) == 1
+    assert _event_data(chunks[0]) == {"success": True, "status": "completed"}
+
+
+@pytest.mark.asyncio
+async def test_inference_stream_waits_for_live_result(redis):
+    response = await routes.stream_inference_result(JOB_ID)
+    reader = asyncio.create_task(_collect(response.body_iterator))
+    await asyncio.sleep(0.05)  # let the stream subscribe
+    await publish_result(JOB_ID, {"success": False, "status": "failed"})
+
+    chunks = await asyncio.wait_for(reader, timeout=5)
+
+    assert len(chunks) == 1
+    assert _event_data(chunks[0]) == {"success": False, "status": "failed"}
+
+
+@pytest.mark.asyncio
+async def test_streams_need_redis(monkeypatch):
+    monkeypatch.setattr(routes, "get_redis", lambda: None)
+
+    for endpoint in (routes.stream_job_events, routes.stream_inference_result):
+        with pytest.raises(routes.HTTPException) as excinfo:
+            await endpoint(JOB_ID)
+        assert excinfo.value.status_code == 503
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the direct-upload training flow (/train/init -> /train/complete).
+
+S3 and the workflow submission are replaced with in-memory fakes, so these run
+without AWS credentials or a running server:
+
+    pytest test_training_upload.py
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+from fastapi import HTTPException
+
+import api.routes as routes
+import utils.job_manager as job_manager_module
+from models.schemas import JobStatus, TrainingUploadCompleteRequest, TrainingUploadInitRequest
+from utils.job_manager import JobManager
+
+USER_ID = "upload_test_user"
+
+
+@pytest.fixture
+def jobs(tmp_path, monkeypatch) -> JobManager:
+    """A fresh job store in a temp directory, wired into the routes with S3 calls faked out."""
+    monkeypatch.chdir(tmp_path)
+    manager = JobManager()
+
+    async def no_s3_metadata(*args, **kwargs) -> None:
+        return None
+
+    async def nothing_missing(bucket_name: str, keys: List[str]) -> List[str]:
+        return []
+
+    monkeypatch.setattr(job_manager_module, "update_job_metadata_to_s3", no_s3_metadata)
+    monkeypatch.setattr(routes, "job_manager", manager)
+    monkeypatch.setattr(routes, "generate_presigned_upload_url", lambda bucket, key: f"https://upload/{key}")
+    monkeypatch.setattr(routes, "find_missing_s3_objects", nothing_missing)
+    monkeypatch.setattr(routes, "_s3_setup_slots", asyncio.Semaphore(1))
+    monkeypatch.setattr(routes, "_S3_SETUP_ACQUIRE_TIMEOUT", 0.05)
+    return manager
+
+
+@pytest.fixture
+def started(monkeypatch) -> List[str]:
+    """Job IDs whose S3 setup was started; the setup task releases its slot straight away."""
+    started_jobs: List[str] = []
+
+    def fake_start_s3_setup(job_id, request):
+        started_jobs.append(job_id)
+
+        async def setup():
+            return {"input_file_path": request.input_file, "expected_output_file_path": request.expected_output_file}
+
+        task = asyncio.ensure_future(setup())
+        task.add_done_callback(lambda _: routes._s3_setup_slots.release())
+        return task
+
+    monkeypatch.setattr(routes, "_start_s3_setup", fake_start_s3_setup)
+    monkeypatch.setattr(routes, "_submit_when_ready", lambda *args, **kwargs: None)
+    return started_jobs
+
+
+async def _init_job() -> str:
+    response = await routes.init_training_upload(
+        TrainingUploadInitRequest(user_id=USER_ID, job_title="Upload test", owner="Tests")
+    )
+    return response.job_id
+
+
+@pytest.mark.asyncio
+async def test_init_then_complete_starts_job(jobs: JobManager, started: List[str]):
+    job_id = await _init_job()
+    assert (await jobs.get_job(job_id))["status"] == JobStatus.INITIALIZING
+
+    response = await routes.complete_training_upload(TrainingUploadCompleteRequest(user_id=USER_ID, job_id=job_id))
+
+    assert response.status == JobStatus.PENDING
+    assert (await jobs.get_job(job_id))["status"] == JobStatus.PENDING
+    assert started == [job_id]
+
+
+@pytest.mark.asyncio
+async def test_complete_twice_conflicts(jobs: JobManager, started: List[str]):
+    job_id = await _init_job()
+    request = TrainingUploadCompleteRequest(user_id=USER_ID, job_id=job_id)
+    await routes.complete_training_upload(request)
+    await asyncio.sleep(0)  # let the fake setup release its slot
+
+    with pytest.raises(HTTPException) as excinfo:
+        await routes.complete_training_upload(request)
+
+    assert excinfo.value.status_code == 409
+    assert started == [job_id]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_completes_start_job_once(jobs: JobManager, started: List[str], monkeypatch):
+    monkeypatch.setattr(routes, "_s3_setup_slots", asyncio.Semaphore(2))
+    job_id = await _init_job()
+    request = TrainingUploadCompleteRequest(user_id=USER_ID, job_id=job_id)
+
+    results = await asyncio.gather(
+        routes.complete_training_upload(request),
+        routes.complete_training_upload(request),
+        return_exceptions=True,
+    )
+
+    conflicts = [r for r in results if isinstance(r, HTTPException) and r.status_code == 409]
+    assert len(conflicts) == 1
+    assert started == [job_id]
+
+
+@pytest.mark.asyncio
+async def test_complete_without_slot_leaves_job_startable(jobs: JobManager, started: List[str]):
+    job_id = await _init_job()
+    request = TrainingUploadCompleteRequest(user_id=USER_ID, job_id=job_id)
+
+    await routes._s3_setup_slots.acquire()  # every slot busy
+    with pytest.raises(HTTPException) as excinfo:
+        await routes.complete_training_upload(request)
+    assert excinfo.value.status_code == 503
+    assert (await jobs.get_job(job_id))["status"] == JobStatus.INITIALIZING
+    assert started == []
+
+    routes._s3_setup_slots.release()
+    response = await routes.complete_training_upload(request)
+    assert response.status == JobStatus.PENDING
+    assert started == [job_id]
+
+
+@pytest.mark.asyncio
+async def test_conflict_releases_slot(jobs: JobManager, started: List[str]):
+    job_id = await _init_job()
+    request = TrainingUploadCompleteRequest(user_id=USER_ID, job_id=job_id)
+    await routes.complete_training_upload(request)
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException):
+        await routes.complete_training_upload(request)
+
+    assert not routes._s3_setup_slots.locked()
+
+
+@pytest.mark.asyncio
+async def test_complete_unknown_job_not_found(jobs: JobManager, started: List[str]):
+    with pytest.raises(HTTPException) as excinfo:
+        await routes.complete_training_upload(TrainingUploadCompleteRequest(user_id=USER_ID, job_id="missing"))
+    assert excinfo.value.status_code == 404
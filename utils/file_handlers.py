@@ -2,18 +2,24 @@
 
 import asyncio
 import base64
+import io
 import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 from urllib.parse import urlparse
 
 import boto3
 import pandas as pd  # type: ignore
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from fastapi import HTTPException
 from loguru import logger
 
 from core.config import settings
+from core.job_queue import get_redis
 from models.schemas import JobMetadata, JobStatus
 
 
@@ -316,14 +322,16 @@ async def analyze_csv_structure(file_path: Path) -> Dict[str, Any]:
 
         df = await loop.run_in_executor(None, try_read_csv)
 
-        # Basic structure info
+        # Basic structure info; samples are kept both row-major and column-major
+        sample = df.head()
         structure: Dict[str, Any] = {
             "filename": file_path.name,
             "shape": df.shape,
             "columns": df.columns.tolist(),
             "dtypes": df.dtypes.astype(str).to_dict(),
             "null_counts": df.isnull().sum().to_dict(),
-            "sample_data": df.head().to_dict("records") if not df.empty else [],
+            "sample_data": sample.to_dict("records") if not df.empty else [],
+            "sample_columns": sample.to_dict("list") if not df.empty else {},
             "raw_text_analysis": raw_quality,
         }
 
@@ -363,59 +371,73 @@ async def compare_csv_structures(input_path: Path, expected_output_path: Path) -
         Dictionary containing comparison results
     """
     try:
-        # Analyze both files
-        input_structure = await analyze_csv_structure(input_path)
-        output_structure = await analyze_csv_structure(expected_output_path)
-
-        comparison = {
-            "input": input_structure,
-            "expected_output": output_structure,
-            "differences": {
-                "column_changes": {},
-                "shape_changes": {},
-                "data_type_changes": {},
-            },
-        }
+        # Analyze both files concurrently
+        input_structure, output_structure = await asyncio.gather(
+            analyze_csv_structure(input_path), analyze_csv_structure(expected_output_path)
+        )
+        return compare_csv_structures_from_analyses(input_structure, output_structure)
 
-        # Compare shapes
-        if input_structure["shape"] != output_structure["shape"]:
-            comparison["differences"]["shape_changes"] = {
-                "input_shape": input_structure["shape"],
-                "output_shape": output_structure["shape"],
-                "rows_changed": output_structure["shape"][0] - input_structure["shape"][0],
-                "columns_changed": output_structure["shape"][1] - input_structure["shape"][1],
-            }
+    except Exception as e:
+        logger.error(f"Error comparing CSV structures: {str(e)}")
+        raise
 
-        # Compare columns
-        input_cols = set(input_structure["columns"])
-        output_cols = set(output_structure["columns"])
 
-        if input_cols != output_cols:
-            comparison["differences"]["column_changes"] = {
-                "added_columns": list(output_cols - input_cols),
-                "removed_columns": list(input_cols - output_cols),
-                "common_columns": list(input_cols & output_cols),
-            }
+def compare_csv_structures_from_analyses(input_structure: Dict[str, Any], output_structure: Dict[str, Any]) -> Dict:
+    """
+    Compare two results of ``analyze_csv_structure`` without re-reading the files.
 
-        # Compare data types for common columns
-        common_cols = input_cols & output_cols
-        dtype_changes = {}
-        for col in common_cols:
-            if input_structure["dtypes"].get(col) != output_structure["dtypes"].get(col):
-                dtype_changes[col] = {
-                    "input_type": input_structure["dtypes"].get(col),
-                    "output_type": output_structure["dtypes"].get(col),
-                }
+    Args:
+        input_structure: Analysis of the input CSV file
+        output_structure: Analysis of the expected output CSV file
 
-        if dtype_changes:
-            comparison["differences"]["data_type_changes"] = dtype_changes
+    Returns:
+        Dictionary containing comparison results
+    """
+    comparison = {
+        "input": input_structure,
+        "expected_output": output_structure,
+        "differences": {
+            "column_changes": {},
+            "shape_changes": {},
+            "data_type_changes": {},
+        },
+    }
 
-        logger.info("Completed CSV structure comparison")
-        return comparison
+    # Compare shapes
+    if input_structure["shape"] != output_structure["shape"]:
+        comparison["differences"]["shape_changes"] = {
+            "input_shape": input_structure["shape"],
+            "output_shape": output_structure["shape"],
+            "rows_changed": output_structure["shape"][0] - input_structure["shape"][0],
+            "columns_changed": output_structure["shape"][1] - input_structure["shape"][1],
+        }
 
-    except Exception as e:
-        logger.error(f"Error comparing CSV structures: {str(e)}")
-        raise
+    # Compare columns
+    input_cols = set(input_structure["columns"])
+    output_cols = set(output_structure["columns"])
+
+    if input_cols != output_cols:
+        comparison["differences"]["column_changes"] = {
+            "added_columns": list(output_cols - input_cols),
+            "removed_columns": list(input_cols - output_cols),
+            "common_columns": list(input_cols & output_cols),
+        }
+
+    # Compare data types for common columns
+    common_cols = input_cols & output_cols
+    dtype_changes = {}
+    for col in common_cols:
+        if input_structure["dtypes"].get(col) != output_structure["dtypes"].get(col):
+            dtype_changes[col] = {
+                "input_type": input_structure["dtypes"].get(col),
+                "output_type": output_structure["dtypes"].get(col),
+            }
+
+    if dtype_changes:
+        comparison["differences"]["data_type_changes"] = dtype_changes
+
+    logger.info("Completed CSV structure comparison")
+    return comparison
 
 
 def cleanup_temp_files(job_id: str) -> None:
@@ -452,7 +474,9 @@ def ensure_user_directory(client_id: str) -> Path:
     from core.config import settings
 
     user_dir = settings.temp_dir / str(client_id)
-    user_dir.mkdir(parents=True, exist_ok=True)
+    if not user_dir.exists():
+        user_dir.mkdir(parents=True, exist_ok=True)
+        invalidate_user_scripts_cache(str(client_id))
 
     logger.info(f"Ensured user directory exists: {user_dir}")
     return user_dir
@@ -508,6 +532,7 @@ async def _cleanup_old_job_scripts(user_dir: Path, job_id: str, current_script_n
                 if old_script.name != current_script_name:
                     try:
                         old_script.unlink()
+                        invalidate_user_scripts_cache(user_dir.name)
                         logger.info(f"Cleaned up old script: {old_script}")
                     except Exception as e:
                         logger.warning(f"Could not remove old script {old_script}: {e}")
@@ -517,10 +542,35 @@ async def _cleanup_old_job_scripts(user_dir: Path, job_id: str, current_script_n
         # Don't fail the main operation if cleanup fails
 
 
+# Script directory listings, reused for a short while instead of re-scanning temp_dir on every lookup
+_user_scripts_cache: Dict[str, Tuple[Any, float]] = {}
+_SCRIPTS_CACHE_TTL = 30  # seconds
+_ALL_USERS_CACHE_KEY = "all_users"
+
+
+def _get_cached_scripts_listing(cache_key: str) -> Optional[Any]:
+    """Return a cached script listing if it is still fresh."""
+    cached = _user_scripts_cache.get(cache_key)
+    if cached is not None and time.monotonic() - cached[1] < _SCRIPTS_CACHE_TTL:
+        return cached[0]
+    return None
+
+
+def invalidate_user_scripts_cache(client_id: Optional[str] = None) -> None:
+    """Drop the cached script listing of a user, or of every user when no ID is given."""
+    if client_id is None:
+        _user_scripts_cache.clear()
+        return
+    _user_scripts_cache.pop(f"scripts:{client_id}", None)
+    _user_scripts_cache.pop(_ALL_USERS_CACHE_KEY, None)
+
+
 def get_user_scripts(client_id: str) -> List[Dict]:
     """
     Get all scripts for a specific user, sorted by creation time.
 
+    Listings are cached for ``_SCRIPTS_CACHE_TTL`` seconds.
+
     Args:
         client_id: The client ID
 
@@ -529,6 +579,11 @@ def get_user_scripts(client_id: str) -> List[Dict]:
     """
     from core.config import settings
 
+    cache_key = f"scripts:{client_id}"
+    cached = _get_cached_scripts_listing(cache_key)
+    if cached is not None:
+        return cached
+
     user_dir = settings.temp_dir / str(client_id)
 
     if not user_dir.exists():
@@ -575,6 +630,7 @@ def get_user_scripts(client_id: str) -> List[Dict]:
         logger.error(f"Error getting user scripts: {str(e)}")
         return []
 
+    _user_scripts_cache[cache_key] = (scripts, time.monotonic())
     return scripts
 
 
@@ -603,11 +659,17 @@ def list_all_users() -> List[str]:
     """
     List all users who have generated scripts.
 
+    Listings are cached for ``_SCRIPTS_CACHE_TTL`` seconds.
+
     Returns:
         List of client IDs
     """
     from core.config import settings
 
+    cached = _get_cached_scripts_listing(_ALL_USERS_CACHE_KEY)
+    if cached is not None:
+        return cached
+
     users = []
 
     try:
@@ -621,7 +683,9 @@ def list_all_users() -> List[str]:
         logger.error(f"Error listing users: {str(e)}")
         return []
 
-    return sorted(users)
+    users.sort()
+    _user_scripts_cache[_ALL_USERS_CACHE_KEY] = (users, time.monotonic())
+    return users
 
 
 def safe_file_path(file_path: Path) -> str:
@@ -662,6 +726,26 @@ def validate_file_exists(file_path: Path, file_type: str = "file") -> tuple[bool
         return False, f"{file_type.title()} file is not readable: {file_path}"
 
 
+async def validate_files_exist(*files: Tuple[Path, str]) -> Tuple[bool, str]:
+    """
+    Validate several files concurrently in worker threads instead of blocking the event loop.
+
+    Args:
+        files: ``(file_path, file_type)`` pairs; the first failing pair in this order is reported
+
+    Returns:
+        Tuple of (all_exist, error_message of the first failing file)
+    """
+    # Each check stats and opens its file; on slow storage they overlap instead of queuing
+    results = await asyncio.gather(
+        *(asyncio.to_thread(validate_file_exists, file_path, file_type) for file_path, file_type in files)
+    )
+    for exists, error in results:
+        if not exists:
+            return False, error
+    return True, ""
+
+
 def get_s3_client():
     """Get a boto3 S3 client."""
     return boto3.client(
@@ -669,7 +753,10 @@ def get_s3_client():
         aws_access_key_id=settings.aws_access_key_id,
         aws_secret_access_key=settings.aws_secret_access_key,
         config=boto3.session.Config(
-            connect_timeout=10, read_timeout=30, retries={"max_attempts": 3, "mode": "standard"}
+            connect_timeout=10,
+            read_timeout=30,
+            retries={"max_attempts": 3, "mode": "standard"},
+            max_pool_connections=_METADATA_FETCH_CONCURRENCY,
         ),
     )
 
@@ -708,6 +795,17 @@ async def create_s3_folders(user_id: str, job_id: str):
     await loop.run_in_executor(None, _create_folders)
 
 
+# Managed transfers switch to parallel multipart above 8 MiB and hold at most a few parts in memory
+_TRANSFER_CHUNK_SIZE = 8 * 1024 * 1024
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=_TRANSFER_CHUNK_SIZE,
+    multipart_chunksize=_TRANSFER_CHUNK_SIZE,
+    max_concurrency=8,
+    max_io_queue=2,
+)
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # bytes read per iteration when spooling a URL source
+
+
 async def upload_to_s3(source: str, s3_path: str):
     """Upload a file to S3 from a URL, local path, or base64 string."""
     loop = asyncio.get_event_loop()
@@ -726,7 +824,7 @@ async def upload_to_s3(source: str, s3_path: str):
             def _copy_s3_object():
                 s3_client = get_s3_client()
                 copy_source = {"Bucket": source_bucket, "Key": source_key}
-                s3_client.copy_object(CopySource=copy_source, Bucket=bucket_name, Key=s3_path)
+                s3_client.copy(copy_source, bucket_name, s3_path, Config=_TRANSFER_CONFIG)
 
             await loop.run_in_executor(None, _copy_s3_object)
 
@@ -734,13 +832,31 @@ async def upload_to_s3(source: str, s3_path: str):
             # Handle URL
             import httpx
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(source)
-                response.raise_for_status()
+            # Spool the download (in memory up to one part, on disk beyond) instead of buffering it whole
+            with tempfile.SpooledTemporaryFile(max_size=_TRANSFER_CHUNK_SIZE) as buffer:
+                async with httpx.AsyncClient() as client:
+                    async with client.stream("GET", source) as response:
+                        response.raise_for_status()
+                        # Reject a declared oversize body before reading any of it
+                        content_length = response.headers.get("content-length")
+                        if content_length and int(content_length) > settings.max_file_size:
+                            raise ValueError(
+                                f"File at {source} exceeds the maximum size of {settings.max_file_size} bytes"
+                            )
+                        total = 0
+                        async for chunk in response.aiter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                            total += len(chunk)
+                            if total > settings.max_file_size:
+                                # Stop reading as soon as the limit is passed rather than after the whole body
+                                raise ValueError(
+                                    f"File at {source} exceeds the maximum size of {settings.max_file_size} bytes"
+                                )
+                            buffer.write(chunk)
+                buffer.seek(0)
 
                 def _upload_from_url():
                     s3_client = get_s3_client()
-                    s3_client.put_object(Bucket=bucket_name, Key=s3_path, Body=response.content)
+                    s3_client.upload_fileobj(buffer, bucket_name, s3_path, Config=_TRANSFER_CONFIG)
 
                 await loop.run_in_executor(None, _upload_from_url)
         else:
@@ -757,7 +873,7 @@ async def upload_to_s3(source: str, s3_path: str):
 
             def _upload_from_base64():
                 s3_client = get_s3_client()
-                s3_client.put_object(Bucket=bucket_name, Key=s3_path, Body=data)
+                s3_client.upload_fileobj(io.BytesIO(data), bucket_name, s3_path, Config=_TRANSFER_CONFIG)
 
             await loop.run_in_executor(None, _upload_from_base64)
 
@@ -771,9 +887,122 @@ async def upload_to_s3(source: str, s3_path: str):
         raise
 
 
+_METADATA_CACHE_TTL = 3600  # seconds a cached job_metadata.json copy lives in Redis
+
+
+# Adds a job to a user's job set only if the set exists: the set is written whole from an
+# S3 listing, and creating it from a single job would make it look like the full list
+_SADD_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('SADD', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+
+def _metadata_cache_key(client_id: str, job_id: str) -> str:
+    return f"jobs:{client_id}:{job_id}"
+
+
+def _user_jobs_cache_key(client_id: str) -> str:
+    return f"users:{client_id}:jobs"
+
+
+async def cache_job_metadata(client_id: str, job_id: str, payload: Union[str, bytes]) -> None:
+    """Store a copy of a job's metadata JSON in Redis, if Redis is configured."""
+    redis = get_redis()
+    if redis is None:
+        return
+    key = _metadata_cache_key(client_id, job_id)
+    try:
+        pipe = redis.pipeline(transaction=True)
+        pipe.hset(key, "payload", payload)
+        pipe.expire(key, _METADATA_CACHE_TTL)
+        pipe.eval(_SADD_IF_EXISTS, 1, _user_jobs_cache_key(client_id), job_id)
+        await pipe.execute()
+    except Exception as e:
+        # The cache is an optimization; S3 stays the source of truth
+        logger.warning(f"Failed to cache metadata for job {job_id}: {e}")
+
+
+async def get_cached_job_metadata(client_id: str, job_id: str) -> Optional[Dict[str, Any]]:
+    """Return the Redis copy of a job's metadata, or None on a miss or without Redis."""
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        payload = await redis.hget(_metadata_cache_key(client_id, job_id), "payload")
+    except Exception as e:
+        logger.warning(f"Failed to read cached metadata for job {job_id}: {e}")
+        return None
+    return json.loads(payload) if payload else None
+
+
+async def cache_user_jobs(client_id: str, jobs: Dict[str, Dict[str, Any]]) -> None:
+    """Store the full job list of a user, as read from S3 and keyed by job ID, in Redis."""
+    redis = get_redis()
+    if redis is None:
+        return
+    set_key = _user_jobs_cache_key(client_id)
+    try:
+        pipe = redis.pipeline(transaction=True)
+        pipe.delete(set_key)
+        for job_id, job in jobs.items():
+            key = _metadata_cache_key(client_id, job_id)
+            pipe.hset(key, "payload", json.dumps(job))
+            pipe.expire(key, _METADATA_CACHE_TTL)
+            pipe.sadd(set_key, job_id)
+        pipe.expire(set_key, _METADATA_CACHE_TTL)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to cache job list for user {client_id}: {e}")
+
+
+async def get_cached_user_jobs(client_id: str) -> Optional[List[Dict[str, Any]]]:
+    """Return a user's jobs from Redis with one pipelined read, or None if the list is not fully cached."""
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        job_ids = sorted(await redis.smembers(_user_jobs_cache_key(client_id)))
+        if not job_ids:
+            # Missing set: never listed or expired (a user without jobs is simply re-listed)
+            return None
+        pipe = redis.pipeline(transaction=False)
+        for job_id in job_ids:
+            pipe.hget(_metadata_cache_key(client_id, job_id), "payload")
+        payloads = await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to read cached job list for user {client_id}: {e}")
+        return None
+    if any(payload is None for payload in payloads):
+        # Some job copies expired; the S3 listing rebuilds the whole set
+        return None
+    return [json.loads(payload) for payload in payloads]
+
+
+async def evict_cached_job_metadata(client_id: str, job_id: Optional[str] = None) -> None:
+    """Drop the cached copies of one job's metadata, or of all of a user's jobs."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        if job_id is not None:
+            pipe = redis.pipeline(transaction=True)
+            pipe.delete(_metadata_cache_key(client_id, job_id))
+            pipe.srem(_user_jobs_cache_key(client_id), job_id)
+            await pipe.execute()
+        else:
+            keys = [key async for key in redis.scan_iter(match=_metadata_cache_key(client_id, "*"))]
+            await redis.delete(_user_jobs_cache_key(client_id), *keys)
+    except Exception as e:
+        logger.warning(f"Failed to evict cached metadata for user {client_id}: {e}")
+
+
 async def save_job_metadata_to_s3(metadata: JobMetadata, user_id: str, job_id: str):
     """Save the job metadata to a JSON file in S3."""
     loop = asyncio.get_event_loop()
+    payload = metadata.model_dump_json(indent=2)
 
     def _save_metadata():
         s3_client = get_s3_client()
@@ -781,13 +1010,14 @@ async def save_job_metadata_to_s3(metadata: JobMetadata, user_id: str, job_id: s
         metadata_path = f"{user_id}/{job_id}/job_metadata.json"
 
         try:
-            s3_client.put_object(Bucket=bucket_name, Key=metadata_path, Body=metadata.model_dump_json(indent=2))
+            s3_client.put_object(Bucket=bucket_name, Key=metadata_path, Body=payload)
             logger.info(f"Saved job metadata to S3: {metadata_path}")
         except ClientError as e:
             logger.error(f"Error saving job metadata to S3: {e}")
             raise
 
     await loop.run_in_executor(None, _save_metadata)
+    await cache_job_metadata(user_id, job_id, payload)
 
 
 async def update_job_metadata_to_s3(
@@ -827,6 +1057,40 @@ async def update_job_metadata_to_s3(
         logger.error(f"An unexpected error occurred while updating S3 metadata for job {job_id}: {e}")
 
 
+def generate_presigned_download_url(bucket_name: str, key: str, s3_client=None) -> str:
+    """Return a time-limited GET URL for an S3 object (signed locally, no request to S3)."""
+    s3_client = s3_client or get_s3_client()
+    return s3_client.generate_presigned_url(
+        "get_object", Params={"Bucket": bucket_name, "Key": key}, ExpiresIn=settings.presigned_url_expiry
+    )
+
+
+def generate_presigned_upload_url(bucket_name: str, key: str, s3_client=None) -> str:
+    """Return a time-limited PUT URL that lets a client upload an object directly to S3."""
+    s3_client = s3_client or get_s3_client()
+    return s3_client.generate_presigned_url(
+        "put_object", Params={"Bucket": bucket_name, "Key": key}, ExpiresIn=settings.presigned_url_expiry
+    )
+
+
+async def find_missing_s3_objects(bucket_name: str, keys: List[str]) -> List[str]:
+    """Return the keys among ``keys`` that do not exist in the bucket."""
+    loop = asyncio.get_event_loop()
+    s3_client = await loop.run_in_executor(None, get_s3_client)
+
+    def _exists(key: str) -> bool:
+        try:
+            s3_client.head_object(Bucket=bucket_name, Key=key)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return False
+            raise
+
+    found = await asyncio.gather(*(loop.run_in_executor(None, _exists, key) for key in keys))
+    return [key for key, exists in zip(keys, found) if not exists]
+
+
 def download_from_s3(s3_path: str, local_path: Path):
     """Download a file from S3 to a local path."""
     s3_client = get_s3_client()
@@ -847,6 +1111,7 @@ def download_from_s3(s3_path: str, local_path: Path):
 # Simple cache for user jobs (cache for 5 seconds)
 _user_jobs_cache = {}
 _cache_ttl = 5  # seconds
+_METADATA_FETCH_CONCURRENCY = 32  # parallel GetObject calls when listing a user's jobs
 
 
 async def get_job_metadata_from_s3(client_id: str, job_id: str) -> Dict[str, Any]:
@@ -898,6 +1163,32 @@ async def get_job_metadata_from_s3(client_id: str, job_id: str) -> Dict[str, Any
         raise HTTPException(status_code=500, detail="Failed to retrieve job metadata")
 
 
+async def _fetch_job_metadata(s3_client, client_id: str, job_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Read the job_metadata.json of several jobs concurrently; jobs without one are skipped."""
+    loop = asyncio.get_event_loop()
+    bucket_name = settings.aws_bucket_name
+
+    def _get_metadata(job_id: str) -> Optional[bytes]:
+        try:
+            metadata_obj = s3_client.get_object(Bucket=bucket_name, Key=f"{client_id}/{job_id}/job_metadata.json")
+            return metadata_obj["Body"].read()
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchKey":
+                logger.warning(f"Metadata file not found for job {job_id} of user {client_id}")
+                return None
+            raise
+
+    # Bound the number of GetObject calls in flight at once
+    semaphore = asyncio.Semaphore(_METADATA_FETCH_CONCURRENCY)
+
+    async def _fetch(job_id: str) -> Optional[bytes]:
+        async with semaphore:
+            return await loop.run_in_executor(None, _get_metadata, job_id)
+
+    bodies = await asyncio.gather(*(_fetch(job_id) for job_id in job_ids))
+    return {job_id: json.loads(body) for job_id, body in zip(job_ids, bodies) if body is not None}
+
+
 async def get_user_jobs_from_s3(client_id: str) -> List[Dict[str, Any]]:
     """
     List all jobs for a user by reading metadata from S3.
@@ -921,43 +1212,35 @@ async def get_user_jobs_from_s3(client_id: str) -> List[Dict[str, Any]]:
             logger.info(f"Returning cached jobs for user {client_id}")
             return cached_data
 
-    loop = asyncio.get_event_loop()
-
-    def _get_user_jobs():
-        s3_client = get_s3_client()
-        bucket_name = settings.aws_bucket_name
-        prefix = f"{client_id}/"
-
-        jobs = []
-        try:
-            # List objects with the user's prefix
-            paginator = s3_client.get_paginator("list_objects_v2")
-            pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix, Delimiter="/")
-
-            for page in pages:
-                if "CommonPrefixes" not in page:
-                    continue
+    # Shared Redis copy, read in one pipeline, before listing S3
+    jobs = await get_cached_user_jobs(client_id)
+    if jobs is not None:
+        _user_jobs_cache[cache_key] = (jobs, current_time)
+        return jobs
 
-                for common_prefix in page.get("CommonPrefixes", []):
-                    job_id = common_prefix.get("Prefix").split("/")[-2]
-                    metadata_key = f"{client_id}/{job_id}/job_metadata.json"
+    loop = asyncio.get_event_loop()
+    # Created in a worker thread (client construction blocks); boto3 clients are thread-safe
+    s3_client = await loop.run_in_executor(None, get_s3_client)
+    bucket_name = settings.aws_bucket_name
 
-                    try:
-                        metadata_obj = s3_client.get_object(Bucket=bucket_name, Key=metadata_key)
-                        metadata_content = metadata_obj["Body"].read().decode("utf-8")
-                        jobs.append(json.loads(metadata_content))
-                    except ClientError as e:
-                        if e.response["Error"]["Code"] == "NoSuchKey":
-                            logger.warning(f"Metadata file not found for job {job_id} of user {client_id}")
-                        else:
-                            raise
-        except ClientError as e:
-            logger.error(f"Error listing jobs for user {client_id} from S3: {e}")
-            raise
+    def _list_job_ids() -> List[str]:
+        paginator = s3_client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(Bucket=bucket_name, Prefix=f"{client_id}/", Delimiter="/")
+        return [
+            common_prefix["Prefix"].split("/")[-2]
+            for page in pages
+            for common_prefix in page.get("CommonPrefixes", [])
+        ]
 
-        return jobs
+    try:
+        job_ids = await loop.run_in_executor(None, _list_job_ids)
+        jobs_by_id = await _fetch_job_metadata(s3_client, client_id, job_ids)
+    except ClientError as e:
+        logger.error(f"Error listing jobs for user {client_id} from S3: {e}")
+        raise
 
-    jobs = await loop.run_in_executor(None, _get_user_jobs)
+    jobs = list(jobs_by_id.values())
+    await cache_user_jobs(client_id, jobs_by_id)
 
     # Cache the result
     _user_jobs_cache[cache_key] = (jobs, current_time)
@@ -966,6 +1249,82 @@ async def get_user_jobs_from_s3(client_id: str) -> List[Dict[str, Any]]:
     return jobs
 
 
+_DELETE_BATCH_WORKERS = 4  # DeleteObjects calls in flight while listing continues
+
+
+def _delete_s3_prefix(s3_client, bucket_name: str, prefix: str) -> int:
+    """Delete every object under ``prefix`` and return how many were deleted.
+
+    Each ListObjectsV2 page (at most 1000 keys, the DeleteObjects limit) is
+    deleted with a single DeleteObjects call, overlapped with listing the next page.
+    """
+    def _delete_batch(keys: List[Dict[str, str]]) -> int:
+        response = s3_client.delete_objects(Bucket=bucket_name, Delete={"Objects": keys, "Quiet": True})
+        errors = response.get("Errors", [])
+        for error in errors:
+            logger.error(f"Failed to delete s3://{bucket_name}/{error.get('Key')}: {error.get('Message')}")
+        if errors:
+            raise RuntimeError(f"Failed to delete {len(errors)} objects under {prefix}")
+        return len(keys)
+
+    paginator = s3_client.get_paginator("list_objects_v2")
+    with ThreadPoolExecutor(max_workers=_DELETE_BATCH_WORKERS) as pool:
+        futures = [
+            pool.submit(_delete_batch, [{"Key": obj["Key"]} for obj in page["Contents"]])
+            for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix)
+            if page.get("Contents")
+        ]
+        return sum(future.result() for future in futures)
+
+
+async def get_user_overview_from_s3(client_id: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    List a user's jobs and generated scripts with a single pass over their S3 prefix.
+
+    Args:
+        client_id: The ID of the user/client.
+
+    Returns:
+        ``{"jobs": [...job metadata...], "scripts": [...script info...]}``
+    """
+    loop = asyncio.get_event_loop()
+    s3_client = await loop.run_in_executor(None, get_s3_client)
+    bucket_name = settings.aws_bucket_name
+
+    def _list_user_objects() -> Tuple[List[str], List[Dict[str, Any]]]:
+        job_ids: List[str] = []
+        scripts: List[Dict[str, Any]] = []
+        paginator = s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=f"{client_id}/"):
+            for obj in page.get("Contents", []):
+                key = obj["Key"]
+                parts = key.split("/")
+                # Keys look like {client_id}/{job_id}/job_metadata.json or {client_id}/{job_id}/script/*.py
+                if len(parts) == 3 and parts[2] == "job_metadata.json":
+                    job_ids.append(parts[1])
+                elif len(parts) == 4 and parts[2] == "script" and key.endswith(".py"):
+                    scripts.append(
+                        {
+                            "script_name": parts[3],
+                            "job_id": parts[1],
+                            "s3_path": f"s3://{bucket_name}/{key}",
+                            "size": obj["Size"],
+                            "last_modified": obj["LastModified"],
+                        }
+                    )
+        return job_ids, scripts
+
+    try:
+        job_ids, scripts = await loop.run_in_executor(None, _list_user_objects)
+        jobs_by_id = await _fetch_job_metadata(s3_client, client_id, job_ids)
+    except ClientError as e:
+        logger.error(f"Error listing objects for user {client_id} from S3: {e}")
+        raise
+
+    scripts.sort(key=lambda script: script["last_modified"], reverse=True)
+    return {"jobs": list(jobs_by_id.values()), "scripts": scripts}
+
+
 async def delete_s3_job_folder(user_id: str, job_id: str) -> None:
     """
     Deletes a specific job folder and all its contents from the S3 bucket.
@@ -982,18 +1341,9 @@ async def delete_s3_job_folder(user_id: str, job_id: str) -> None:
         prefix = f"{user_id}/{job_id}/"
 
         try:
-            objects_to_delete = []
-            paginator = s3_client.get_paginator("list_objects_v2")
-            pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
-
-            for page in pages:
-                if "Contents" in page:
-                    for obj in page["Contents"]:
-                        objects_to_delete.append({"Key": obj["Key"]})
-
-            if objects_to_delete:
-                s3_client.delete_objects(Bucket=bucket_name, Delete={"Objects": objects_to_delete})
-                logger.info(f"Deleted {len(objects_to_delete)} objects from S3 for job {job_id} of user {user_id}")
+            deleted = _delete_s3_prefix(s3_client, bucket_name, prefix)
+            if deleted:
+                logger.info(f"Deleted {deleted} objects from S3 for job {job_id} of user {user_id}")
             else:
                 logger.info(f"No objects found to delete for job {job_id} of user {user_id}")
 
@@ -1005,6 +1355,7 @@ async def delete_s3_job_folder(user_id: str, job_id: str) -> None:
             raise
 
     await loop.run_in_executor(None, _delete_job_folder)
+    await evict_cached_job_metadata(user_id, job_id)
 
 
 async def delete_and_replace_job_folder(user_id: str, job_id: str) -> bool:
@@ -1025,6 +1376,7 @@ async def delete_and_replace_job_folder(user_id: str, job_id: str) -> bool:
         job_prefix = f"{user_id}/{job_id}/"
 
         logger.info(f"🗑️ Deleting existing job folder for replacement: s3://{bucket_name}/{job_prefix}")
+        await evict_cached_job_metadata(user_id, job_id)
 
         # Get S3 client
         s3_client = get_s3_client()
@@ -1084,18 +1436,9 @@ async def delete_s3_user_folder(user_id: str):
         prefix = f"{user_id}/"
 
         try:
-            objects_to_delete = []
-            paginator = s3_client.get_paginator("list_objects_v2")
-            pages = paginator.paginate(Bucket=bucket_name, Prefix=prefix)
-
-            for page in pages:
-                if "Contents" in page:
-                    for obj in page["Contents"]:
-                        objects_to_delete.append({"Key": obj["Key"]})
-
-            if objects_to_delete:
-                s3_client.delete_objects(Bucket=bucket_name, Delete={"Objects": objects_to_delete})
-                logger.info(f"Deleted {len(objects_to_delete)} objects from S3 for user {user_id}")
+            deleted = _delete_s3_prefix(s3_client, bucket_name, prefix)
+            if deleted:
+                logger.info(f"Deleted {deleted} objects from S3 for user {user_id}")
             else:
                 logger.info(f"No objects found to delete for user {user_id}")
 
@@ -1107,3 +1450,4 @@ async def delete_s3_user_folder(user_id: str):
             raise
 
     await loop.run_in_executor(None, _delete_user_folder)
+    await evict_cached_job_metadata(user_id)
@@ -1,18 +1,63 @@
 """Job management utilities for handling conversion jobs."""
 
-import json
+import asyncio
 from asyncio import Lock
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 from uuid import uuid4
 
-import aiofiles
+import orjson
 from loguru import logger
 
 from core.config import settings
+from core.job_queue import publish_job_event
 from models.schemas import JobMetadata, JobStatus, OperationMode, TrainingJobRequest
-from utils.file_handlers import create_s3_folders, save_job_metadata_to_s3, update_job_metadata_to_s3, upload_to_s3
+from utils.file_handlers import (
+    create_s3_folders,
+    delete_and_replace_job_folder,
+    save_job_metadata_to_s3,
+    update_job_metadata_to_s3,
+    upload_to_s3,
+)
+
+_DATETIME_FIELDS = ("created_at", "updated_at", "completed_at")
+_JOBS_FILE_BUFFER_SIZE = 1024 * 1024
+
+
+def serialize_job(job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a JSON-serializable copy of a job record (datetimes as ISO strings)."""
+    job_copy = job_data.copy()
+    for field in _DATETIME_FIELDS:
+        if job_copy.get(field):
+            job_copy[field] = job_copy[field].isoformat()
+    return job_copy
+
+
+def deserialize_job(job_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert the ISO datetime strings of a serialized job record back to datetimes, in place."""
+    for field in _DATETIME_FIELDS:
+        if job_data.get(field):
+            job_data[field] = datetime.fromisoformat(job_data[field])
+    return job_data
+
+
+def _write_jobs_file(path: Path, payload: bytes) -> None:
+    """Write the serialized job store with a single large buffered write."""
+    with open(path, "wb", buffering=_JOBS_FILE_BUFFER_SIZE) as f:
+        f.write(payload)
+
+
+class _JobBatch:
+    """An open batch() block of one task; its job store write is deferred until the block exits."""
+
+    __slots__ = ("open", "save_pending")
+
+    def __init__(self) -> None:
+        self.open = True
+        self.save_pending = False
 
 
 class JobManager:
@@ -23,22 +68,19 @@ class JobManager:
         self._write_lock = Lock()  # Write lock for modifying jobs
         self._read_lock = Lock()  # Read lock for accessing jobs
         self._jobs_file = Path("temp/jobs.json")
+        # Batch of the current task, so one job's batch() never defers another job's saves
+        self._batch: ContextVar[Optional[_JobBatch]] = ContextVar(f"job_batch_{id(self)}", default=None)
         self._load_jobs()
 
     def _load_jobs(self) -> None:
         """Load jobs from persistent storage."""
         try:
             if self._jobs_file.exists():
-                with open(self._jobs_file, "r") as f:
-                    jobs_data = json.load(f)
+                with open(self._jobs_file, "rb") as f:
+                    jobs_data = orjson.loads(f.read())
                     # Convert datetime strings back to datetime objects
-                    for job_id, job_data in jobs_data.items():
-                        if "created_at" in job_data:
-                            job_data["created_at"] = datetime.fromisoformat(job_data["created_at"])
-                        if "updated_at" in job_data:
-                            job_data["updated_at"] = datetime.fromisoformat(job_data["updated_at"])
-                        if "completed_at" in job_data and job_data["completed_at"]:
-                            job_data["completed_at"] = datetime.fromisoformat(job_data["completed_at"])
+                    for job_data in jobs_data.values():
+                        deserialize_job(job_data)
                     self._jobs = jobs_data
                     logger.info(f"Loaded {len(self._jobs)} jobs from persistent storage")
         except Exception as e:
@@ -47,27 +89,50 @@ class JobManager:
 
     async def _save_jobs(self) -> None:
         """Save jobs to persistent storage."""
+        batch = self._batch.get()
+        if batch is not None and batch.open:
+            # Written once when the outermost batch() block of this task exits
+            batch.save_pending = True
+            return
+
         try:
             # Ensure temp directory exists
             self._jobs_file.parent.mkdir(parents=True, exist_ok=True)
 
             # Convert datetime objects to ISO strings for JSON serialization
-            jobs_data = {}
-            for job_id, job_data in self._jobs.items():
-                job_copy = job_data.copy()
-                if "created_at" in job_copy:
-                    job_copy["created_at"] = job_copy["created_at"].isoformat()
-                if "updated_at" in job_copy:
-                    job_copy["updated_at"] = job_copy["updated_at"].isoformat()
-                if "completed_at" in job_copy and job_copy["completed_at"]:
-                    job_copy["completed_at"] = job_copy["completed_at"].isoformat()
-                jobs_data[job_id] = job_copy
-
-            async with aiofiles.open(self._jobs_file, "w") as f:
-                await f.write(json.dumps(jobs_data, indent=2))
+            jobs_data = {job_id: serialize_job(job_data) for job_id, job_data in self._jobs.items()}
+
+            # Snapshot on the loop, write from a thread with a plain buffered file.
+            # The store holds whole scripts and CSV outputs, so use orjson rather than json.dumps.
+            payload = orjson.dumps(jobs_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            await asyncio.to_thread(_write_jobs_file, self._jobs_file, payload)
         except Exception as e:
             logger.error(f"Error saving jobs: {e}")
 
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """Group several job updates so the job store is written once, when the block exits.
+
+        Status events and S3 metadata updates are still sent by each call. Only updates made
+        from the current task are deferred; other jobs keep saving immediately.
+        """
+        outer = self._batch.get()
+        if outer is not None and outer.open:
+            # Nested block: the outermost one writes the store
+            yield
+            return
+
+        batch = _JobBatch()
+        token = self._batch.set(batch)
+        try:
+            yield
+        finally:
+            batch.open = False
+            self._batch.reset(token)
+            if batch.save_pending:
+                async with self._write_lock:
+                    await self._save_jobs()
+
     async def create_job(
         self,
         job_id: str,
@@ -136,13 +201,14 @@ class JobManager:
             )
             await save_job_metadata_to_s3(metadata, user_id, job_id)
 
-            # 3. Upload files to S3
+            # 3. Upload both files to S3 concurrently
             input_file_key = f"{user_id}/{job_id}/input/input.csv"
-            await upload_to_s3(request.input_file, input_file_key)
-            input_file_path = f"s3://{bucket_name}/{input_file_key}"
-
             expected_output_file_key = f"{user_id}/{job_id}/input/expected_output.csv"
-            await upload_to_s3(request.expected_output_file, expected_output_file_key)
+            await asyncio.gather(
+                upload_to_s3(request.input_file, input_file_key),
+                upload_to_s3(request.expected_output_file, expected_output_file_key),
+            )
+            input_file_path = f"s3://{bucket_name}/{input_file_key}"
             expected_output_file_path = f"s3://{bucket_name}/{expected_output_file_key}"
 
             # 4. Create job in JobManager
@@ -175,10 +241,13 @@ class JobManager:
     async def create_training_job_fast(
         self,
         request: TrainingJobRequest,
+        job_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Create a training job record INSTANTLY without S3 operations.
 
-        S3 operations will be handled by the background worker process.
+        S3 operations are started separately (see ``perform_s3_setup``), so the
+        caller can run them concurrently with this write by passing a
+        pre-allocated ``job_id`` for new jobs.
         This enables sonic-speed API responses (<100ms).
         """
         async with self._write_lock:
@@ -189,14 +258,12 @@ class JobManager:
 
                 # Delete existing job folder for replacement
                 try:
-                    from utils.file_handlers import delete_and_replace_job_folder
-
                     await delete_and_replace_job_folder(request.user_id, job_id)
                     logger.info(f"✅ Existing job {job_id} folder deleted - ready for replacement")
                 except Exception as e:
                     logger.error(f"❌ Failed to delete existing job folder: {e}")
                     raise Exception(f"Failed to replace existing job: {e}")
-            else:
+            elif job_id is None:
                 job_id = str(uuid4())
 
             user_id = request.user_id
@@ -236,6 +303,12 @@ class JobManager:
             logger.info(f"⚡ Created FAST training job: {job_id} for user: {user_id} (S3 ops deferred)")
             return job_data
 
+    async def register_job(self, job_data: Dict[str, Any]) -> None:
+        """Add a job record created by another process, e.g. one received from the job queue."""
+        async with self._write_lock:
+            self._jobs[job_data["job_id"]] = job_data
+            await self._save_jobs()
+
     async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
         """Get a job by ID."""
         async with self._read_lock:
@@ -249,13 +322,21 @@ class JobManager:
         current_step: Optional[str] = None,
         progress_details: Optional[Dict[str, Any]] = None,
         error_message: Optional[str] = None,
+        expected_status: Optional[JobStatus] = None,
     ) -> bool:
-        """Update job status and progress."""
+        """Update job status and progress.
+
+        With ``expected_status`` the update is a compare-and-set: it only applies (and returns True)
+        when the job is currently in that status, checked under the same lock as the write.
+        """
         async with self._write_lock:
             if job_id not in self._jobs:
                 return False
 
             job = self._jobs[job_id]
+            if expected_status is not None and job["status"] != expected_status:
+                return False
+
             job["status"] = status
             job["updated_at"] = datetime.now(timezone.utc)
 
@@ -276,7 +357,21 @@ class JobManager:
 
             await self._save_jobs()  # Save to persistent storage
             logger.info(f"Updated job {job_id} status to {status}")
-            return True
+            event = {
+                "job_id": job_id,
+                "status": status,
+                "current_step": job["current_step"],
+                "progress_details": job["progress_details"],
+                "error_message": job["error_message"],
+                "updated_at": job["updated_at"].isoformat(),
+            }
+
+        # Push the change to /jobs/{job_id}/events subscribers
+        try:
+            await publish_job_event(job_id, event)
+        except Exception as e:
+            logger.warning(f"Failed to publish status event for job {job_id}: {e}")
+        return True
 
     async def add_agent_result(
         self,